@@ -1,16 +1,40 @@
 import h5py
 from pathlib import Path
-from typing import Dict
+from queue import Full, Queue
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator
+import hashlib
 import json
 import datetime
 import argparse
 import numpy as np
+from hdf5_wrapper.bit_matrix import UNPACK_CHUNK_COLUMNS, transpose_bits
+from hdf5_wrapper.experiment_hdf5 import BITSTREAM_STORE, bit_transposed_name
 
 # General:
 # Sometimes experiments may fail and/or are interrupted
 # This could lead to an incomplete file structure
 # We therefore do not assume that all subconstituents of
 #   a BRAM experiment are always available
+# Experiments may also grow over time (see --append). Groups that already
+#   exist are therefore reused and only new reads are added
+
+# Default number of threads that read files of reads
+DEFAULT_READER_THREADS = 8
+# Default number of reads per chunk (of read datasets and of the ingest)
+DEFAULT_CHUNK_READS = 64
+# Index of read sessions in the packed format of reading/read_bram_ftdi.py
+# (--packed). Reads of a session are appended as fixed size records to
+# "data_reads.bin" and "parity_reads.bin". Each line of the index is
+# "<read number> <data bytes> <parity bytes>"
+PACKED_INDEX_FILE = "reads.idx"
+PACKED_INDEX_COLUMNS = {"data_reads": 1, "parity_reads": 2}
+# Number of bits per chunk of bit-transposed datasets
+BIT_TRANSPOSED_CHUNK_BITS = 64
+# Maximum number of packed reads (8 reads per byte) per chunk
+# of bit-transposed datasets
+BIT_TRANSPOSED_CHUNK_READ_BYTES = 1024
 
 
 def add_meta_data(parent: h5py.Group, meta_data: Dict[str, str]) -> None:
@@ -51,48 +75,358 @@ def add_temperature_dataset(
             if measurement.strip()[0] != "#"  # Ignore Comments
         ]
 
+        # Temperatures are small, so they are rewritten completely
+        # if reads were appended
+        if "temperature" in parent:
+            del parent["temperature"]
         parent.create_dataset(
             "temperature", (len(values),), dtype="f", data=values
         )
 
 
-def add_bram_dataset(
-    path: Path, parent: h5py.Group, dataset_name: str
-) -> None:
+def sorted_read_files(path: Path) -> list[Path]:
     """
-    Adds bram reads as a dataset to group
-
-    Parameters:
-        path: Path to directory that contains multiple bram reads
-        parent: Parent group of dataset
-        name: Name of the dataset (should be either "data" or "parity")
+    Files of a directory of reads, sorted by their read index
     """
     # Sort files numerically ascending: [0, 1, 2, ..., 10, ...]
     # This is done to avoid: [0, 1, 10, 100, 1000, 2, 20,...]
-    files_sorted_by_index = sorted(
+    return sorted(
         [file_path for file_path in path.iterdir() if file_path.is_file()],
         key=lambda x: int(x.stem),
     )
 
-    read_data = []
-    for file in files_sorted_by_index:
+
+def packed_read_layout(path: Path) -> tuple[int, int]:
+    """
+    Number of reads and bytes per read of a packed read file
+    (e.g. data_reads.bin), taken from the index of its read session.
+    Records after the last indexed read (interrupted readouts) are ignored.
+    """
+    dataset_name = path.stem
+    with open(Path(path.parent, PACKED_INDEX_FILE), mode="r") as f:
+        index_lines = [line.split() for line in f if line.strip()]
+    read_count = len(index_lines)
+    read_sizes = {
+        int(line[PACKED_INDEX_COLUMNS[dataset_name]]) for line in index_lines
+    }
+    if len(read_sizes) > 1:
+        # Quality control
+        raise ValueError(f"Reads of {path} differ in size ({read_sizes})")
+    read_nbytes = read_sizes.pop() if read_sizes else 0
+    if path.stat().st_size < read_count * read_nbytes:
+        raise ValueError(
+            f"{path} contains less than the {read_count} indexed reads"
+        )
+    return read_count, read_nbytes
+
+
+def iter_packed_chunks(
+    path: Path, first_read: int, chunk_reads: int
+) -> Iterator[np.ndarray]:
+    """
+    Reads a packed read file (see packed_read_layout) sequentially,
+    from read index "first_read" on, in (reads, bytes) uint8 chunks of at
+    most "chunk_reads" reads
+    """
+    read_count, read_nbytes = packed_read_layout(path)
+    with open(path, mode="rb") as f:
+        f.seek(first_read * read_nbytes)
+        for chunk_start in range(first_read, read_count, chunk_reads):
+            chunk_count = min(chunk_reads, read_count - chunk_start)
+            chunk = np.fromfile(
+                f, dtype=np.uint8, count=chunk_count * read_nbytes
+            )
+            yield chunk.reshape(chunk_count, read_nbytes)
+
+
+def read_file_chunk(files: list[Path], read_nbytes: int) -> np.ndarray:
+    """
+    Reads files of reads into a (reads, bytes) uint8 matrix
+
+    Parameters:
+        files: Files of reads (one read per file)
+        read_nbytes: Expected size of each read
+    """
+    chunk = np.empty((len(files), read_nbytes), dtype=np.uint8)
+    for row, file in zip(chunk, files):
         with open(file, mode="rb") as f:
-            read_data.append(f.read())
-    seq_length = len(read_data[0])
+            # Quality control
+            if f.readinto(row) != read_nbytes or f.read(1):
+                raise ValueError(
+                    f"Read {file} differs in size from other reads "
+                    f"({read_nbytes} bytes)"
+                )
+    return chunk
 
-    # Quality control
-    assert all([len(read) == seq_length for read in read_data])
 
-    parent.create_dataset(
-        dataset_name,
-        (len(read_data),),
-        dtype=np.void(read_data).dtype,
-        data=np.void(read_data),
+def write_bit_transposed_dataset(
+    parent: h5py.Group, dataset_name: str, compression: str | None = None
+) -> None:
+    """
+    (Re)writes the bit-transposed companion of a read dataset
+    (see bit_transposed_name), so per bit statistics only read the chunks
+    of the bits they need. The read dataset is read in column blocks.
+
+    Parameters:
+        parent: Group of the read dataset
+        dataset_name: Name of the read dataset
+        compression: hdf5 filter of the companion ("gzip", "lzf" or None)
+    """
+    dataset = parent[dataset_name]
+    transposed_name = bit_transposed_name(dataset_name)
+    if transposed_name in parent:
+        del parent[transposed_name]
+    read_count, read_nbytes = dataset.shape
+    if not read_count:
+        return
+    read_packed_nbytes = (read_count + 7) // 8
+    transposed = parent.create_dataset(
+        transposed_name,
+        shape=(read_nbytes * 8, read_packed_nbytes),
+        chunks=(
+            min(BIT_TRANSPOSED_CHUNK_BITS, read_nbytes * 8),
+            min(BIT_TRANSPOSED_CHUNK_READ_BYTES, read_packed_nbytes),
+        ),
+        dtype=np.uint8,
+        compression=compression,
     )
+    for column_start in range(0, read_nbytes, UNPACK_CHUNK_COLUMNS):
+        columns = dataset[:, column_start:column_start + UNPACK_CHUNK_COLUMNS]
+        transposed[
+            column_start * 8:(column_start + columns.shape[1]) * 8
+        ] = transpose_bits(columns)
+    transposed.attrs["read_count"] = read_count
+
+
+class ReadIngest:
+    """
+    Streams directories of reads into resizable, chunked uint8
+    (reads, bytes) datasets.
+    Directories are collected by "add" while the file structure is walked.
+    "write" then reads them in a pool of reader threads, chunk by chunk.
+    Chunks are passed to the calling thread through a bounded queue.
+    The calling thread is the only one that writes
+    (h5py isn't thread safe for writes).
+    At most one chunk per reader thread (plus the queue) is kept in memory.
+    Optionally, datasets are compressed and get a bit-transposed companion
+    (see write_bit_transposed_dataset). Existing companions are kept up to
+    date when reads are appended.
+
+    Attributes:
+        threads: Number of reader threads
+        chunk_reads: Number of reads per chunk
+        compression: hdf5 filter of new datasets ("gzip", "lzf" or None)
+        bit_transposed: Whether read datasets get a bit-transposed companion
+        jobs: Directories of reads with the group and dataset name
+                that they are written to and the index of their first
+                read that is written (reads before it already exist)
+    """
+
+    threads: int
+    chunk_reads: int
+    compression: str | None
+    bit_transposed: bool
+    jobs: list[tuple[Path, h5py.Group, str, int]]
+
+    def __init__(
+        self,
+        threads: int = DEFAULT_READER_THREADS,
+        chunk_reads: int = DEFAULT_CHUNK_READS,
+        compression: str | None = None,
+        bit_transposed: bool = False,
+    ) -> None:
+        if threads < 1 or chunk_reads < 1:
+            raise ValueError(
+                "Number of threads and reads per chunk have to be positive "
+                f"({threads}, {chunk_reads})"
+            )
+        self.threads = threads
+        self.chunk_reads = chunk_reads
+        self.compression = compression
+        self.bit_transposed = bit_transposed
+        self.jobs = list()
+
+    def add(
+        self,
+        path: Path,
+        parent: h5py.Group,
+        dataset_name: str,
+        first_read: int = 0,
+    ) -> None:
+        """
+        Registers a directory of reads (or a packed read file),
+        that is written by "write".
+        Only reads from index "first_read" on are appended to the dataset.
+        """
+        self.jobs.append((path, parent, dataset_name, first_read))
+
+    def read_chunks(
+        self, job_idx: int, chunks: Queue, cancelled: Event
+    ) -> None:
+        """
+        Runs in a reader thread.
+        Puts (job_idx, chunk) for each chunk of a job into "chunks",
+        followed by (job_idx, None) (or the raised exception).
+        """
+        def put(item: tuple) -> None:
+            while not cancelled.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return
+                except Full:
+                    continue
+
+        try:
+            path, _, _, first_read = self.jobs[job_idx]
+            if path.is_file():
+                chunks_of_job = iter_packed_chunks(
+                    path, first_read, self.chunk_reads
+                )
+            else:
+                chunks_of_job = self.read_file_chunks(
+                    path, first_read, cancelled
+                )
+            for chunk in chunks_of_job:
+                if cancelled.is_set():
+                    return
+                put((job_idx, chunk))
+            put((job_idx, None))
+        except Exception as exception:
+            put((job_idx, exception))
+
+    def read_file_chunks(
+        self, path: Path, first_read: int, cancelled: Event | None = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Reads a directory of reads (one file per read), from read index
+        "first_read" on, in chunks.
+        Stops before opening the files of the next chunk once "cancelled"
+        is set.
+        """
+        files = sorted_read_files(path)[first_read:]
+        if files:
+            read_nbytes = files[0].stat().st_size
+        for chunk_start in range(0, len(files), self.chunk_reads):
+            if cancelled is not None and cancelled.is_set():
+                return
+            yield read_file_chunk(
+                files[chunk_start:chunk_start + self.chunk_reads],
+                read_nbytes,
+            )
+
+    def append_chunk(
+        self, parent: h5py.Group, dataset_name: str, chunk: np.ndarray
+    ) -> None:
+        """
+        Appends a chunk of reads to a dataset (created if needed)
+        """
+        if dataset_name not in parent:
+            parent.create_dataset(
+                dataset_name,
+                shape=(0, chunk.shape[1]),
+                maxshape=(None, chunk.shape[1]),
+                chunks=(self.chunk_reads, chunk.shape[1]),
+                dtype=np.uint8,
+                compression=self.compression,
+            )
+        dataset = parent[dataset_name]
+        if dataset.shape[1] != chunk.shape[1]:
+            raise ValueError(
+                f"Reads of {dataset.name} differ in size "
+                f"({dataset.shape[1]}, {chunk.shape[1]} bytes)"
+            )
+        read_count = dataset.shape[0]
+        dataset.resize(read_count + len(chunk), axis=0)
+        dataset[read_count:] = chunk
+
+    def write(self) -> None:
+        """
+        Reads and writes all registered directories of reads.
+        Readers are submitted one job at a time (at most "threads" at once),
+        so no further files are opened after an error.
+        """
+        chunks = Queue(maxsize=self.threads)
+        cancelled = Event()
+        job_idxs = iter(range(len(self.jobs)))
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+
+            def submit_next_job() -> None:
+                job_idx = next(job_idxs, None)
+                if job_idx is not None and not cancelled.is_set():
+                    executor.submit(
+                        self.read_chunks, job_idx, chunks, cancelled
+                    )
+
+            for _ in range(self.threads):
+                submit_next_job()
+            try:
+                finished_jobs = 0
+                while finished_jobs < len(self.jobs):
+                    job_idx, chunk = chunks.get()
+                    if chunk is None:
+                        finished_jobs += 1
+                        submit_next_job()
+                    elif isinstance(chunk, Exception):
+                        raise chunk
+                    else:
+                        _, parent, dataset_name, _ = self.jobs[job_idx]
+                        self.append_chunk(parent, dataset_name, chunk)
+            finally:
+                # Stops remaining readers (if an error occured)
+                cancelled.set()
+        self.write_bit_transposed()
+        self.jobs = list()
+
+    def write_bit_transposed(self) -> None:
+        """
+        Writes bit-transposed companions of the datasets of all jobs
+        (if "bit_transposed") and rewrites outdated companions
+        """
+        for _, parent, dataset_name, _ in self.jobs:
+            if dataset_name not in parent:
+                continue
+            transposed_name = bit_transposed_name(dataset_name)
+            if transposed_name in parent:
+                if parent[transposed_name].attrs["read_count"] == len(
+                    parent[dataset_name]
+                ):
+                    continue
+            elif not self.bit_transposed:
+                continue
+            write_bit_transposed_dataset(
+                parent, dataset_name, self.compression
+            )
+
+
+def add_bram_dataset(
+    path: Path, parent: h5py.Group, dataset_name: str, ingest: ReadIngest
+) -> None:
+    """
+    Adds bram reads as a dataset to group
+    (written by "ingest", see ReadIngest).
+    If the dataset already exists, only new reads are appended.
+
+    Parameters:
+        path: Path to directory that contains multiple bram reads
+              or to a packed read file (see packed_read_layout)
+        parent: Parent group of dataset
+        name: Name of the dataset (should be either "data" or "parity")
+        ingest: Streams the reads into the dataset
+    """
+    first_read = 0
+    if dataset_name in parent:
+        dataset = parent[dataset_name]
+        if dataset.maxshape[0] is not None:
+            raise ValueError(
+                f"Can't append reads to {dataset.name}, because it isn't "
+                "resizable (written by an older version of this script)"
+            )
+        first_read = dataset.shape[0]
+    ingest.add(path, parent, dataset_name, first_read)
 
 
 def add_bram_dataset_group(
-    path: Path, parent: h5py.Group, group_name: str
+    path: Path, parent: h5py.Group, group_name: str, ingest: ReadIngest
 ) -> None:
     """
     Adds multiple datasets based on content in "previous_value_00"
@@ -103,18 +437,20 @@ def add_bram_dataset_group(
         parent: Parent group of dataset
         name: Name of the group
               (should be either "previous_value_00" or "previous_value_ff")
+        ingest: Streams reads into datasets
     """
-    bram_data_group = parent.create_group(group_name)
-
-    # Add parity dataset if available
-    parity_path = Path(path, "parity_reads")
-    if parity_path.exists() and parity_path.is_dir():
-        add_bram_dataset(parity_path, bram_data_group, "parity_reads")
-
-    # Add data dataset if available
-    data_path = Path(path, "data_reads")
-    if data_path.exists() and data_path.is_dir():
-        add_bram_dataset(data_path, bram_data_group, "data_reads")
+    bram_data_group = parent.require_group(group_name)
+
+    # Add parity and data datasets if available
+    # (as directories of reads or as packed read files)
+    packed = Path(path, PACKED_INDEX_FILE).is_file()
+    for dataset_name in ["parity_reads", "data_reads"]:
+        if packed:
+            reads_path = Path(path, f"{dataset_name}.bin")
+        else:
+            reads_path = Path(path, dataset_name)
+        if reads_path.exists():
+            add_bram_dataset(reads_path, bram_data_group, dataset_name, ingest)
 
     # Add temperature if available
     temperature_path = Path(path, "temperature.txt")
@@ -122,40 +458,63 @@ def add_bram_dataset_group(
         add_temperature_dataset(temperature_path, bram_data_group)
 
 
+def store_bitstream(hdf5_file: h5py.File, content: bytes) -> str:
+    """
+    Stores a bitstream once in the content addressed bitstream store
+    (/<BITSTREAM_STORE>/<sha256 of content>). Bitstreams that are already
+    stored (e.g. full bitstreams shared by all BRAMs of a pblock)
+    are skipped.
+
+    Returns:
+        Absolute path of the bitstream dataset
+    """
+    store_group = hdf5_file.require_group(BITSTREAM_STORE)
+    content_hash = hashlib.sha256(content).hexdigest()
+    if content_hash not in store_group:
+        store_group.create_dataset(
+            content_hash, data=np.frombuffer(content, dtype=np.uint8)
+        )
+    return store_group[content_hash].name
+
+
 def add_bitstream_group(path: Path, parent: h5py.Group) -> None:
+    """
+    Adds the five bitstreams of a BRAM as soft links
+    (named like the bitstreams, e.g. "ff") to the bitstream store
+    (see store_bitstream)
+    """
     bs_files = [
         file_path for file_path in path.iterdir() if file_path.is_file()
     ]
 
+    # Bitstreams of a BRAM don't change, once they were added
+    if "bitstreams" in parent:
+        return
     bitstream_group = parent.create_group("bitstreams", track_order=True)
 
-    # Add five bitstreams as attributes
     for bs in bs_files:
         match bs.stem.split("_"):
             case [*_, "partial", "bram", "bs"]:
-                with open(bs, mode="rb") as f:
-                    bitstream_group.attrs["partial_bram_bs"] = np.void(
-                        f.read()
-                    )
+                name = "partial_bram_bs"
             case [*_, "modified", "partial"]:
-                with open(bs, mode="rb") as f:
-                    bitstream_group.attrs["modified_partial"] = np.void(
-                        f.read()
-                    )
+                name = "modified_partial"
             case [*_, "ff"]:
-                with open(bs, mode="rb") as f:
-                    bitstream_group.attrs["ff"] = np.void(f.read())
+                name = "ff"
             case [*_, "00"]:
-                with open(bs, mode="rb") as f:
-                    bitstream_group.attrs["00"] = np.void(f.read())
+                name = "00"
             case [*_, "bramless", "partial"]:
-                with open(bs, mode="rb") as f:
-                    bitstream_group.attrs["bramless_partial"] = np.void(
-                        f.read()
-                    )
+                name = "bramless_partial"
+            case _:
+                continue
+        with open(bs, mode="rb") as f:
+            bitstream_group[name] = h5py.SoftLink(
+                store_bitstream(parent.file, f.read())
+            )
 
 
-def add_bram_group(path: Path, parent: h5py.Group, include_bs: bool) -> None:
+def add_bram_group(
+    path: Path, parent: h5py.Group, include_bs: bool, ingest: ReadIngest
+) -> None:
     """
     Adds measurement Data from single BRAM experiment
     as path to a given parent group
@@ -165,17 +524,18 @@ def add_bram_group(path: Path, parent: h5py.Group, include_bs: bool) -> None:
     Parameters:
         path: Path to BRAM measurements in (Linux)filesystem
         parent: Parent group of new group
+        ingest: Streams reads into datasets
     """
 
     bram_name = path.parts[-1]
 
-    bram_group = parent.create_group(bram_name)
+    bram_group = parent.require_group(bram_name)
 
     sub_paths = [p for p in path.iterdir() if p.parts[-1] != "bs"]
     for expected_path in sub_paths:
         if expected_path.exists() and expected_path.is_dir():
             add_bram_dataset_group(
-                expected_path, bram_group, expected_path.parts[-1]
+                expected_path, bram_group, expected_path.parts[-1], ingest
             )
 
     bs_path = Path(path, "bs")
@@ -183,13 +543,15 @@ def add_bram_group(path: Path, parent: h5py.Group, include_bs: bool) -> None:
         add_bitstream_group(bs_path, bram_group)
 
 
-def add_pblock_group(path: Path, parent: h5py.Group, include_bs: bool) -> None:
+def add_pblock_group(
+    path: Path, parent: h5py.Group, include_bs: bool, ingest: ReadIngest
+) -> None:
     """
     Adds all bram data directories from a given pblock directory
     """
 
     pblock_name = path.parts[-1]
-    pblock_group = parent.create_group(pblock_name)
+    pblock_group = parent.require_group(pblock_name)
 
     bram_dirs = [
         sub_path
@@ -198,16 +560,16 @@ def add_pblock_group(path: Path, parent: h5py.Group, include_bs: bool) -> None:
     ]
 
     for bram_dir in bram_dirs:
-        add_bram_group(bram_dir, pblock_group, include_bs)
+        add_bram_group(bram_dir, pblock_group, include_bs, ingest)
 
 
 def add_single_board_group(
-    path: Path, parent: h5py.Group, include_bs: bool
+    path: Path, parent: h5py.Group, include_bs: bool, ingest: ReadIngest
 ) -> None:
     """
     Adds content of a board directory
     """
-    board_group = parent.create_group(path.parts[-1])
+    board_group = parent.require_group(path.parts[-1])
 
     # Add meta data from expected json file
     meta_data_json_path = Path(path, "meta_data.json")
@@ -222,34 +584,46 @@ def add_single_board_group(
     ]
 
     for pblock_dir in pblock_dirs:
-        add_pblock_group(pblock_dir, board_group, include_bs)
+        add_pblock_group(pblock_dir, board_group, include_bs, ingest)
 
 
-def add_boards_group(path: Path, parent: h5py.Group, include_bs: bool) -> None:
+def add_boards_group(
+    path: Path, parent: h5py.Group, include_bs: bool, ingest: ReadIngest
+) -> None:
     """
     Adds all board directories from a given boards directory
     """
-    boards_group = parent.create_group("boards")
+    boards_group = parent.require_group("boards")
 
     board_dirs = [sub_path for sub_path in path.iterdir() if sub_path.is_dir()]
 
     for board_dir in board_dirs:
-        add_single_board_group(board_dir, boards_group, include_bs)
+        add_single_board_group(board_dir, boards_group, include_bs, ingest)
 
 
 def derive_read_session_names(hdf5_file: h5py.Group) -> None:
     """
+    Writes the names of all read sessions of all BRAMs
+    (ordered by first occurrence). Replaces previously derived names,
+    so appended read sessions are included.
+
     Parameters:
         hdf5_file: File AFTER experiment data has been written to it
                    (after add_boards_group has already been called)
     """
-    read_session_names = [
-        read_session
-        for read_session in list(
-            list(list(hdf5_file["boards"].values())[0].values())[0].values()
-        )[0].keys()
-        if read_session != "bitstreams"
-    ]
+    read_session_names = list()
+    for board_group in hdf5_file["boards"].values():
+        for pblock_group in board_group.values():
+            for bram_group in pblock_group.values():
+                for read_session in bram_group.keys():
+                    if (
+                        read_session != "bitstreams"
+                        and read_session not in read_session_names
+                    ):
+                        read_session_names.append(read_session)
+
+    if "read_session_names" in hdf5_file:
+        del hdf5_file["read_session_names"]
     hdf5_file.create_dataset(
         "read_session_names",
         (len(read_session_names),),
@@ -271,20 +645,72 @@ parser.add_argument(
     required=False,
     action="store_true",
 )
+parser.add_argument(
+    "--compression",
+    help="hdf5 filter that compresses read datasets",
+    required=False,
+    choices=["gzip", "lzf"],
+    default=None,
+)
+parser.add_argument(
+    "--bit_transposed",
+    help="Pass this argument to also store each read dataset bit-transposed "
+    "(one row per bit index). Per bit statistics on some bit indices then "
+    "only read the chunks of these bits",
+    required=False,
+    action="store_true",
+)
+parser.add_argument(
+    "--append",
+    help="Existing hdf5 file that new boards, pblocks, BRAMs, read "
+    "sessions and reads of --root_dir are added to (instead of writing a "
+    "new file). Reads that the file already contains are not read again",
+    required=False,
+    default=None,
+)
+parser.add_argument(
+    "--threads",
+    help="Number of threads that read the files of reads",
+    required=False,
+    type=int,
+    default=DEFAULT_READER_THREADS,
+)
+parser.add_argument(
+    "--chunk_reads",
+    help="Number of reads per chunk of the read datasets. "
+    "Bounds the memory of reads that are kept at once",
+    required=False,
+    type=int,
+    default=DEFAULT_CHUNK_READS,
+)
 
 if __name__ == "__main__":
     args = parser.parse_args()
     date = str(datetime.datetime.now())
     arg_dict = vars(args)
     root_path = Path(arg_dict["root_dir"])
-    print(f"{root_path}_{date}.hdf5")
-    with h5py.File(f"{root_path}_{date}.hdf5", "w") as f:
+    if arg_dict["append"] is None:
+        hdf5_path = f"{root_path}_{date}.hdf5"
+        mode = "w"
+    else:
+        hdf5_path = arg_dict["append"]
+        mode = "a"
+    print(hdf5_path)
+    with h5py.File(hdf5_path, mode) as f:
         root_group = f
+        ingest = ReadIngest(
+            arg_dict["threads"],
+            arg_dict["chunk_reads"],
+            arg_dict["compression"],
+            arg_dict["bit_transposed"],
+        )
 
         add_meta_data_from_json(root_group, Path(root_path, "meta_data.json"))
         add_boards_group(
             Path(root_path, "boards"),
             root_group,
             not arg_dict["ignore_bitstreams"],
+            ingest,
         )
+        ingest.write()
         derive_read_session_names(root_group)
@@ -3,9 +3,9 @@ import enum
 from pathlib import Path
 from typing import Any
 
-import h5py
-
 import hdf5_wrapper.experiment_hdf5
+from hdf5_wrapper.read_cache import ReadCache
+from hdf5_wrapper.session_cache import SessionCache
 
 class DataSetting(enum.Enum):
     PBLOCK_WISE = enum.auto()
@@ -43,6 +43,14 @@ def parse_args() -> argparse.ArgumentParser:
         help="Path to NIST dataset file that shall be created",
         type=Path
     )
+    parser.add_argument(
+        "--read_cache_dir",
+        help="Directory of an on-disk cache of decoded reads " \
+        "(see hdf5_wrapper/read_cache.py). No cache is used if not given",
+        type=Path,
+        default=None,
+        required=False
+    )
     args = vars(parser.parse_args())
     args["setting"] = DataSetting[args["setting"]]
     return args
@@ -144,11 +152,21 @@ def select_data(
     
         
 def main(args: Any) -> None:
-    
-    with h5py.File(args["input_hdf5"], "r") as f:
+
+    # Only the first data read of each bram is used,
+    # so reads are decoded lazily (when they are used)
+    if args.get("read_cache_dir") is None:
+        read_cache = None
+    else:
+        read_cache = ReadCache(args["read_cache_dir"])
+    with SessionCache() as session_cache:
+        f = session_cache.file(args["input_hdf5"])
         print("Start")
         experiment = hdf5_wrapper.Experiment.from_hdf5(
-            f, commit=f.attrs["commit"]
+            f,
+            commit=f.attrs["commit"],
+            session_cache=session_cache,
+            read_cache=read_cache,
         )
         print("Finished opening hdf5 file.")
         created_data = select_data(
@@ -1,4 +1,15 @@
-from .experiment_hdf5 import ReadSession, BramBlock, PBlock, Board, Experiment
+from .experiment_hdf5 import (
+    ReadSession,
+    BramBlock,
+    PBlock,
+    Board,
+    Experiment,
+    Selection,
+)
 from .stat_container import ExperimentStat
-from .stats import InterdistanceStatistic, IntradistanceStatistic
+from .stats import (
+    InterdistanceStatistic,
+    IntradistanceStatistic,
+    ExactIntradistanceStatistic,
+)
 from .utility import add_commit_to_hdf5_group
@@ -0,0 +1,194 @@
+"""
+Contains vectorized kernels that operate on packed bit matrices.
+A packed bit matrix is a uint8 numpy array of shape (reads, bytes), where
+each row holds the bits of one Read (see PackedReads in experiment_hdf5.py).
+"""
+
+from dataclasses import dataclass
+from typing import Self
+import numpy as np
+import numpy.typing as npt
+
+# Number of rows that are unpacked at once.
+# Bounds the memory needed for unpacked bits (rows * bytes * 8)
+UNPACK_CHUNK_ROWS = 256
+# Number of byte columns that are unpacked at once,
+# for kernels that need all rows of a column
+UNPACK_CHUNK_COLUMNS = 64
+
+
+def bit_one_counts(
+    matrix: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint64]:
+    """
+    Counts for each bit index how often the bit was 1 over all rows
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+
+    Returns:
+        Number of 1's per bit index. Has shape (bytes * 8,)
+    """
+    one_counts = np.zeros(matrix.shape[1] * 8, dtype=np.uint64)
+    for chunk_start in range(0, matrix.shape[0], UNPACK_CHUNK_ROWS):
+        chunk = matrix[chunk_start:chunk_start + UNPACK_CHUNK_ROWS]
+        one_counts += np.unpackbits(chunk, axis=1).sum(
+            axis=0, dtype=np.uint64
+        )
+    return one_counts
+
+
+def row_hamming_weights(
+    matrix: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint64]:
+    """
+    Counts the number of 1's in each row (popcount)
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+
+    Returns:
+        Number of 1's per row. Has shape (reads,)
+    """
+    return np.bitwise_count(matrix).sum(axis=1, dtype=np.uint64)
+
+
+def last_change_idxs(
+    matrix: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.int64]:
+    """
+    Finds for each bit index the last row, where the bit differs from the
+    previous row (XOR of consecutive rows, then a reversed argmax).
+    Expects rows to be in chronological order.
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+
+    Returns:
+        Per bit index: Row index i of the last change
+        (row i - 1 differs from row i) or 0 if the bit never changed.
+        Has shape (bytes * 8,)
+    """
+    row_count = matrix.shape[0]
+    changes_packed = matrix[1:] ^ matrix[:-1]
+    last_changes = np.zeros(matrix.shape[1] * 8, dtype=np.int64)
+
+    # Columns are processed in chunks to bound the memory of unpacked bits
+    for column_start in range(0, matrix.shape[1], UNPACK_CHUNK_COLUMNS):
+        columns = slice(column_start, column_start + UNPACK_CHUNK_COLUMNS)
+        changes = np.unpackbits(changes_packed[:, columns], axis=1)
+        if not len(changes):
+            continue
+        reversed_first_change = np.argmax(changes[::-1], axis=0)
+        bits = slice(column_start * 8, column_start * 8 + changes.shape[1])
+        last_changes[bits] = np.where(
+            changes.any(axis=0), row_count - 1 - reversed_first_change, 0
+        )
+    return last_changes
+
+
+def transpose_bits(
+    matrix: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint8]:
+    """
+    Bit-transposed (bitshuffled) layout of a packed bit matrix:
+    Row i holds bit i of all rows of "matrix", packed along the rows.
+    Bits of a row of the result are mostly equal (stable bits),
+    so this layout compresses well and a single bit index is contiguous.
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+
+    Returns:
+        Packed bit matrix of shape (bytes * 8, ceil(reads / 8)).
+        Bits after the last read are 0.
+    """
+    transposed = np.empty(
+        (matrix.shape[1] * 8, (matrix.shape[0] + 7) // 8), dtype=np.uint8
+    )
+    # Columns are processed in chunks to bound the memory of unpacked bits
+    for column_start in range(0, matrix.shape[1], UNPACK_CHUNK_COLUMNS):
+        columns = slice(column_start, column_start + UNPACK_CHUNK_COLUMNS)
+        bits = np.unpackbits(matrix[:, columns], axis=1)
+        transposed[column_start * 8:column_start * 8 + bits.shape[1]] = (
+            np.packbits(bits.T, axis=1)
+        )
+    return transposed
+
+
+@dataclass
+class BitCountAccumulator:
+    """
+    Sufficient statistic of per bit probabilities (e.g. bit flip chance):
+    Number of 1's per bit index and the number of rows they were counted
+    over. Accumulators of disjoint sets of rows are merged by "+",
+    which is exact and independent of the merge order.
+
+    Attributes:
+        one_counts: Number of 1's per bit index. Has shape (bytes * 8,)
+        read_count: Number of rows that were counted
+    """
+
+    one_counts: npt.NDArray[np.uint32]
+    read_count: int = 0
+
+    def __post_init__(self) -> None:
+        self.one_counts = np.asarray(self.one_counts, dtype=np.uint32)
+        self.read_count = int(self.read_count)
+
+    @classmethod
+    def empty(cls, bit_count: int) -> Self:
+        """
+        Accumulator without any counted rows
+        """
+        return cls(np.zeros(bit_count, dtype=np.uint32))
+
+    @classmethod
+    def from_matrix(cls, matrix: npt.NDArray[np.uint8]) -> Self:
+        """
+        Counts all rows of a packed bit matrix of shape (reads, bytes)
+        """
+        return cls(bit_one_counts(matrix), matrix.shape[0])
+
+    @classmethod
+    def from_bit_transposed(
+        cls, transposed: npt.NDArray[np.uint8], read_count: int
+    ) -> Self:
+        """
+        Counts rows of a bit-transposed matrix (see transpose_bits) of
+        "read_count" reads. Counts are the popcounts of its rows,
+        reads don't have to be unpacked.
+        """
+        return cls(row_hamming_weights(transposed), read_count)
+
+    def update(self, matrix: npt.NDArray[np.uint8]) -> None:
+        """
+        Adds the rows of a chunk (packed bit matrix) in place
+        """
+        if matrix.shape[1] * 8 != len(self.one_counts):
+            raise ValueError(
+                f"Chunk has {matrix.shape[1] * 8} bits per row, "
+                f"expected {len(self.one_counts)}"
+            )
+        self.one_counts += bit_one_counts(matrix).astype(np.uint32)
+        self.read_count += matrix.shape[0]
+
+    def __add__(self, other: Self) -> Self:
+        if len(self.one_counts) != len(other.one_counts):
+            raise ValueError(
+                "Can't merge counts of different bit counts "
+                f"({len(self.one_counts)} and {len(other.one_counts)})"
+            )
+        return type(self)(
+            self.one_counts + other.one_counts,
+            self.read_count + other.read_count,
+        )
+
+    @property
+    def probabilities(self) -> npt.NDArray[np.float64]:
+        """
+        Relative frequency of 1's per bit index
+        """
+        if not self.read_count:
+            raise ValueError("No reads were counted")
+        return self.one_counts / self.read_count
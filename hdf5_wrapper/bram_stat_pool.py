@@ -0,0 +1,188 @@
+"""
+Contains a process pool that computes the Statistic's of BRAM blocks
+(see BramBlockStat in stat_container.py) in parallel.
+Workers load their BramBlock from the experiment hdf5 file themselves,
+so reads are never sent between processes (only the computed Statistic's).
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Self, Type
+from .experiment_hdf5 import BramBlock, ExperimentContainer, HDF5Source
+from .read_cache import ReadCache
+from .session_cache import SessionCache
+from .stats_base import Statistic
+from .utility import PlotSettings
+
+# Stack of pools whose context is active (see BramStatPool)
+_active_pools: list["BramStatPool"] = []
+
+
+def active_bram_stat_pool() -> "BramStatPool | None":
+    """
+    Returns the pool of the innermost active BramStatPool context
+    (None if there is no active context)
+    """
+    if _active_pools:
+        return _active_pools[-1]
+    else:
+        return None
+
+
+@dataclass(frozen=True)
+class BramStatJob:
+    """
+    Everything a worker needs to compute the Statistic's of one BRAM block
+
+    Attributes:
+        owner_type: Type of created Statistic container (e.g. BramBlockStat)
+        used_statistics: Statistic types that are computed by the worker
+        stat_func_kwargs: "stat_func_kwargs" of "used_statistics" mapped by
+                            their type (they may have been changed by user)
+        hdf5_source: Location of BramBlock in experiment hdf5 file
+        name: See BramBlock
+        read_session_names: See BramBlock
+        plot_settings: PlotSettings of created Statistic container
+        read_cache: On-disk cache of decoded reads (None if not used)
+    """
+
+    owner_type: Type
+    used_statistics: list[Type[Statistic]]
+    stat_func_kwargs: dict[Type[Statistic], dict]
+    hdf5_source: HDF5Source
+    name: str
+    read_session_names: list[str]
+    plot_settings: PlotSettings
+    read_cache: ReadCache | None = None
+
+
+def compute_bram_block_stat(job: BramStatJob) -> Any:
+    """
+    Runs inside of a worker process.
+    Loads the BramBlock of a job and creates its Statistic container.
+    """
+    # Settings of the main process are not necessarily inherited by workers
+    # (they are class attributes, see main.select_stats)
+    job.owner_type.used_statistics = job.used_statistics
+    for statistic_type, stat_func_kwargs in job.stat_func_kwargs.items():
+        statistic_type.stat_func_kwargs = stat_func_kwargs
+
+    # Read sessions are loaded lazily, so reads that are only counted
+    # (see ReadSession.stored_bit_counts) are never decoded
+    with SessionCache() as session_cache:
+        bram_block = BramBlock.from_hdf5_source(
+            job.hdf5_source,
+            job.name,
+            job.read_session_names,
+            read_cache=job.read_cache,
+            session_cache=session_cache,
+        )
+        return job.owner_type(bram_block, job.plot_settings)
+
+
+class BramStatPool:
+    """
+    Process pool that creates the Statistic containers of BRAM blocks.
+    StatAggregator's that compute their stats inside of a
+    "with BramStatPool(jobs):" context use this pool.
+
+    Statistic's that draw random samples use Generator's that are derived
+    from their PlotSettings (see PlotSettings.rng), so results are identical
+    to a serial run, regardless of the number of workers.
+
+    Attributes:
+        jobs: Number of worker processes
+        read_cache: On-disk cache of decoded reads that workers use
+                    (None if not used)
+        executor: Executor of worker processes (only set inside of context)
+        futures: Submitted jobs mapped by the HDF5Source of their BramBlock
+    """
+
+    jobs: int
+    read_cache: ReadCache | None
+    executor: ProcessPoolExecutor = None
+    futures: dict[HDF5Source, Future]
+
+    def __init__(self, jobs: int, read_cache: ReadCache = None) -> None:
+        if jobs < 1:
+            raise ValueError(f"Number of jobs has to be positive ({jobs})")
+        self.jobs = jobs
+        self.read_cache = read_cache
+        self.futures = dict()
+
+    def __enter__(self) -> Self:
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+        _active_pools.append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _active_pools.remove(self)
+        self.executor.shutdown(cancel_futures=True)
+        self.executor = None
+        self.futures = dict()
+
+    def submit(
+        self,
+        experiment_container: ExperimentContainer,
+        aggregator_type: Type,
+        plot_settings: PlotSettings,
+    ) -> None:
+        """
+        Submits jobs for all BramBlock's below "experiment_container"
+        that were loaded from hdf5 and haven't been submitted yet.
+        Submitting a whole experiment at once keeps all workers busy,
+        while the main process merges results of finished BramBlock's.
+
+        Arguments:
+            experiment_container: Container whose BramBlock's are submitted
+            aggregator_type: StatAggregator type that is used for
+                                "experiment_container"
+            plot_settings: PlotSettings of StatAggregator object
+        """
+        owner_type = aggregator_type.subowner_type
+        for subcontainer in experiment_container.subcontainers.values():
+            # Same expansion as in StatAggregator.compute_stats
+            subcontainer_plot_settings = plot_settings.with_expanded_path(
+                subcontainer.name
+            )
+            if not isinstance(subcontainer, BramBlock):
+                self.submit(
+                    subcontainer, owner_type, subcontainer_plot_settings
+                )
+            elif (
+                subcontainer.hdf5_source is not None
+                and subcontainer.hdf5_source not in self.futures
+            ):
+                job = BramStatJob(
+                    owner_type=owner_type,
+                    used_statistics=owner_type.used_statistics,
+                    stat_func_kwargs={
+                        statistic_type: statistic_type.stat_func_kwargs
+                        for statistic_type in owner_type.used_statistics
+                    },
+                    hdf5_source=subcontainer.hdf5_source,
+                    name=subcontainer.name,
+                    read_session_names=subcontainer.read_session_names,
+                    plot_settings=subcontainer_plot_settings,
+                    read_cache=self.read_cache,
+                )
+                self.futures[subcontainer.hdf5_source] = (
+                    self.executor.submit(compute_bram_block_stat, job)
+                )
+
+    def bram_block_stat(self, bram_block: BramBlock) -> Any:
+        """
+        Waits for the Statistic container of a submitted BramBlock
+
+        Arguments:
+            bram_block: BramBlock of the main process
+
+        Returns:
+            Statistic container or None if "bram_block" wasn't submitted
+        """
+        future = self.futures.pop(
+            getattr(bram_block, "hdf5_source", None), None
+        )
+        if future is None:
+            return None
+        return future.result()
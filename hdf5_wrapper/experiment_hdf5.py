@@ -9,31 +9,233 @@ import numpy as np
 import numpy.typing as npt
 import h5py
 from abc import ABC
-from dataclasses import dataclass, field
-from typing import List, Dict, Self
+from dataclasses import dataclass, field, replace
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any, List, Dict, Self
 from scipy.stats import entropy
-from functools import cached_property, reduce
-from scipy.spatial.distance import hamming
+from functools import cache, cached_property, reduce
+from .bit_matrix import BitCountAccumulator
+from .hamming_distance import hamming_distances
+from .read_cache import ReadCache
+from .session_cache import SessionCache
 
+# Group of the experiment hdf5 file that stores each distinct bitstream once
+# (named by its SHA-256). "bitstreams" groups of bram blocks link to it
+BITSTREAM_STORE = "bitstream_store"
+# Number of reads per chunk of streamed reads (see
+# LazyReadSession.streamed_reads)
+STREAM_CHUNK_READS = 1024
 
-@dataclass(frozen=True)
+
+def remove_signature_bytes(
+    packed: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint8]:
+    """
+    Drops the bytes that contain the signature of the read design
+    (along the last axis, so single reads and matrices of reads are handled)
+    """
+    return np.concatenate(
+        [packed[..., 32:32*64], packed[..., 33*64:-32]], axis=-1
+    )
+
+
+def filter_stripe_bytes(
+    packed: npt.NDArray, filter_even_stripes: bool
+) -> npt.NDArray:
+    """
+    Keeps the bytes of even or uneven stripes (along the last axis).
+    Stripes are blocks of 8 bytes, framed by 4 bytes on each side.
+    """
+    stripes = packed[..., 4:-4].reshape(*packed.shape[:-1], -1, 8)
+    if filter_even_stripes:
+        return np.concatenate(
+            [
+                packed[..., 0:4],
+                stripes[..., 1::2, :].reshape(*packed.shape[:-1], -1),
+                packed[..., -4:],
+            ],
+            axis=-1,
+        )
+    else:
+        return stripes[..., ::2, :].reshape(*packed.shape[:-1], -1)
+
+
+@cache
+def stripe_columns(
+    read_nbytes: int,
+    filter_even_stripes: bool = False,
+    filter_uneven_stripes: bool = False,
+) -> npt.NDArray[np.intp]:
+    """
+    Byte columns of raw reads (including signature bytes) that are kept by
+    stripe filters. Same bytes as Read.from_raw(..., True) followed by
+    Read.filter_stripe, but computed once and applied to whole matrices.
+
+    Arguments:
+        read_nbytes: Number of bytes of a raw read
+        filter_even_stripes: See ReadSession.from_hdf5
+        filter_uneven_stripes: See ReadSession.from_hdf5
+
+    Returns:
+        Read only array of column indices
+    """
+    columns = np.arange(read_nbytes)
+    if filter_even_stripes or filter_uneven_stripes:
+        columns = remove_signature_bytes(columns)
+    if filter_even_stripes:
+        columns = filter_stripe_bytes(columns, filter_even_stripes=True)
+    if filter_uneven_stripes:
+        columns = filter_stripe_bytes(columns, filter_even_stripes=False)
+    columns.setflags(write=False)
+    return columns
+
+
+def iter_dataset_chunks(
+    dataset: h5py.Dataset, chunk_size: int, read_range: slice = slice(None)
+) -> Iterator[npt.NDArray]:
+    """
+    Reads the rows (inside of "read_range") of a dataset in chunks of at
+    most "chunk_size" rows. Only one chunk is read at a time.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size has to be positive ({chunk_size})")
+    rows = range(*read_range.indices(len(dataset)))
+    for start in range(0, len(rows), chunk_size):
+        chunk_rows = rows[start:start + chunk_size]
+        yield dataset[
+            slice(chunk_rows.start, chunk_rows.stop, chunk_rows.step)
+        ]
+
+
+def bit_transposed_name(dataset_name: str) -> str:
+    """
+    Name of the optional bit-transposed companion of a read dataset
+    (e.g. "data_reads_bit_transposed"). Row i of the companion holds bit i
+    of all reads, packed along the reads (see bit_matrix.transpose_bits),
+    its attribute "read_count" is the number of reads.
+    """
+    return f"{dataset_name}_bit_transposed"
+
+
+def has_bit_transposed_reads(hdf5_group: h5py.Group) -> bool:
+    """
+    Whether a read session group has a bit-transposed companion of its
+    data or parity reads
+    """
+    return any(
+        bit_transposed_name(dataset_name) in hdf5_group
+        for dataset_name in ["data_reads", "parity_reads"]
+    )
+
+
+def dataset_read_nbytes(dataset: h5py.Dataset) -> int:
+    """
+    Number of bytes of a single read of a read dataset
+    (rows of opaque np.void or uint8 rows)
+    """
+    return dataset.dtype.itemsize * int(np.prod(dataset.shape[1:]))
+
+
+def raw_bit_idxs(
+    bit_idxs: npt.ArrayLike,
+    read_nbytes: int,
+    filter_even_stripes: bool = False,
+    filter_uneven_stripes: bool = False,
+) -> npt.NDArray[np.intp]:
+    """
+    Bit indices of raw reads (including signature bytes) of the bit indices
+    of reads that were loaded with the given stripe filters
+
+    Arguments:
+        bit_idxs: Bit indices of stripe filtered reads
+        read_nbytes: Number of bytes of a raw read
+        filter_even_stripes: See ReadSession.from_hdf5
+        filter_uneven_stripes: See ReadSession.from_hdf5
+    """
+    bit_idxs = np.asarray(bit_idxs, dtype=np.intp)
+    columns = stripe_columns(
+        read_nbytes,
+        filter_even_stripes=filter_even_stripes,
+        filter_uneven_stripes=filter_uneven_stripes,
+    )
+    return columns[bit_idxs // 8] * 8 + bit_idxs % 8
+
+
+def bit_columns_from_hdf5(
+    hdf5_group: h5py.Group,
+    dataset_name: str,
+    bit_idxs: npt.ArrayLike,
+    read_range: slice = slice(None),
+) -> npt.NDArray[np.uint8]:
+    """
+    Unpacked bits at raw bit indices "bit_idxs" of the reads (inside of
+    "read_range") of a read dataset. Reads are never decoded as a whole:
+    - If the bit-transposed companion (see bit_transposed_name) exists,
+      only its rows of the requested bits are read
+      (and only the chunks that contain them)
+    - Otherwise only the byte columns of the requested bits are read
+
+    Returns:
+        Bit matrix of shape (reads, len(bit_idxs))
+    """
+    bit_idxs = np.asarray(bit_idxs, dtype=np.intp)
+    dataset = hdf5_group[dataset_name]
+    read_idxs = range(*read_range.indices(len(dataset)))
+    if not len(bit_idxs):
+        return np.empty((len(read_idxs), 0), dtype=np.uint8)
+
+    transposed_name = bit_transposed_name(dataset_name)
+    if transposed_name in hdf5_group:
+        # h5py selects rows by increasing indices
+        unique_bits, bit_positions = np.unique(bit_idxs, return_inverse=True)
+        transposed = hdf5_group[transposed_name]
+        bits = np.unpackbits(
+            transposed[unique_bits], axis=1, count=len(dataset)
+        )
+        return bits[:, read_range].T[:, bit_positions]
+
+    byte_columns, byte_positions = np.unique(
+        bit_idxs // 8, return_inverse=True
+    )
+    if dataset.ndim == 1:
+        # Opaque np.void rows can't be split into columns
+        matrix = PackedReads.from_hdf5_dataset(dataset, read_range).matrix[
+            :, byte_columns
+        ]
+    else:
+        matrix = dataset[read_range, byte_columns]
+    bits = np.unpackbits(matrix, axis=1)
+    return bits[:, byte_positions * 8 + bit_idxs % 8]
+
+
+@dataclass(frozen=True, eq=False)
 class Read:
     """
     Wrapper around a single read value of the BRAM
     - also sometimes called SUV (start up value)
+    - Read objects are cheap views on a single row of a PackedReads matrix.
+      Bits are only unpacked when they are accessed.
 
     Attributes:
-        raw_read: SUV as bytes object
-        bits: SUV as numpy array. Has shape (x, 8)
+        packed: SUV as numpy array of bytes. Has shape (x,)
     """
 
-    raw_read: bytes | None
-    # Not noted in type hint because numpy type hinting best practice
-    bits: npt.NDArray[np.int8]
+    packed: npt.NDArray[np.uint8]
 
     @property
-    def bits_flattened(self) -> npt.NDArray[np.float64]:
-        return self.bits.flatten()
+    def raw_read(self) -> bytes:
+        return self.packed.tobytes()
+
+    @property
+    def bits(self) -> npt.NDArray[np.uint8]:
+        """
+        SUV as numpy array of bits. Has shape (x, 8)
+        """
+        return np.unpackbits(self.packed).reshape(len(self.packed), 8)
+
+    @property
+    def bits_flattened(self) -> npt.NDArray[np.uint8]:
+        return np.unpackbits(self.packed)
 
     @property
     def bits_flattened_bool(self) -> npt.NDArray[np.bool_]:
@@ -50,51 +252,346 @@ class Read:
 
     @classmethod
     def from_raw(
-        cls, raw_read: bytes, remove_signature_bits: bool = False, 
+        cls, raw_read: bytes, remove_signature_bits: bool = False,
         cache_raw_read: bool = False
     ) -> Self:
         """
         Creates Read object from raw read.
         Args:
             raw_read (bytes): Single read of bram startup value
+            remove_signature_bits: Drops the bytes that contain the
+                                   signature of the read design
+            cache_raw_read: Kept for compatibility. The raw read can always
+                            be restored from the packed bytes.
         """
-        uint8_read = np.frombuffer(raw_read, dtype=np.uint8)
-        bits = np.unpackbits(uint8_read).reshape(len(raw_read), 8)
+        packed = np.frombuffer(raw_read, dtype=np.uint8)
         if remove_signature_bits:
-            bits = np.concatenate([bits[32:32*64], bits[33*64:-32]], axis=0)
-        if cache_raw_read:
-            return cls(raw_read, bits)
-        else:
-            return cls(None, bits)
+            packed = remove_signature_bytes(packed)
+        return cls(packed)
 
     def filter_stripe(self, filter_even_stripes: bool) -> Self:
-        new_bit_parts = []
-        sub_array_count = (len(self.bits)-8)/8
-        if filter_even_stripes:
-            new_bit_parts.append(self.bits[0:4])
-            temp_sub_arrays = np.array(np.split(self.bits[4:-4], sub_array_count))
-            new_bit_parts += [subarray for subarray in (temp_sub_arrays[1::2])]
-            new_bit_parts.append(self.bits[-4:])
-            new_bits = np.concatenate(new_bit_parts, axis=0)
+        return Read(filter_stripe_bytes(self.packed, filter_even_stripes))
+
+
+@dataclass(frozen=True, eq=False)
+class PackedReads(Sequence):
+    """
+    All Read's of one kind (data or parity) of a ReadSession,
+    stored as one contiguous matrix of packed bits.
+    Behaves like a list of Read's, where each Read is a view on a row.
+
+    Attributes:
+        matrix: Packed SUV's as numpy array. Has shape (reads, bytes)
+    """
+
+    matrix: npt.NDArray[np.uint8]
+
+    @property
+    def bit_count(self) -> int:
+        """
+        Number of bits of a single Read
+        """
+        return self.matrix.shape[1] * 8
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+    @property
+    def bits(self) -> npt.NDArray[np.uint8]:
+        """
+        Unpacked bits of all Read's. Has shape (reads, bytes * 8)
+        Note: Uses 8 times the memory of "matrix"
+        """
+        return np.unpackbits(self.matrix, axis=1)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def __getitem__(self, idx: int | slice) -> "Read | PackedReads":
+        if isinstance(idx, slice):
+            return PackedReads(self.matrix[idx])
         else:
-            temp_sub_arrays = np.array(np.split(self.bits[4:-4], sub_array_count))
-            new_bits = np.array([subarray for subarray in (temp_sub_arrays[::2])])
-        return Read(b"", new_bits)
+            return Read(self.matrix[idx])
+
+    def __iter__(self) -> Iterator[Read]:
+        return (Read(row) for row in self.matrix)
+
+    def __add__(self, other: Self) -> Self:
+        return PackedReads.merge_from_list([self, other])
+
+    @classmethod
+    def from_reads(cls, reads: Sequence[Read]) -> Self:
+        """
+        Stacks Read's into a PackedReads object.
+        PackedReads objects are returned as they are (without copy).
+        ConcatenatedReads are copied into a single matrix, which is only
+        intended for functions that need one (e.g. all pairs of reads).
+        Per read and per bit functions use "matrices_from_reads" instead.
+
+        Args:
+            reads: list of Read's (all of the same length)
+        """
+        if isinstance(reads, PackedReads):
+            return reads
+        elif isinstance(reads, ConcatenatedReads):
+            return cls(reads.matrix)
+        else:
+            return cls(np.stack([read.packed for read in reads]))
+
+    @classmethod
+    def matrices_from_reads(
+        cls, reads: Sequence[Read]
+    ) -> list[npt.NDArray[np.uint8]]:
+        """
+        Bit matrices of Read's without copying merged reads:
+        The matrices of the parts of ConcatenatedReads, otherwise the
+        matrix of "from_reads". Rows of all matrices are the Read's in order.
+        """
+        if isinstance(reads, ConcatenatedReads):
+            return [part.matrix for part in reads.parts]
+        return [cls.from_reads(reads).matrix]
+
+    @classmethod
+    def merge_from_list(cls, packed_reads: list[Self]) -> Self:
+        return cls(np.concatenate([reads.matrix for reads in packed_reads]))
+
+    def filter_stripes(
+        self,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> Self:
+        """
+        Applies stripe filters to raw reads (including signature bytes)
+        by selecting the columns of "stripe_columns" at once
+        """
+        if not (filter_even_stripes or filter_uneven_stripes):
+            return self
+        return PackedReads(
+            self.matrix[
+                :,
+                stripe_columns(
+                    self.matrix.shape[1],
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                ),
+            ]
+        )
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Self]:
+        """
+        Iterates over all reads in chunks of at most "chunk_size" reads
+        (views on "matrix")
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size has to be positive ({chunk_size})")
+        for start in range(0, len(self), chunk_size):
+            yield self[start:start + chunk_size]
+
+    @classmethod
+    def iter_hdf5_dataset_chunks(
+        cls,
+        dataset: h5py.Dataset,
+        chunk_size: int,
+        read_range: slice = slice(None),
+    ) -> Iterator[Self]:
+        """
+        Reads the reads (inside of "read_range") of a dataset in chunks of
+        at most "chunk_size" reads. Only one chunk is read at a time, so
+        memory is bounded regardless of the number of reads.
+
+        Args:
+            dataset: Dataset of reads (one read per row)
+            chunk_size: Maximum number of reads per chunk
+            read_range: Rows that are read
+        """
+        for raw_reads in iter_dataset_chunks(dataset, chunk_size, read_range):
+            yield cls.from_raw_reads(raw_reads)
+
+    @classmethod
+    def from_hdf5_dataset(
+        cls, dataset: h5py.Dataset, read_range: slice = slice(None)
+    ) -> Self:
+        """
+        Reads the reads (inside of "read_range") of a dataset
+        with a single hdf5 read. Reads are stored as opaque (np.void) rows,
+        the resulting buffer is viewed as a (reads, bytes) matrix
+        without copying it.
+
+        Args:
+            dataset: Dataset of reads (one read per row)
+            read_range: Rows that are read
+        """
+        return cls.from_raw_reads(dataset[read_range])
+
+    @classmethod
+    def from_raw_reads(cls, raw_reads: npt.NDArray) -> Self:
+        """
+        Views rows of a read dataset (e.g. opaque np.void rows)
+        as a (reads, bytes) matrix without copying them
+        """
+        read_nbytes = raw_reads.dtype.itemsize * int(
+            np.prod(raw_reads.shape[1:])
+        )
+        return cls(
+            raw_reads.view(np.uint8).reshape(raw_reads.shape[0], read_nbytes)
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class ConcatenatedReads(Sequence):
+    """
+    Virtual concatenation of multiple PackedReads (e.g. the reads of all
+    bram blocks of a pblock). Behaves like a PackedReads object, but only
+    references the matrices of its parts instead of copying them.
+    Rows are views on the matrices of the parts.
+
+    Attributes:
+        parts: Concatenated PackedReads (all with the same bit count)
+        offsets: Index of the first row of each part (and the total length)
+    """
+
+    parts: list[PackedReads]
+    offsets: npt.NDArray[np.int64] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "offsets",
+            np.cumsum([0] + [len(part) for part in self.parts]),
+        )
+
+    @property
+    def bit_count(self) -> int:
+        return self.parts[0].bit_count
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory of the referenced matrices
+        """
+        return sum([part.matrix.nbytes for part in self.parts])
+
+    @property
+    def matrix(self) -> npt.NDArray[np.uint8]:
+        """
+        Concatenated matrix of all parts
+        Note: Copies all reads, prefer "iter_chunks" where possible
+        """
+        return np.concatenate([part.matrix for part in self.parts])
+
+    @property
+    def bits(self) -> npt.NDArray[np.uint8]:
+        return np.unpackbits(self.matrix, axis=1)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, idx: int | slice) -> "Read | PackedReads":
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            part_idx = np.searchsorted(self.offsets, start, side="right") - 1
+            if (
+                step == 1
+                and part_idx < len(self.parts)
+                and stop <= self.offsets[part_idx + 1]
+            ):
+                # Rows of a single part are returned as a view
+                offset = self.offsets[part_idx]
+                return self.parts[part_idx][start - offset:stop - offset]
+            # Otherwise only the selected rows are copied
+            row_indices = np.arange(start, stop, step)
+            part_indices = (
+                np.searchsorted(self.offsets, row_indices, side="right") - 1
+            )
+            matrix = np.empty(
+                (len(row_indices), self.bit_count // 8), dtype=np.uint8
+            )
+            for part_idx in np.unique(part_indices):
+                rows = part_indices == part_idx
+                matrix[rows] = self.parts[part_idx].matrix[
+                    row_indices[rows] - self.offsets[part_idx]
+                ]
+            return PackedReads(matrix)
+
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Read index {idx} out of range")
+        part_idx = np.searchsorted(self.offsets, idx, side="right") - 1
+        return self.parts[part_idx][idx - self.offsets[part_idx]]
+
+    def __iter__(self) -> Iterator[Read]:
+        return (read for part in self.parts for read in part)
+
+    def __add__(self, other: "PackedReads | Self") -> Self:
+        return ConcatenatedReads.merge_from_list([self, other])
+
+    def filter_stripes(
+        self,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> Self:
+        """
+        See PackedReads.filter_stripes (applied to each part)
+        """
+        return ConcatenatedReads(
+            [
+                part.filter_stripes(
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                )
+                for part in self.parts
+            ]
+        )
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[PackedReads]:
+        """
+        Iterates over all reads in chunks of at most "chunk_size" reads.
+        Chunks are views (chunks end at the borders of parts).
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size has to be positive ({chunk_size})")
+        for part in self.parts:
+            for start in range(0, len(part), chunk_size):
+                yield part[start:start + chunk_size]
+
+    @classmethod
+    def merge_from_list(
+        cls, packed_reads: "list[PackedReads | ConcatenatedReads]"
+    ) -> Self:
+        """
+        Concatenates PackedReads and ConcatenatedReads without copying.
+        Parts of ConcatenatedReads are taken over, so nesting
+        (e.g. pblocks of boards) doesn't add indirections.
+        """
+        parts = list()
+        for reads in packed_reads:
+            if isinstance(reads, ConcatenatedReads):
+                parts += reads.parts
+            else:
+                parts.append(reads)
+        return cls(parts)
 
 
 def reliability_with_predefined_value(
     comparison_value: Read, reads: list[Read]
 ) -> np.float64:
     """ """
-    r_i = comparison_value.bits_flattened
-    intradistance_sum = sum(
-        [hamming(r_i, other_read.bits_flattened) for other_read in reads]
+    matrix = PackedReads.from_reads(reads).matrix
+    intradistance_sum = np.sum(
+        hamming_distances(
+            comparison_value.packed[np.newaxis],
+            matrix,
+            np.zeros(len(reads), dtype=np.intp),
+            np.arange(len(reads)),
+        )
     )
     normalized_avg_intradistance = intradistance_sum / len(reads)
     return (1 - normalized_avg_intradistance) * 100
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class ReadSession:
     """
     Container that gathers lists of reads of same the read session.
@@ -108,18 +605,26 @@ class ReadSession:
 
     Attributes:
         data_reads: Read's made from brams "regular" bits' startup values
+                    (stored as a single bit matrix, see PackedReads.
+                    Merged read sessions reference the matrices of their
+                    parts, see ConcatenatedReads)
         parity_reads: Read's made from brams parity bits' startup values
+                    (stored like "data_reads")
         temperatures: Temperature values after each readout procedure
                       (Index parallel to data_ and parity_reads)
+        hdf5_source: Read session group that the reads are counted from
+                     (see stored_bit_counts). Only set if the group has
+                     bit-transposed reads
     """
 
     # ReadSession's (and many other objects)
     # differentiate between data and parity reads.
     # Both are SRAM bits that can be written and read from the BRAM.
     # We separated them because we assume(d) that they may behave differently.
-    data_reads: List[Read]
-    parity_reads: List[Read]
+    data_reads: PackedReads | ConcatenatedReads
+    parity_reads: PackedReads | ConcatenatedReads
     temperatures: List[float]
+    hdf5_source: "HDF5Source" = None
 
     @classmethod
     def from_hdf5(
@@ -127,44 +632,372 @@ class ReadSession:
         hdf5_group: h5py.Group,
         filter_even_stripes: bool = False,
         filter_uneven_stripes: bool = False,
-        cache_raw_reads: bool = False
+        cache_raw_reads: bool = False,
+        read_range: slice = slice(None),
+        read_cache: ReadCache = None,
     ) -> "ReadSession":
         """
         Parses this object from a hdf5 subgroup,
-        belonging to a experiment hdf5 file
+        belonging to a experiment hdf5 file.
+        Only the reads (and temperatures) inside of "read_range" are read.
+        Decoded reads are taken from (or saved to) "read_cache" if given.
         """
-        data_read_dataset = hdf5_group["data_reads"]
-        if filter_even_stripes or filter_uneven_stripes:
-            data_reads = [Read.from_raw(bytes(read), remove_signature_bits=True, cache_raw_read=cache_raw_reads) for read in data_read_dataset]
-        else:
-            data_reads = [Read.from_raw(bytes(read), cache_raw_read=cache_raw_reads) for read in data_read_dataset]
-        if filter_even_stripes:
-            data_reads = [
-                read.filter_stripe(filter_even_stripes=True)
-                for read in data_reads
-            ]
-        if filter_uneven_stripes:
-            data_reads = [
-                read.filter_stripe(filter_even_stripes=False)
-                for read in data_reads
-            ]
+        return cls(
+            cls.data_reads_from_hdf5(
+                hdf5_group,
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=filter_uneven_stripes,
+                read_range=read_range,
+                read_cache=read_cache,
+            ),
+            cls.parity_reads_from_hdf5(
+                hdf5_group, read_range=read_range, read_cache=read_cache
+            ),
+            cls.temperatures_from_hdf5(hdf5_group, read_range=read_range),
+            hdf5_source=(
+                HDF5Source.from_hdf5_group(
+                    hdf5_group,
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                    read_range=read_range,
+                )
+                if has_bit_transposed_reads(hdf5_group)
+                else None
+            ),
+        )
 
-        parity_read_dataset = hdf5_group["parity_reads"]
-        parity_reads = [
-            Read.from_raw(bytes(read), cache_raw_read=cache_raw_reads) for read in parity_read_dataset
-        ]
+    @staticmethod
+    def data_reads_from_hdf5(
+        hdf5_group: h5py.Group,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+        read_range: slice = slice(None),
+        read_cache: ReadCache = None,
+    ) -> PackedReads:
+        """
+        Decodes the data reads (inside of "read_range")
+        of a read session group
+        """
+        def decode() -> PackedReads:
+            return PackedReads.from_hdf5_dataset(
+                hdf5_group["data_reads"], read_range
+            ).filter_stripes(
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=filter_uneven_stripes,
+            )
+
+        if read_cache is None:
+            return decode()
+        hdf5_source = HDF5Source.from_hdf5_group(
+            hdf5_group,
+            filter_even_stripes=filter_even_stripes,
+            filter_uneven_stripes=filter_uneven_stripes,
+            read_range=read_range,
+        )
+        return PackedReads(
+            read_cache.matrix(
+                hdf5_source, "data_reads", lambda: decode().matrix
+            )
+        )
+
+    @staticmethod
+    def parity_reads_from_hdf5(
+        hdf5_group: h5py.Group,
+        read_range: slice = slice(None),
+        read_cache: ReadCache = None,
+    ) -> PackedReads:
+        """
+        Decodes the parity reads (inside of "read_range")
+        of a read session group
+        """
+        def decode() -> PackedReads:
+            return PackedReads.from_hdf5_dataset(
+                hdf5_group["parity_reads"], read_range
+            )
+
+        if read_cache is None:
+            return decode()
+        hdf5_source = HDF5Source.from_hdf5_group(
+            hdf5_group, read_range=read_range
+        )
+        return PackedReads(
+            read_cache.matrix(
+                hdf5_source, "parity_reads", lambda: decode().matrix
+            )
+        )
 
-        temperatures = [
-            temperature for temperature in hdf5_group["temperature"]
+    @staticmethod
+    def temperatures_from_hdf5(
+        hdf5_group: h5py.Group, read_range: slice = slice(None)
+    ) -> list[float]:
+        """
+        Reads the temperatures (inside of "read_range")
+        of a read session group
+        """
+        return [
+            temperature
+            for temperature in hdf5_group["temperature"][read_range]
         ]
 
-        return cls(data_reads, parity_reads, temperatures)
+    @staticmethod
+    def bit_counts_from_hdf5(
+        hdf5_group: h5py.Group,
+        bit_idxs: npt.ArrayLike | None = None,
+        dataset_name: str = "data_reads",
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+        read_range: slice = slice(None),
+    ) -> BitCountAccumulator:
+        """
+        Number of 1's per bit index over the reads (inside of "read_range")
+        of a read session group. Per bit statistics (bit flip chance,
+        stable bits, bit aliasing) only need these counts.
+        Uses the bit-transposed companion of the dataset if it exists
+        (see bit_columns_from_hdf5), so only the requested bits are read.
+        Otherwise whole reads are decoded, unless bit indices are given.
+
+        Args:
+            hdf5_group: Read session group
+            bit_idxs: Bit indices of reads loaded with the given stripe
+                      filters (see from_hdf5). All bits if None
+            dataset_name: "data_reads" or "parity_reads"
+            filter_even_stripes: See from_hdf5
+            filter_uneven_stripes: See from_hdf5
+            read_range: Reads that are counted
+
+        Returns:
+            Counts, indexed like "bit_idxs"
+        """
+        dataset = hdf5_group[dataset_name]
+        read_nbytes = dataset_read_nbytes(dataset)
+        has_transposed = bit_transposed_name(dataset_name) in hdf5_group
+        if bit_idxs is None and not has_transposed:
+            return BitCountAccumulator.from_matrix(
+                PackedReads.from_hdf5_dataset(dataset, read_range)
+                .filter_stripes(
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                )
+                .matrix
+            )
+        if bit_idxs is None:
+            bit_idxs = np.arange(
+                len(
+                    stripe_columns(
+                        read_nbytes,
+                        filter_even_stripes=filter_even_stripes,
+                        filter_uneven_stripes=filter_uneven_stripes,
+                    )
+                )
+                * 8
+            )
+        bit_idxs = raw_bit_idxs(
+            bit_idxs,
+            read_nbytes,
+            filter_even_stripes=filter_even_stripes,
+            filter_uneven_stripes=filter_uneven_stripes,
+        )
+        if has_transposed and read_range == slice(None) and len(bit_idxs):
+            # Bits after the last read are 0, so popcounts of whole rows
+            # are the counts (h5py selects rows by increasing indices)
+            unique_bits, bit_positions = np.unique(
+                bit_idxs, return_inverse=True
+            )
+            transposed = hdf5_group[bit_transposed_name(dataset_name)]
+            return BitCountAccumulator.from_bit_transposed(
+                transposed[unique_bits][bit_positions], len(dataset)
+            )
+        bits = bit_columns_from_hdf5(
+            hdf5_group, dataset_name, bit_idxs, read_range
+        )
+        return BitCountAccumulator(bits.sum(axis=0), bits.shape[0])
+
+    @classmethod
+    def bit_counts_from_hdf5_source(
+        cls,
+        hdf5_group: h5py.Group,
+        hdf5_source: "HDF5Source",
+        reads_name: str,
+        only_use_first_element: bool = False,
+    ) -> BitCountAccumulator | None:
+        """
+        Number of 1's per bit index of the data or parity reads of a read
+        session group that is loaded as described by "hdf5_source".
+        Whole reads are never decoded: Counts are taken from the
+        bit-transposed companion (see bit_counts_from_hdf5), or from the
+        first read only.
+
+        Args:
+            hdf5_group: Read session group
+            hdf5_source: HDF5Source of "hdf5_group"
+            reads_name: "data_reads" or "parity_reads"
+            only_use_first_element: Only count the first read
+                                    (see stat_functions.bit_counts)
+
+        Returns:
+            Counts (None if the reads would have to be decoded)
+        """
+        read_range = hdf5_source.read_slice
+        if only_use_first_element:
+            return BitCountAccumulator.from_matrix(
+                cls.first_reads_from_hdf5(
+                    hdf5_group, hdf5_source, reads_name
+                ).matrix
+            )
+        if bit_transposed_name(reads_name) not in hdf5_group:
+            return None
+        if reads_name == "data_reads":
+            return cls.bit_counts_from_hdf5(
+                hdf5_group,
+                dataset_name=reads_name,
+                filter_even_stripes=hdf5_source.filter_even_stripes,
+                filter_uneven_stripes=hdf5_source.filter_uneven_stripes,
+                read_range=read_range,
+            )
+        return cls.bit_counts_from_hdf5(
+            hdf5_group, dataset_name=reads_name, read_range=read_range
+        )
+
+    @classmethod
+    def first_reads_from_hdf5(
+        cls,
+        hdf5_group: h5py.Group,
+        hdf5_source: "HDF5Source",
+        reads_name: str,
+    ) -> PackedReads:
+        """
+        Decodes only the first of the data or parity reads of a read
+        session group that is loaded as described by "hdf5_source"
+
+        Returns:
+            First read (no reads if the read range is empty)
+        """
+        first_read = range(len(hdf5_group[reads_name]))[
+            hdf5_source.read_slice
+        ][:1]
+        read_range = slice(first_read.start, first_read.stop, first_read.step)
+        if reads_name == "data_reads":
+            return cls.data_reads_from_hdf5(
+                hdf5_group,
+                filter_even_stripes=hdf5_source.filter_even_stripes,
+                filter_uneven_stripes=hdf5_source.filter_uneven_stripes,
+                read_range=read_range,
+            )
+        return cls.parity_reads_from_hdf5(hdf5_group, read_range=read_range)
+
+    def first_reads(self, reads_name: str) -> PackedReads:
+        """
+        First of the data or parity reads
+        (see LazyReadSession.first_reads)
+        """
+        return getattr(self, reads_name)[:1]
+
+    def stored_bit_counts(
+        self, reads_name: str, only_use_first_element: bool = False
+    ) -> BitCountAccumulator | None:
+        """
+        Counts of the data or parity reads from the read session group
+        this read session was loaded from (see bit_counts_from_hdf5_source).
+        None if they have to be counted from the decoded reads.
+        """
+        if self.hdf5_source is None or only_use_first_element:
+            # The first read is already decoded
+            return None
+        with h5py.File(self.hdf5_source.file_path, "r") as f:
+            return self.bit_counts_from_hdf5_source(
+                f[self.hdf5_source.group_path],
+                self.hdf5_source,
+                reads_name,
+                only_use_first_element=only_use_first_element,
+            )
+
+    def streamed_reads(self, reads_name: str) -> None:
+        """
+        Reads of ReadSession's are decoded already, so they are never
+        streamed (see LazyReadSession.streamed_reads)
+        """
+        return None
 
     def __add__(self, other: Self) -> Self:
+        return ReadSession.merge_from_list([self, other])
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Self]:
+        """
+        Iterates over the read session in chunks of at most "chunk_size"
+        consecutive reads. Each chunk is a ReadSession (data and parity reads
+        are views, unless a chunk spans parts of merged reads).
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size has to be positive ({chunk_size})")
+        for start in range(0, len(self.data_reads), chunk_size):
+            stop = start + chunk_size
+            yield ReadSession(
+                self.data_reads[start:stop],
+                self.parity_reads[start:stop],
+                self.temperatures[start:stop],
+            )
+
+    @classmethod
+    def iter_hdf5_chunks(
+        cls,
+        hdf5_group: h5py.Group,
+        chunk_size: int,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+        read_range: slice = slice(None),
+    ) -> Iterator[Self]:
+        """
+        Streams a read session group in chunks of at most "chunk_size"
+        reads, without loading the whole read session
+        (see PackedReads.iter_hdf5_dataset_chunks).
+        Chunks are equal to the chunks of "iter_chunks" of the
+        read session that "from_hdf5" creates with the same options.
+        """
+        data_chunks = PackedReads.iter_hdf5_dataset_chunks(
+            hdf5_group["data_reads"], chunk_size, read_range
+        )
+        parity_chunks = PackedReads.iter_hdf5_dataset_chunks(
+            hdf5_group["parity_reads"], chunk_size, read_range
+        )
+        temperature_chunks = iter_dataset_chunks(
+            hdf5_group["temperature"], chunk_size, read_range
+        )
+        for data_reads, parity_reads, temperatures in zip(
+            data_chunks, parity_chunks, temperature_chunks
+        ):
+            yield cls(
+                data_reads.filter_stripes(
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                ),
+                parity_reads,
+                [temperature for temperature in temperatures],
+            )
+
+    def filter_stripes(
+        self,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> Self:
+        """
+        Applies stripe filters to the data reads of a read session
+        that was loaded without stripe filters (see ReadSession.from_hdf5)
+        """
+        hdf5_source = self.hdf5_source
+        if hdf5_source is not None:
+            hdf5_source = replace(
+                hdf5_source,
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=filter_uneven_stripes,
+            )
         return ReadSession(
-            self.data_reads + other.data_reads,
-            self.parity_reads + other.parity_reads,
-            self.temperatures + other.temperatures,
+            self.data_reads.filter_stripes(
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=filter_uneven_stripes,
+            ),
+            self.parity_reads,
+            self.temperatures,
+            hdf5_source=hdf5_source,
         )
 
     @classmethod
@@ -176,16 +1009,416 @@ class ReadSession:
         Args:
             read_sessions: List of ReadSession's objects that shall be merged
         """
-        merged_data_reads = list()
-        merged_parity_reads = list()
-        merged_temperatures = list()
+        if any(
+            [
+                isinstance(read_session, LazyReadSession)
+                for read_session in read_sessions
+            ]
+        ):
+            return LazyReadSession.merge_from_list(read_sessions)
 
+        merged_temperatures = list()
         for read_session in read_sessions:
-            merged_data_reads += read_session.data_reads
-            merged_parity_reads += read_session.parity_reads
             merged_temperatures += read_session.temperatures
 
-        return cls(merged_data_reads, merged_parity_reads, merged_temperatures)
+        return cls(
+            ConcatenatedReads.merge_from_list(
+                [read_session.data_reads for read_session in read_sessions]
+            ),
+            ConcatenatedReads.merge_from_list(
+                [read_session.parity_reads for read_session in read_sessions]
+            ),
+            merged_temperatures,
+        )
+
+
+@dataclass(frozen=True)
+class HDF5Source:
+    """
+    Location of an object inside of an experiment hdf5 file and the options
+    that were used to load it.
+    Allows to load the same object again (e.g. in another process).
+
+    Attributes:
+        file_path: Path of experiment hdf5 file
+        group_path: Absolute path of the objects group inside of the file
+        filter_even_stripes: See ReadSession.from_hdf5
+        filter_uneven_stripes: See ReadSession.from_hdf5
+        read_range: (start, stop, step) of loaded reads, see Selection
+                    (slice objects are not hashable)
+    """
+
+    file_path: str
+    group_path: str
+    filter_even_stripes: bool = False
+    filter_uneven_stripes: bool = False
+    read_range: tuple[int | None, int | None, int | None] = (None, None, None)
+
+    @property
+    def read_slice(self) -> slice:
+        return slice(*self.read_range)
+
+    @classmethod
+    def from_hdf5_group(
+        cls,
+        hdf5_group: h5py.Group,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+        read_range: slice = slice(None),
+    ) -> Self:
+        """
+        HDF5Source of a group that is loaded with the given options
+        """
+        return cls(
+            hdf5_group.file.filename,
+            hdf5_group.name,
+            filter_even_stripes=filter_even_stripes,
+            filter_uneven_stripes=filter_uneven_stripes,
+            read_range=(read_range.start, read_range.stop, read_range.step),
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class LazyReadSession:
+    """
+    Lazily loaded counterpart of ReadSession (provides the same attributes).
+    "data_reads", "parity_reads" and "temperatures" are decoded separately
+    when they are accessed for the first time and are kept in a SessionCache.
+    - e.g. parity reads are never decoded if only data reads are used
+    Decoded values that were evicted from the cache are decoded again.
+
+    Attributes:
+        decoders: Functions that decode "data_reads", "parity_reads" and
+                    "temperatures", mapped by these names
+        session_cache: Cache that keeps decoded values
+        source: Read session that attributes without a decoder are taken
+                from (e.g. the unfiltered read session of a stripe
+                filtered one), so they aren't cached twice
+        hdf5_source: Read session group that the reads are counted from
+                     (see stored_bit_counts), None for merged read sessions
+    """
+
+    decoders: Dict[str, Callable[[], Any]]
+    session_cache: SessionCache
+    source: "LazyReadSession | ReadSession" = None
+    hdf5_source: HDF5Source = None
+
+    def decoded(self, attribute_name: str) -> Any:
+        """
+        Returns the decoded value of an attribute (decodes it if needed)
+        """
+        if attribute_name not in self.decoders:
+            return getattr(self.source, attribute_name)
+        return self.session_cache.get(
+            (self, attribute_name), self.decoders[attribute_name]
+        )
+
+    @property
+    def data_reads(self) -> PackedReads | ConcatenatedReads:
+        return self.decoded("data_reads")
+
+    @property
+    def parity_reads(self) -> PackedReads | ConcatenatedReads:
+        return self.decoded("parity_reads")
+
+    @property
+    def temperatures(self) -> List[float]:
+        return self.decoded("temperatures")
+
+    def stored_bit_counts(
+        self, reads_name: str, only_use_first_element: bool = False
+    ) -> BitCountAccumulator | None:
+        """
+        Lazy counterpart of ReadSession.stored_bit_counts.
+        Reads are not decoded, unless they have to be counted from the
+        decoded reads (None is returned then).
+        """
+        if self.hdf5_source is None:
+            return None
+        return ReadSession.bit_counts_from_hdf5_source(
+            self.session_cache.file(self.hdf5_source.file_path)[
+                self.hdf5_source.group_path
+            ],
+            self.hdf5_source,
+            reads_name,
+            only_use_first_element=only_use_first_element,
+        )
+
+    def is_decoded(self, attribute_name: str) -> bool:
+        """
+        Whether the value of an attribute is kept by the SessionCache
+        (or derived from a kept value of "source")
+        """
+        if (self, attribute_name) in self.session_cache.decoded_values:
+            return True
+        if isinstance(self.source, LazyReadSession):
+            return self.source.is_decoded(attribute_name)
+        return self.source is not None
+
+    def first_reads(self, reads_name: str) -> PackedReads:
+        """
+        First of the data or parity reads (e.g. for uniqueness).
+        Only the first read is decoded, unless the reads are decoded
+        already or the read session wasn't loaded from hdf5 (merged).
+        """
+        if self.hdf5_source is None or self.is_decoded(reads_name):
+            return getattr(self, reads_name)[:1]
+        return ReadSession.first_reads_from_hdf5(
+            self.session_cache.file(self.hdf5_source.file_path)[
+                self.hdf5_source.group_path
+            ],
+            self.hdf5_source,
+            reads_name,
+        )
+
+    def streamed_reads(self, reads_name: str) -> Iterator[PackedReads] | None:
+        """
+        Chunks of the data or parity reads that statistics consume instead
+        of the decoded reads (see SimpleStatistic.streaming_stat_func).
+        Reads are streamed from hdf5 if they are larger than the
+        "stream_threshold" of the SessionCache and aren't decoded already,
+        so they are never decoded as a whole.
+
+        Args:
+            reads_name: "data_reads" or "parity_reads"
+
+        Returns:
+            Chunks of at most STREAM_CHUNK_READS reads
+            (None if the reads aren't streamed)
+        """
+        if self.hdf5_source is None or self.is_decoded(reads_name):
+            return None
+        dataset = self.session_cache.file(self.hdf5_source.file_path)[
+            self.hdf5_source.group_path
+        ][reads_name]
+        read_slice = self.hdf5_source.read_slice
+        nbytes = len(range(len(dataset))[read_slice]) * dataset_read_nbytes(
+            dataset
+        )
+        if nbytes <= self.session_cache.stream_threshold:
+            return None
+        chunks = PackedReads.iter_hdf5_dataset_chunks(
+            dataset, STREAM_CHUNK_READS, read_slice
+        )
+        if reads_name == "parity_reads":
+            return chunks
+        return (
+            chunk.filter_stripes(
+                filter_even_stripes=self.hdf5_source.filter_even_stripes,
+                filter_uneven_stripes=self.hdf5_source.filter_uneven_stripes,
+            )
+            for chunk in chunks
+        )
+
+    def __add__(self, other: "ReadSession | Self") -> Self:
+        return ReadSession.merge_from_list([self, other])
+
+    def filter_stripes(
+        self,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> Self:
+        """
+        Lazy counterpart of ReadSession.filter_stripes.
+        Filtered data reads are derived from the (cached) unfiltered ones,
+        so stripe filtered read sessions don't decode the reads again.
+        Parity reads and temperatures are taken from this read session.
+        """
+        return LazyReadSession(
+            {
+                "data_reads": lambda: self.data_reads.filter_stripes(
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                ),
+            },
+            self.session_cache,
+            source=self,
+            hdf5_source=(
+                None
+                if self.hdf5_source is None
+                else replace(
+                    self.hdf5_source,
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                )
+            ),
+        )
+
+    @classmethod
+    def from_hdf5_source(
+        cls,
+        hdf5_source: HDF5Source,
+        session_cache: SessionCache,
+        read_cache: ReadCache = None,
+    ) -> Self:
+        """
+        Creates a lazily loaded read session. Nothing is read from hdf5 until
+        an attribute is accessed.
+
+        Arguments:
+            hdf5_source: Location of read session group and load options
+            session_cache: Cache that keeps decoded values and the opened file
+            read_cache: On-disk cache of decoded reads (optional)
+        """
+        def hdf5_group() -> h5py.Group:
+            return session_cache.file(hdf5_source.file_path)[
+                hdf5_source.group_path
+            ]
+
+        return cls(
+            {
+                "data_reads": lambda: ReadSession.data_reads_from_hdf5(
+                    hdf5_group(),
+                    filter_even_stripes=hdf5_source.filter_even_stripes,
+                    filter_uneven_stripes=hdf5_source.filter_uneven_stripes,
+                    read_range=hdf5_source.read_slice,
+                    read_cache=read_cache,
+                ),
+                "parity_reads": lambda: ReadSession.parity_reads_from_hdf5(
+                    hdf5_group(),
+                    read_range=hdf5_source.read_slice,
+                    read_cache=read_cache,
+                ),
+                "temperatures": lambda: ReadSession.temperatures_from_hdf5(
+                    hdf5_group(), read_range=hdf5_source.read_slice
+                ),
+            },
+            session_cache,
+            hdf5_source=hdf5_source,
+        )
+
+    @classmethod
+    def merge_from_list(
+        cls, read_sessions: "list[ReadSession | LazyReadSession]"
+    ) -> Self:
+        """
+        Lazy counterpart of ReadSession.merge_from_list.
+        Read sessions are only merged (and decoded) when an attribute of the
+        merged read session is accessed.
+        """
+        session_cache = [
+            read_session.session_cache
+            for read_session in read_sessions
+            if isinstance(read_session, LazyReadSession)
+        ][0]
+        return cls(
+            {
+                "data_reads": lambda: ConcatenatedReads.merge_from_list(
+                    [read_session.data_reads for read_session in read_sessions]
+                ),
+                "parity_reads": lambda: ConcatenatedReads.merge_from_list(
+                    [
+                        read_session.parity_reads
+                        for read_session in read_sessions
+                    ]
+                ),
+                "temperatures": lambda: [
+                    temperature
+                    for read_session in read_sessions
+                    for temperature in read_session.temperatures
+                ],
+            },
+            session_cache,
+        )
+
+
+@dataclass(frozen=True)
+class Selection:
+    """
+    Selects the parts of an experiment hdf5 file that are loaded.
+    Applied while walking the file, so unselected groups and reads are
+    never read or decoded.
+    Containers without selected BRAM blocks are skipped.
+
+    Attributes:
+        boards: Names of selected boards (None selects all)
+        pblocks: Names of selected pblocks (None selects all)
+        brams: Names of selected bram blocks, e.g. RAMB36_X2Y12
+                (None selects all)
+        read_sessions: Names of selected read sessions (None selects all)
+        read_range: Reads (and temperatures) of each read session that are
+                    loaded, e.g. slice(0, 100) for the first 100 reads
+    """
+
+    boards: tuple[str, ...] | None = None
+    pblocks: tuple[str, ...] | None = None
+    brams: tuple[str, ...] | None = None
+    read_sessions: tuple[str, ...] | None = None
+    read_range: slice = field(default_factory=lambda: slice(None))
+
+    def __post_init__(self) -> None:
+        if self.read_range.step is not None and self.read_range.step < 1:
+            raise ValueError(
+                f"Step of read range has to be positive ({self.read_range})"
+            )
+
+    @staticmethod
+    def selects(names: tuple[str, ...] | None, name: str) -> bool:
+        return names is None or name in names
+
+    def bram_keys(self, pblock_group: h5py.Group) -> list[str]:
+        """
+        Names of selected bram block groups of a pblock group
+        """
+        return [
+            key
+            for key in pblock_group
+            if "RAMB36" in key and self.selects(self.brams, key)
+        ]
+
+    def pblock_keys(self, board_group: h5py.Group) -> list[str]:
+        """
+        Names of selected pblock groups of a board group
+        """
+        return [
+            key
+            for key in board_group
+            if "pblock" in key
+            and self.selects(self.pblocks, key)
+            and self.bram_keys(board_group[key])
+        ]
+
+    def board_keys(self, boards_group: h5py.Group) -> list[str]:
+        """
+        Names of selected board groups of the "boards" group
+        """
+        return [
+            key
+            for key in boards_group
+            if self.selects(self.boards, key)
+            and self.pblock_keys(boards_group[key])
+        ]
+
+    def read_session_names(self, read_session_names: list[str]) -> list[str]:
+        """
+        Selected read session names (in the order of "read_session_names")
+        """
+        if self.read_sessions is None:
+            return read_session_names
+        unknown_names = set(self.read_sessions) - set(read_session_names)
+        if unknown_names:
+            raise ValueError(
+                f"Unknown read sessions selected: {sorted(unknown_names)}"
+            )
+        return [
+            name for name in read_session_names if name in self.read_sessions
+        ]
+
+    def hdf5_source(
+        self,
+        hdf5_group: h5py.Group,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> HDF5Source:
+        """
+        HDF5Source of a group that is loaded with this selection
+        """
+        return HDF5Source.from_hdf5_group(
+            hdf5_group,
+            filter_even_stripes=filter_even_stripes,
+            filter_uneven_stripes=filter_uneven_stripes,
+            read_range=self.read_range,
+        )
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -196,13 +1429,17 @@ class BramBlock:
     Attributes:
         name: Name of bram block: e.g. RAMB36_X2Y12
         read_sessions: ReadSession objects mapped by their name
+                        (LazyReadSession's if loaded lazily)
         read_session_names: Names of all existings ReadSession's
+        hdf5_source: Where the object was loaded from
+                        (None if it wasn't loaded from hdf5)
     """
 
     name: str
-    read_sessions: Dict[str, ReadSession]
+    read_sessions: Dict[str, ReadSession | LazyReadSession]
     read_session_names: list[str]
     bram_count: int = field(init=False, default=1)
+    hdf5_source: HDF5Source = None
 
     @property
     def read_sessions_unmerged(self) -> dict[str, list[ReadSession]]:
@@ -227,6 +1464,34 @@ class BramBlock:
             )
         return reliability_per_session_dict
 
+    def filter_stripes(
+        self,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> Self:
+        """
+        Stripe filtered copy of a bram block that was loaded without stripe
+        filters. Reads are not decoded again (see ReadSession.filter_stripes)
+        """
+        hdf5_source = self.hdf5_source
+        if hdf5_source is not None:
+            hdf5_source = replace(
+                hdf5_source,
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=filter_uneven_stripes,
+            )
+        return replace(
+            self,
+            read_sessions={
+                name: read_session.filter_stripes(
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                )
+                for name, read_session in self.read_sessions.items()
+            },
+            hdf5_source=hdf5_source,
+        )
+
     @classmethod
     def from_hdf5(
         cls,
@@ -235,28 +1500,129 @@ class BramBlock:
         read_session_names: list[str],
         filter_even_stripes: bool = False,
         filter_uneven_stripes: bool = False,
+        session_cache: SessionCache = None,
+        selection: Selection = Selection(),
+        read_cache: ReadCache = None,
     ) -> Self:
         """
         Parses this object from a hdf5 subgroup,
-        belonging to a experiment hdf5 file
+        belonging to a experiment hdf5 file.
+        Only read sessions of "read_session_names" are loaded
+        (see Selection for "selection").
+        ReadSession's are loaded lazily if a "session_cache" is given
+        (see LazyReadSession).
+        Decoded reads are taken from (or saved to) "read_cache" if given.
         """
-        read_sessions = {
-            key: ReadSession.from_hdf5(
-                hdf5_group[key],
-                filter_even_stripes=filter_even_stripes,
-                filter_uneven_stripes=filter_uneven_stripes,
-            )
-            for key in hdf5_group
-            # Skip bs directory of experiment hdf5 file
-            if key != "bitstreams"
-        }
+        read_sessions = dict()
+        for key in hdf5_group:
+            # Also skips bs directory of experiment hdf5 file
+            if key not in read_session_names:
+                continue
+            elif session_cache is None:
+                read_sessions[key] = ReadSession.from_hdf5(
+                    hdf5_group[key],
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                    read_range=selection.read_range,
+                    read_cache=read_cache,
+                )
+            else:
+                read_sessions[key] = LazyReadSession.from_hdf5_source(
+                    selection.hdf5_source(
+                        hdf5_group[key],
+                        filter_even_stripes=filter_even_stripes,
+                        filter_uneven_stripes=filter_uneven_stripes,
+                    ),
+                    session_cache,
+                    read_cache=read_cache,
+                )
 
         return cls(
             name=name,
             read_sessions=read_sessions,
             read_session_names=read_session_names,
+            hdf5_source=selection.hdf5_source(
+                hdf5_group,
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=filter_uneven_stripes,
+            ),
         )
 
+    @staticmethod
+    def bitstreams_from_hdf5(
+        hdf5_group: h5py.Group, names: list[str] | None = None
+    ) -> dict[str, bytes]:
+        """
+        Reads the bitstreams of a bram block group.
+        Bitstreams are links to the bitstream store (see BITSTREAM_STORE)
+        or attributes (files written by older versions of
+        create_hdf5_from_file_structure.py).
+        Bitstream bytes are only read by this function, never on load.
+
+        Args:
+            hdf5_group: Bram block group
+            names: Names of the bitstreams (e.g. "ff", "partial_bram_bs").
+                   All bitstreams if None
+
+        Returns:
+            Bitstreams mapped by their name (empty if there are none)
+        """
+        if "bitstreams" not in hdf5_group:
+            return dict()
+        bitstream_group = hdf5_group["bitstreams"]
+        if names is None:
+            names = list(bitstream_group.attrs) + list(bitstream_group)
+        bitstreams = dict()
+        for name in names:
+            if name in bitstream_group.attrs:
+                bitstreams[name] = bitstream_group.attrs[name].tobytes()
+            else:
+                bitstreams[name] = bitstream_group[name][()].tobytes()
+        return bitstreams
+
+    def bitstreams(self, names: list[str] | None = None) -> dict[str, bytes]:
+        """
+        Reads the bitstreams of this bram block from its hdf5 file
+        (see bitstreams_from_hdf5)
+        """
+        if self.hdf5_source is None:
+            raise ValueError(f"Bram block {self.name} has no hdf5 file")
+        with h5py.File(self.hdf5_source.file_path, "r") as f:
+            return self.bitstreams_from_hdf5(
+                f[self.hdf5_source.group_path], names
+            )
+
+    @classmethod
+    def from_hdf5_source(
+        cls,
+        hdf5_source: HDF5Source,
+        name: str,
+        read_session_names: list[str],
+        read_cache: ReadCache = None,
+        session_cache: SessionCache = None,
+    ) -> Self:
+        """
+        Loads this object (again) from its HDF5Source
+        (lazily if a "session_cache" is given, see from_hdf5)
+        """
+        def load(hdf5_file: h5py.File) -> Self:
+            return cls.from_hdf5(
+                hdf5_file[hdf5_source.group_path],
+                name,
+                read_session_names,
+                filter_even_stripes=hdf5_source.filter_even_stripes,
+                filter_uneven_stripes=hdf5_source.filter_uneven_stripes,
+                session_cache=session_cache,
+                selection=Selection(read_range=hdf5_source.read_slice),
+                read_cache=read_cache,
+            )
+
+        if session_cache is not None:
+            # Lazily loaded read sessions need the file to stay open
+            return load(session_cache.file(hdf5_source.file_path))
+        with h5py.File(hdf5_source.file_path, "r") as f:
+            return load(f)
+
 
 @dataclass(frozen=True, kw_only=True)
 class ExperimentContainer(ABC):
@@ -309,6 +1675,30 @@ class ExperimentContainer(ABC):
             ]
             pass
 
+    def filter_stripes(
+        self,
+        filter_even_stripes: bool = False,
+        filter_uneven_stripes: bool = False,
+    ) -> Self:
+        """
+        Stripe filtered copy of a container that was loaded without stripe
+        filters. Equal to loading it with these filters
+        (see ReadSession.from_hdf5), but reads are not decoded again.
+        """
+        return replace(
+            self,
+            subcontainers={
+                name: subcontainer.filter_stripes(
+                    filter_even_stripes=filter_even_stripes,
+                    filter_uneven_stripes=filter_uneven_stripes,
+                )
+                for name, subcontainer in self.subcontainers.items()
+            },
+            # Merged again from the filtered subcontainers
+            read_sessions=dict(),
+            read_sessions_unmerged=dict(),
+        )
+
 
 @dataclass(frozen=True, kw_only=True)
 class PBlock(ExperimentContainer):
@@ -340,7 +1730,10 @@ class PBlock(ExperimentContainer):
     def from_hdf5(
         cls, hdf5_group: h5py.Group, name: str, read_session_names: list[str],
         filter_even_stripes: bool = False,
-        filter_uneven_stripes: bool = False
+        filter_uneven_stripes: bool = False,
+        session_cache: SessionCache = None,
+        selection: Selection = Selection(),
+        read_cache: ReadCache = None,
     ) -> Self:
         """
         Parses this object from a hdf5 subgroup, belonging
@@ -350,10 +1743,12 @@ class PBlock(ExperimentContainer):
             key: BramBlock.from_hdf5(
                 hdf5_group[key], key, read_session_names=read_session_names,
                 filter_even_stripes=filter_even_stripes,
-                filter_uneven_stripes=filter_uneven_stripes
+                filter_uneven_stripes=filter_uneven_stripes,
+                session_cache=session_cache,
+                selection=selection,
+                read_cache=read_cache,
             )
-            for key in hdf5_group
-            if "RAMB36" in key
+            for key in selection.bram_keys(hdf5_group)
         }
         bram_count = sum([bram.bram_count for bram in bram_blocks.values()])
         return cls(
@@ -388,7 +1783,10 @@ class Board(ExperimentContainer):
     def from_hdf5(
         cls, hdf5_group: h5py.Group, read_session_names: list[str],
         filter_even_stripes: bool = False,
-        filter_uneven_stripes: bool = False
+        filter_uneven_stripes: bool = False,
+        session_cache: SessionCache = None,
+        selection: Selection = Selection(),
+        read_cache: ReadCache = None,
     ) -> Self:
         """
         Parses this object from a hdf5 subgroup,
@@ -416,10 +1814,12 @@ class Board(ExperimentContainer):
             key: PBlock.from_hdf5(
                 hdf5_group[key], key, read_session_names=read_session_names,
                 filter_even_stripes=filter_even_stripes,
-                filter_uneven_stripes=filter_uneven_stripes
+                filter_uneven_stripes=filter_uneven_stripes,
+                session_cache=session_cache,
+                selection=selection,
+                read_cache=read_cache,
             )
-            for key in hdf5_group
-            if "pblock" in key
+            for key in selection.pblock_keys(hdf5_group)
         }
         bram_count = sum([pblock.bram_count for pblock in pblocks.values()])
         kwargs["bram_count"] = bram_count
@@ -446,25 +1846,41 @@ class Experiment(ExperimentContainer):
     @classmethod
     def from_hdf5(cls, hdf5_group: h5py.Group, commit: str,
         filter_even_stripes: bool = False,
-        filter_uneven_stripes: bool = False) -> Self:
+        filter_uneven_stripes: bool = False,
+        session_cache: SessionCache = None,
+        selection: Selection = Selection(),
+        read_cache: ReadCache = None) -> Self:
         """
         Parses this object from a hdf5 subgroup,
-        belonging to a experiment hdf5 file
+        belonging to a experiment hdf5 file.
+        If a "session_cache" is given, reads are loaded lazily
+        (see LazyReadSession) and the file has to stay open until all reads
+        were used (e.g. open it via SessionCache.file).
+        Only the parts of "selection" are loaded (see Selection).
+        Decoded reads are taken from (or saved to) "read_cache" if given
+        (see ReadCache).
         """
-        read_session_names = [
-            binary_str.decode()
-            for binary_str in hdf5_group["read_session_names"]
-        ]
+        read_session_names = selection.read_session_names(
+            [
+                binary_str.decode()
+                for binary_str in hdf5_group["read_session_names"]
+            ]
+        )
 
         boards = {
             board: Board.from_hdf5(
                 hdf5_group["boards"][board],
                 read_session_names=read_session_names,
                 filter_even_stripes=filter_even_stripes,
-                filter_uneven_stripes=filter_uneven_stripes
+                filter_uneven_stripes=filter_uneven_stripes,
+                session_cache=session_cache,
+                selection=selection,
+                read_cache=read_cache,
             )
-            for board in hdf5_group["boards"]
+            for board in selection.board_keys(hdf5_group["boards"])
         }
+        if not boards:
+            raise ValueError(f"{selection} selects no BRAM blocks")
         bram_count = sum([board.bram_count for board in boards.values()])
         return cls(
             name="experiment",
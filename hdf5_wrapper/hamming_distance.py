@@ -0,0 +1,221 @@
+"""
+Contains a Hamming distance engine that works on packed bit matrices.
+Rows are compared as uint64 words via XOR and popcount,
+without ever unpacking single bits.
+Kernels can split their work across threads, since numpy releases the GIL
+for XOR, popcount and matrix products (BLAS).
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+
+# Number of pairs that are compared at once.
+# Bounds the memory of gathered rows (pairs * bytes per row * 2)
+PAIR_CHUNK_SIZE = 1024
+
+
+def ordered_map(
+    func: Callable[[Any], Any], items: Iterable[Any], threads: int = 1
+) -> Iterator[Any]:
+    """
+    Applies "func" to all items in a pool of "threads" threads.
+    Results are yielded in the order of "items" (deterministic),
+    at most 2 * "threads" results are computed ahead (bounds memory).
+    """
+    if threads < 1:
+        raise ValueError(f"Number of threads has to be positive ({threads})")
+    if threads == 1:
+        yield from map(func, items)
+        return
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * threads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def packed_words(matrix: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint64]:
+    """
+    Reinterprets a packed bit matrix as uint64 words.
+    Rows are padded with zero bytes if their length is not dividable by 8.
+    (Padding does not change Hamming distances)
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+
+    Returns:
+        Matrix of shape (reads, ceil(bytes / 8))
+    """
+    padding = -matrix.shape[1] % 8
+    if padding:
+        matrix = np.pad(matrix, ((0, 0), (0, padding)))
+    return np.ascontiguousarray(matrix).view(np.uint64)
+
+
+def hamming_distance_counts(
+    words: npt.NDArray[np.uint64],
+    other_words: npt.NDArray[np.uint64],
+    idxs: npt.NDArray[np.intp],
+    other_idxs: npt.NDArray[np.intp],
+    threads: int = 1,
+) -> npt.NDArray[np.uint64]:
+    """
+    Computes the absolute Hamming distances of all given pairs in one call.
+    Pair i is (words[idxs[i]], other_words[other_idxs[i]]).
+
+    Arguments:
+        words: Packed words (see packed_words)
+        other_words: Packed words with the same number of columns as "words"
+        idxs: Row indices into "words"
+        other_idxs: Row indices into "other_words" (same length as "idxs")
+        threads: Number of threads that chunks of pairs are split across
+
+    Returns:
+        Number of differing bits per pair
+    """
+    idxs = np.asarray(idxs, dtype=np.intp)
+    other_idxs = np.asarray(other_idxs, dtype=np.intp)
+    if idxs.shape != other_idxs.shape:
+        raise ValueError(
+            "Index arrays have different lengths "
+            f"({len(idxs)}, {len(other_idxs)})"
+        )
+
+    def chunk_distance_counts(chunk: slice) -> npt.NDArray[np.uint64]:
+        return np.bitwise_count(
+            words[idxs[chunk]] ^ other_words[other_idxs[chunk]]
+        ).sum(axis=1, dtype=np.uint64)
+
+    distance_counts = np.empty(len(idxs), dtype=np.uint64)
+    chunks = [
+        slice(chunk_start, chunk_start + PAIR_CHUNK_SIZE)
+        for chunk_start in range(0, len(idxs), PAIR_CHUNK_SIZE)
+    ]
+    for chunk, chunk_counts in zip(
+        chunks, ordered_map(chunk_distance_counts, chunks, threads)
+    ):
+        distance_counts[chunk] = chunk_counts
+    return distance_counts
+
+
+def hamming_distances(
+    matrix: npt.NDArray[np.uint8],
+    other_matrix: npt.NDArray[np.uint8],
+    idxs: npt.NDArray[np.intp],
+    other_idxs: npt.NDArray[np.intp],
+    threads: int = 1,
+) -> npt.NDArray[np.float64]:
+    """
+    Relative Hamming distances of all given pairs of rows
+    (same values as scipy.spatial.distance.hamming over unpacked bits)
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+        other_matrix: Packed bit matrix of shape (other_reads, bytes)
+        idxs: Row indices into "matrix"
+        other_idxs: Row indices into "other_matrix"
+        threads: See hamming_distance_counts
+
+    Returns:
+        Relative Hamming distance per pair
+    """
+    if matrix.shape[1] != other_matrix.shape[1]:
+        raise ValueError(
+            "Rows of compared matrices have different lengths "
+            f"({matrix.shape[1]}, {other_matrix.shape[1]})"
+        )
+    bit_count = matrix.shape[1] * 8
+    words = packed_words(matrix)
+    other_words = words if other_matrix is matrix else packed_words(
+        other_matrix
+    )
+    return (
+        hamming_distance_counts(
+            words, other_words, idxs, other_idxs, threads
+        )
+        / bit_count
+    )
+
+
+def signed_bits(matrix: npt.NDArray[np.uint8]) -> npt.NDArray[np.float32]:
+    """
+    Unpacks a packed bit matrix to +1 (bit is 0) and -1 (bit is 1) values.
+    The dot product of two such rows is bits - 2 * hamming_distance.
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+
+    Returns:
+        Matrix of shape (reads, bytes * 8)
+    """
+    return 1 - 2 * np.unpackbits(matrix, axis=1).astype(np.float32)
+
+
+def distance_count_tile(
+    matrix: npt.NDArray[np.uint8], rows: slice, columns: slice
+) -> npt.NDArray[np.int64]:
+    """
+    Absolute Hamming distances between the rows "rows" and "columns"
+    of a packed bit matrix, via matrix products of +-1 values:
+        D = (bits - A * B^T) / 2
+    float32 products are exact, because all values are integers < 2^24.
+
+    Returns:
+        Distance counts of shape (rows, columns)
+    """
+    bit_count = matrix.shape[1] * 8
+    row_signs = signed_bits(matrix[rows])
+    if columns == rows:
+        column_signs = row_signs
+    else:
+        column_signs = signed_bits(matrix[columns])
+    products = row_signs @ column_signs.T
+    return ((bit_count - products) / 2).astype(np.int64)
+
+
+def all_pairs_distance_count_tiles(
+    matrix: npt.NDArray[np.uint8], tile_size: int = 256, threads: int = 1
+) -> Iterator[tuple[slice, slice, npt.NDArray[np.int64]]]:
+    """
+    Computes absolute Hamming distances between all rows of a packed bit
+    matrix, tile by tile (see distance_count_tile).
+    Only tiles on or above the diagonal are produced, since D is symmetric.
+    Memory is bounded by the tile size (tile_size * bytes * 8 * 4 bytes
+    for each of both tile operands, per thread).
+
+    Arguments:
+        matrix: Packed bit matrix of shape (reads, bytes)
+        tile_size: Number of rows per tile
+        threads: Number of threads that tiles are computed by.
+                    Tiles are yielded in the same order for any number
+
+    Yields:
+        (rows, columns, distance counts of these rows and columns)
+    """
+    if tile_size < 1:
+        raise ValueError(f"Tile size has to be positive (got {tile_size})")
+    row_count = matrix.shape[0]
+
+    tiles = [
+        (
+            slice(row_start, min(row_start + tile_size, row_count)),
+            slice(column_start, min(column_start + tile_size, row_count)),
+        )
+        for row_start in range(0, row_count, tile_size)
+        for column_start in range(row_start, row_count, tile_size)
+    ]
+    for (rows, columns), distance_counts in zip(
+        tiles,
+        ordered_map(
+            lambda tile: distance_count_tile(matrix, *tile), tiles, threads
+        ),
+    ):
+        yield rows, columns, distance_counts
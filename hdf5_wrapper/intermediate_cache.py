@@ -0,0 +1,69 @@
+"""
+Contains a memoization layer for intermediate results that are derived from
+the Read's of a ReadSession (e.g. one counts per bit or hamming weights per
+Read). Different Statistic types are often based on the same intermediates.
+Inside of a "shared_intermediates" context each intermediate is computed
+only once per reads object (data or parity reads of a ReadSession, or the
+ReadSession itself for intermediates that are counted from hdf5).
+"""
+
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+
+# Stack of active caches. Only the outermost context creates a cache.
+# Caches map reads objects (weakly) to {intermediate name: result}
+_active_caches: list[weakref.WeakKeyDictionary] = []
+
+
+@contextmanager
+def shared_intermediates() -> Iterator[None]:
+    """
+    Activates the memoization of intermediates (see session_intermediate)
+    for the duration of the context.
+    The cache is dropped when the (outermost) context is left.
+    """
+    if _active_caches:
+        # Nested contexts share the cache of the outer context
+        yield
+    else:
+        _active_caches.append(weakref.WeakKeyDictionary())
+        try:
+            yield
+        finally:
+            _active_caches.pop()
+
+
+def session_intermediate(
+    name: str,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator for functions that derive an intermediate from a reads object.
+    Results are memoized by (identity of reads object, name) while a
+    "shared_intermediates" context is active.
+    Additional (hashable) arguments are part of the key.
+    Reads objects that can't be referenced weakly (e.g. lists) are never
+    memoized.
+    Note: Memoized results are shared and must not be modified by callers.
+
+    Arguments:
+        name: Name of the intermediate. Has to be unique among decorated
+                functions.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(reads: Any, *args: Any, **kwargs: Any) -> Any:
+            if not _active_caches:
+                return func(reads, *args, **kwargs)
+            try:
+                intermediates = _active_caches[-1].setdefault(reads, dict())
+            except TypeError:
+                return func(reads, *args, **kwargs)
+            key = (name, args, tuple(sorted(kwargs.items())))
+            if key not in intermediates:
+                intermediates[key] = func(reads, *args, **kwargs)
+            return intermediates[key]
+        return wrapper
+    return decorator
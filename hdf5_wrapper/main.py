@@ -1,16 +1,21 @@
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any
 import argparse
-import random
 import h5py
 from hdf5_wrapper import (
     Experiment,
     ExperimentStat,
+    Selection,
     InterdistanceStatistic,
     IntradistanceStatistic,
+    ExactIntradistanceStatistic,
     add_commit_to_hdf5_group,
 )
+from hdf5_wrapper.bram_stat_pool import BramStatPool
 from hdf5_wrapper.plotting import single_value_bar_plot
+from hdf5_wrapper.read_cache import ReadCache
+from hdf5_wrapper.session_cache import SessionCache, DEFAULT_MEMORY_BUDGET
 from hdf5_wrapper.utility import PlotSettings, HeatmapBitDisplaySetting
 from hdf5_wrapper.stats import StatisticTypes
 from hdf5_wrapper.stat_container import StatContainers
@@ -25,36 +30,106 @@ def unpack_from_hdf5(
     path: Path,
     filter_even_stripes: bool = False,
     filter_uneven_stripes: bool = False,
+    session_cache: SessionCache = None,
+    selection: Selection = Selection(),
+    read_cache: ReadCache = None,
 ) -> Experiment:
     """
-    Opens hdf5 and converts it to Experiment hdf5 wrapper class
+    Opens hdf5 and converts it to Experiment hdf5 wrapper class.
+    Reads are loaded lazily if a "session_cache" is given
+    (the file is then kept open by the cache).
+    Only the parts of "selection" are loaded.
+    Decoded reads are taken from (or saved to) "read_cache" if given.
     """
+    if session_cache is not None:
+        f = session_cache.file(path)
+        return Experiment.from_hdf5(
+            f,
+            f.attrs["commit"],
+            filter_even_stripes=filter_even_stripes,
+            filter_uneven_stripes=filter_uneven_stripes,
+            session_cache=session_cache,
+            selection=selection,
+            read_cache=read_cache,
+        )
+
     with h5py.File(path, "r") as f:
         experiment = Experiment.from_hdf5(
             f,
             f.attrs["commit"],
             filter_even_stripes=filter_even_stripes,
             filter_uneven_stripes=filter_uneven_stripes,
+            selection=selection,
+            read_cache=read_cache,
         )
 
     return experiment
 
 
+def parse_read_range(read_range: str) -> slice:
+    """
+    Parses a read range of the form "start:stop:step" (like a python slice,
+    every part is optional, e.g. ":100" or "::2")
+    """
+    parts = read_range.split(":")
+    if len(parts) > 3:
+        raise argparse.ArgumentTypeError(
+            f"Read range '{read_range}' is not of the form start:stop:step"
+        )
+    try:
+        return slice(*[int(part) if part else None for part in parts])
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Read range '{read_range}' is not of the form start:stop:step"
+        )
+
+
+def generate_selection(arg_dict: dict[str, Any]) -> Selection:
+    """
+    Generates Selection object from arg_dict
+
+    Arguments:
+        arg_dict: Argument dict gained from argparser
+    """
+    return Selection(
+        **{
+            name: (
+                None
+                if arg_dict.get(name) is None
+                else tuple(arg_dict[name])
+            )
+            for name in ["boards", "pblocks", "brams", "read_sessions"]
+        },
+        read_range=arg_dict.get("read_range") or slice(None),
+    )
+
+
 def create_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         "Script that takes BRAM experiment hdf5 file, unpacks the latter and "
         "computes various stats over the data\n"
         "Generated stats are saved in another hdf5 file."
     )
+    parser.add_argument(
+        "--mode",
+        required=False,
+        help="'compute': Computes stats and writes them to --out_hdf5. "
+        "'plot': Restores stats from --out_hdf5 (no reads are loaded) "
+        "and plots them. 'all': Does both in one run",
+        choices=["all", "compute", "plot"],
+        default="all",
+    )
     parser.add_argument(
         "--read_hdf5",
-        required=True,
-        help="Path to hdf5 file containing bram reads",
+        required=False,
+        help="Path to hdf5 file containing bram reads "
+        "(required unless --mode is 'plot')",
     )
     parser.add_argument(
         "--out_hdf5",
         required=True,
-        help="Path where result hdf5 shall be written",
+        help="Path where result hdf5 shall be written "
+        "(read from if --mode is 'plot')",
     )
     parser.add_argument(
         "--interdistance_k",
@@ -65,8 +140,8 @@ def create_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--seed",
         required=False,
-        help="Seed that is used to initialize pythons random module "
-        "(for reproducibility)",
+        help="Seed of the random number generators of bootstrap statistics "
+        "(for reproducibility, independent of --jobs)",
         type=int,
         default=1337133713371337,
     )
@@ -76,6 +151,99 @@ def create_arg_parser() -> argparse.ArgumentParser:
         help="Sets how many samples will be drawn for the bootstrapping "
         "for intradistances",
     )
+    parser.add_argument(
+        "--intradistance_unique_pairs",
+        required=False,
+        help="Pairs of reads are drawn at most once by the bootstrapping "
+        "for intradistances",
+        default=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--intradistance_tile_size",
+        required=False,
+        help="Sets how many reads are compared at once by "
+        "ExactIntradistanceStatistic. Bounds the memory usage",
+        type=int,
+    )
+    parser.add_argument(
+        "--lazy",
+        required=False,
+        help="Reads of read sessions are only decoded when they are used "
+        "and are dropped again if --session_cache_mb is exceeded",
+        default=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--session_cache_mb",
+        required=False,
+        help="Memory budget (in MiB) for decoded reads if --lazy is set "
+        "(or --jobs is greater than 1)",
+        type=int,
+        default=DEFAULT_MEMORY_BUDGET // 1024**2,
+    )
+    parser.add_argument(
+        "--read_cache_dir",
+        required=False,
+        help="Directory of an on-disk cache of decoded reads. Reads are "
+        "decoded from --read_hdf5 once and memory mapped by later runs "
+        "(the cache is keyed by the content hash of --read_hdf5). "
+        "No cache is used if no directory is given",
+        type=Path,
+        default=None,
+    )
+    parser.add_argument(
+        "--jobs",
+        required=False,
+        help="Number of processes that compute stats of BRAM blocks in "
+        "parallel. Results are identical to a serial run (--jobs 1). "
+        "The experiment is then loaded lazily by the main process (see "
+        "--lazy)",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--threads",
+        required=False,
+        help="Number of threads of the Hamming distance kernels "
+        "(intra-, interdistance and uniqueness), per process of --jobs. "
+        "Results are identical for any number of threads",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--boards",
+        required=False,
+        help="Names of boards that are loaded (default: all)",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--pblocks",
+        required=False,
+        help="Names of pblocks that are loaded (default: all)",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--brams",
+        required=False,
+        help="Names of BRAM blocks that are loaded, e.g. RAMB36_X0Y0 "
+        "(default: all)",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--read_sessions",
+        required=False,
+        help="Names of read sessions that are loaded (default: all)",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--read_range",
+        required=False,
+        help="Reads of each read session that are loaded, given as "
+        "start:stop:step (e.g. ':100' loads the first 100 reads). "
+        "Other reads are never read from --read_hdf5",
+        type=parse_read_range,
+    )
     parser.add_argument(
         "--plot_path",
         required=False,
@@ -126,6 +294,7 @@ def generate_plot_settings(arg_dict: dict[str, Any]) -> PlotSettings:
             None,
             False,
             None,
+            rng_seed=arg_dict["seed"],
         )
     else:
         heatmap_bit_display_setting = HeatmapBitDisplaySetting[
@@ -135,6 +304,7 @@ def generate_plot_settings(arg_dict: dict[str, Any]) -> PlotSettings:
             arg_dict["plot_path"],
             True,
             heatmap_bit_display_setting=heatmap_bit_display_setting,
+            rng_seed=arg_dict["seed"],
         )
 
 
@@ -183,6 +353,18 @@ def select_stats(arg_dict: dict[str, Any]) -> None:
         IntradistanceStatistic.stat_func_kwargs["k"] = arg_dict[
             "intradistance_k"
         ]
+    if arg_dict.get("intradistance_unique_pairs"):
+        IntradistanceStatistic.stat_func_kwargs["unique_pairs"] = True
+    if arg_dict.get("intradistance_tile_size") is not None:
+        ExactIntradistanceStatistic.stat_func_kwargs["tile_size"] = arg_dict[
+            "intradistance_tile_size"
+        ]
+    if arg_dict.get("threads") is not None:
+        for statistic_type in StatisticTypes:
+            if "threads" in statistic_type.value.stat_func_kwargs:
+                statistic_type.value.stat_func_kwargs["threads"] = arg_dict[
+                    "threads"
+                ]
 
 
 def reliability_intercomparison(
@@ -197,56 +379,158 @@ def reliability_intercomparison(
     single_value_bar_plot(value_dict, bram_names, title, path)
 
 
-def main(arg_dict: dict[str, Any]):
-    plot_settings = generate_plot_settings(arg_dict)
-    select_stats(arg_dict)
-    # Unpack from bram read hdf5
+def stripe_filters(arg_dict: dict[str, Any]) -> list[str | None]:
+    """
+    Names of the stripe filters that stats are computed for
+    (None if stats are computed over whole BRAMs)
+    """
     if arg_dict["do_stats_stripewise"]:
-        for stripe_name in [
-            "filter_uneven_stripes", "filter_even_stripes"
-        ]:
-            experiment = unpack_from_hdf5(arg_dict["read_hdf5"], **{stripe_name: True})
+        return ["filter_uneven_stripes", "filter_even_stripes"]
+    else:
+        return [None]
 
-            with h5py.File(arg_dict["out_hdf5"], "w") as hdf5_file:
-                add_commit_to_hdf5_group(hdf5_file)
-                hdf5_file.attrs["rng seed"] = arg_dict["seed"]
-                random.seed(arg_dict["seed"])
 
-                experiment_stats = ExperimentStat(
-                    experiment, plot_settings.with_expanded_path(f"Experiment_{stripe_name}")
+def experiment_plot_name(stripe_filter: str | None) -> str:
+    if stripe_filter is None:
+        return "Experiment"
+    else:
+        return f"Experiment_{stripe_filter}"
+
+
+def results_group(
+    hdf5_file: h5py.File, stripe_filter: str | None, create: bool = False
+) -> h5py.Group:
+    """
+    Group of the result hdf5 that contains the ExperimentStat of a
+    stripe filter. Results of whole BRAMs are saved in the root group.
+    """
+    if stripe_filter is None:
+        return hdf5_file
+    elif create:
+        return hdf5_file.create_group(stripe_filter)
+    else:
+        return hdf5_file[stripe_filter]
+
+
+def compute_stats(
+    arg_dict: dict[str, Any], plot_settings: PlotSettings
+) -> None:
+    """
+    Computes stats over the reads of --read_hdf5 and writes them to
+    --out_hdf5. Stats are plotted right away if mode is "all".
+    """
+    if arg_dict["read_hdf5"] is None:
+        raise Exception(
+            f"--read_hdf5 is required for mode '{arg_dict['mode']}'"
+        )
+    selection = generate_selection(arg_dict)
+    if arg_dict.get("read_cache_dir") is None:
+        read_cache = None
+    else:
+        read_cache = ReadCache(arg_dict["read_cache_dir"])
+    with h5py.File(arg_dict["out_hdf5"], "w") as hdf5_file:
+        add_commit_to_hdf5_group(hdf5_file)
+        hdf5_file.attrs["rng seed"] = arg_dict["seed"]
+
+        jobs = arg_dict.get("jobs", 1)
+        # Workers load their BRAM blocks themselves, so the experiment of
+        # this process is loaded lazily if a pool is used (reads are then
+        # only decoded for stats that aren't computed by workers)
+        if arg_dict.get("lazy", False) or jobs > 1:
+            session_cache = SessionCache(
+                arg_dict["session_cache_mb"] * 1024**2
+            )
+        else:
+            session_cache = None
+        # Reads are decoded once, stripe filtered experiments are derived
+        # from the unfiltered one
+        unfiltered_experiment = unpack_from_hdf5(
+            arg_dict["read_hdf5"],
+            session_cache=session_cache,
+            selection=selection,
+            read_cache=read_cache,
+        )
+
+        for stripe_filter in stripe_filters(arg_dict):
+            if stripe_filter is None:
+                experiment = unfiltered_experiment
+            else:
+                experiment = unfiltered_experiment.filter_stripes(
+                    **{stripe_filter: True}
+                )
+
+            if (
+                arg_dict["base_session_name"]
+                and arg_dict["mode"] == "all"
+                and stripe_filter is None
+            ):
+                reliability_intercomparison(
+                    experiment=experiment,
+                    base_session_name=arg_dict["base_session_name"],
+                    title="Comparison of Reliability under Different "
+                    "Environmental Conditions",
+                    path=Path(plot_settings.path, "reliability_intercomparison"),
                 )
+
+            with (
+                BramStatPool(jobs, read_cache=read_cache)
+                if jobs > 1
+                else nullcontext()
+            ):
                 # Start computing stats
-                # experiment_stats.add_to_hdf5_group(hdf5_file)
-            print("STARTING PLOTTING")
-            time.sleep(20)
-            experiment_stats.plot()
-            print("Experiment Stats: Done")
+                experiment_stats = ExperimentStat(
+                    experiment,
+                    plot_settings.with_expanded_path(
+                        experiment_plot_name(stripe_filter)
+                    ),
+                )
+            group = results_group(hdf5_file, stripe_filter, create=True)
+            experiment_stats.add_to_hdf5_group(group)
+            group.attrs["experiment"] = experiment_stats.name
+            print("Experiment Stats: Computed")
+
+            if arg_dict["mode"] == "all":
+                experiment_stats.plot()
+                print("Experiment Stats: Done")
             del experiment
             del experiment_stats
             gc.collect()
 
-    else:
-        experiment = unpack_from_hdf5(arg_dict["read_hdf5"])
-
-        if arg_dict["base_session_name"]:
-            reliability_intercomparison(
-                experiment=experiment,
-                base_session_name=arg_dict["base_session_name"],
-                title="Comparison of Reliability under Different Environmental Conditions",
-                path=Path(plot_settings.path, "reliability_intercomparison"),
-            )
+        if session_cache is not None:
+            session_cache.close()
 
-        with h5py.File(arg_dict["out_hdf5"], "w") as hdf5_file:
-            add_commit_to_hdf5_group(hdf5_file)
-            hdf5_file.attrs["rng seed"] = arg_dict["seed"]
-            random.seed(arg_dict["seed"])
 
-            experiment_stats = ExperimentStat(
-                experiment, plot_settings.with_expanded_path("Experiment")
+def plot_stats(
+    arg_dict: dict[str, Any], plot_settings: PlotSettings
+) -> None:
+    """
+    Restores stats from --out_hdf5 (written in mode "compute") and
+    plots them. Reads are not loaded.
+    """
+    if arg_dict["base_session_name"]:
+        print(
+            "Reliability intercomparison needs the reads and is skipped in "
+            "mode 'plot'"
+        )
+    with h5py.File(arg_dict["out_hdf5"], "r") as hdf5_file:
+        for stripe_filter in stripe_filters(arg_dict):
+            group = results_group(hdf5_file, stripe_filter)
+            experiment_stats = ExperimentStat.from_hdf5_group(
+                group[group.attrs["experiment"]],
+                plot_settings.with_expanded_path(
+                    experiment_plot_name(stripe_filter)
+                ),
             )
-            # Start computing stats
-            # experiment_stats.add_to_hdf5_group(hdf5_file)
-        print("STARTING PLOTTING")
-        #time.sleep(20)
-        experiment_stats.plot()
-        print("Experiment Stats: Done")
+            experiment_stats.plot()
+            print("Experiment Stats: Done")
+            del experiment_stats
+            gc.collect()
+
+
+def main(arg_dict: dict[str, Any]):
+    plot_settings = generate_plot_settings(arg_dict)
+    select_stats(arg_dict)
+    if arg_dict.get("mode", "all") == "plot":
+        plot_stats(arg_dict, plot_settings)
+    else:
+        compute_stats(arg_dict, plot_settings)
@@ -0,0 +1,149 @@
+"""
+Contains the on-disk cache of decoded reads.
+Decoded (packed) read matrices of read sessions are saved as .npy files
+next to each other in a cache directory. Later runs memory map them
+instead of reading them from the experiment hdf5 file again.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from .experiment_hdf5 import HDF5Source
+
+# Name of the file that maps experiment files to their content hash
+HASH_INDEX_NAME = "content_hashes.json"
+
+
+def content_hash(path: Path, chunk_size: int = 2**24) -> str:
+    """
+    SHA-256 hash of the content of a file (hex digest)
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ReadCache:
+    """
+    On-disk cache of decoded read matrices (see PackedReads.matrix).
+    Matrices are keyed by the content hash of their experiment hdf5 file,
+    the group of their read session and the options they were loaded with
+    (see HDF5Source). Cached matrices are memory mapped (read only).
+
+    Content hashes are kept in an index file of the cache directory,
+    so files are only hashed again if their size or modification time
+    changed.
+
+    Attributes:
+        cache_dir: Directory of cached matrices
+        content_hashes: Content hashes of experiment files mapped by
+                        their resolved path
+    """
+
+    cache_dir: Path
+    content_hashes: dict[str, str]
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.content_hashes = dict()
+
+    def file_hash(self, file_path: str) -> str:
+        """
+        Content hash of an experiment file
+        (read from index file if the file didn't change)
+        """
+        path = Path(file_path).resolve()
+        if str(path) in self.content_hashes:
+            return self.content_hashes[str(path)]
+
+        stat = path.stat()
+        index_path = Path(self.cache_dir, HASH_INDEX_NAME)
+        index = dict()
+        if index_path.exists():
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        entry = index.get(str(path))
+        if (
+            entry is None
+            or entry["size"] != stat.st_size
+            or entry["mtime_ns"] != stat.st_mtime_ns
+        ):
+            entry = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": content_hash(path),
+            }
+            index[str(path)] = entry
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(
+                index_path, lambda f: f.write(json.dumps(index).encode())
+            )
+
+        self.content_hashes[str(path)] = entry["sha256"]
+        return entry["sha256"]
+
+    def matrix_path(self, hdf5_source: "HDF5Source", name: str) -> Path:
+        """
+        Path of the cached matrix "name" (e.g. "data_reads")
+        of a read session
+        """
+        key = hashlib.sha256(
+            repr(
+                (
+                    hdf5_source.group_path,
+                    name,
+                    hdf5_source.filter_even_stripes,
+                    hdf5_source.filter_uneven_stripes,
+                    hdf5_source.read_range,
+                )
+            ).encode()
+        ).hexdigest()
+        return Path(
+            self.cache_dir, self.file_hash(hdf5_source.file_path), f"{key}.npy"
+        )
+
+    def matrix(
+        self,
+        hdf5_source: "HDF5Source",
+        name: str,
+        decode: Callable[[], npt.NDArray[np.uint8]],
+    ) -> npt.NDArray[np.uint8]:
+        """
+        Returns the cached matrix "name" of a read session (memory mapped).
+        Calls "decode" and saves its result if it isn't cached yet.
+
+        Arguments:
+            hdf5_source: Location of read session and its load options
+            name: Name of matrix ("data_reads" or "parity_reads")
+            decode: Function that decodes the matrix
+        """
+        path = self.matrix_path(hdf5_source, name)
+        if path.exists():
+            return np.load(path, mmap_mode="r")
+
+        matrix = decode()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(
+            path, lambda f: np.save(f, np.ascontiguousarray(matrix))
+        )
+        return matrix
+
+    @staticmethod
+    def _atomic_write(path: Path, write: Callable) -> None:
+        """
+        Writes a file via a temporary file, so readers
+        (e.g. other processes) never see partially written files
+        """
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
@@ -0,0 +1,163 @@
+"""
+Contains the cache of lazily loaded experiments.
+Lazily loaded ReadSession's (see LazyReadSession in experiment_hdf5.py)
+decode their reads when they are accessed. Decoded values are kept in a
+SessionCache, as long as they fit into its memory budget.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Self
+import h5py
+import numpy as np
+
+# Default memory budget of decoded values (in bytes)
+DEFAULT_MEMORY_BUDGET = 4 * 1024**3
+
+
+def decoded_nbytes(value: Any) -> int:
+    """
+    Memory used by a decoded value (e.g. PackedReads or list of temperatures)
+    """
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+    else:
+        return np.asarray(value).nbytes
+
+
+def decoded_buffers(value: Any) -> dict[int, int]:
+    """
+    Sizes of the buffers that a decoded value holds, mapped by their id.
+    Merged reads (ConcatenatedReads) only reference the matrices of
+    their parts, which are usually cached themselves. Buffers are therefore
+    the matrices of PackedReads (or the value itself for other values).
+    """
+    if hasattr(value, "parts"):
+        matrices = [part.matrix for part in value.parts]
+    elif hasattr(value, "matrix"):
+        matrices = [value.matrix]
+    else:
+        return {id(value): decoded_nbytes(value)}
+    return {id(matrix): matrix.nbytes for matrix in matrices}
+
+
+class SessionCache:
+    """
+    Least recently used (LRU) cache of decoded values of lazily loaded
+    experiments. Least recently used values are evicted as soon as the
+    memory budget is exceeded. The most recently used value is always kept,
+    even if it alone exceeds the budget.
+    Buffers that are shared by multiple values (e.g. the matrices of bram
+    blocks and merged reads of their pblock) are counted once and only
+    count as freed when no kept value references them anymore.
+    Additionally keeps experiment hdf5 files open, so lazily loaded objects
+    can be decoded at any time. Files are closed by "close"
+    (or when leaving a "with SessionCache(...):" context).
+
+    Attributes:
+        memory_budget: Maximum memory (in bytes) of kept decoded values
+        stream_threshold: Reads that are larger (in bytes) are streamed in
+                          chunks by statistics that support it, instead of
+                          being decoded (see LazyReadSession.streamed_reads)
+        memory_usage: Memory (in bytes) of buffers of kept decoded values
+        decoded_values: Decoded values mapped by their key,
+                        ordered from least to most recently used,
+                        with the ids of their buffers
+        buffer_refs: Number of kept values that reference a buffer and
+                     its size, mapped by the id of the buffer
+        files: Opened hdf5 files mapped by their path
+    """
+
+    memory_budget: int
+    stream_threshold: int
+    memory_usage: int
+    decoded_values: OrderedDict[Hashable, tuple[Any, list[int]]]
+    buffer_refs: dict[int, list[int]]
+    files: dict[str, h5py.File]
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        stream_threshold: int | None = None,
+    ) -> None:
+        """
+        Reads are streamed if they don't fit into the memory budget,
+        unless another "stream_threshold" is given.
+        """
+        if memory_budget < 0:
+            raise ValueError(
+                f"Memory budget has to be non negative ({memory_budget})"
+            )
+        self.memory_budget = memory_budget
+        if stream_threshold is None:
+            stream_threshold = memory_budget
+        self.stream_threshold = stream_threshold
+        self.memory_usage = 0
+        self.decoded_values = OrderedDict()
+        self.buffer_refs = dict()
+        self.files = dict()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def get(self, key: Hashable, decode: Callable[[], Any]) -> Any:
+        """
+        Returns the decoded value of "key".
+        Calls "decode" if the value isn't kept (anymore).
+
+        Arguments:
+            key: Identifies the decoded value
+            decode: Function that decodes the value
+        """
+        if key in self.decoded_values:
+            self.decoded_values.move_to_end(key)
+            return self.decoded_values[key][0]
+
+        value = decode()
+        buffers = decoded_buffers(value)
+        # Values keep their buffers alive, so ids stay unique
+        self.decoded_values[key] = (value, list(buffers))
+        for buffer_id, nbytes in buffers.items():
+            if buffer_id not in self.buffer_refs:
+                self.buffer_refs[buffer_id] = [0, nbytes]
+                self.memory_usage += nbytes
+            self.buffer_refs[buffer_id][0] += 1
+        while (
+            self.memory_usage > self.memory_budget
+            and len(self.decoded_values) > 1
+        ):
+            _, (_, buffer_ids) = self.decoded_values.popitem(last=False)
+            for buffer_id in buffer_ids:
+                self.buffer_refs[buffer_id][0] -= 1
+                if not self.buffer_refs[buffer_id][0]:
+                    self.memory_usage -= self.buffer_refs.pop(buffer_id)[1]
+        return value
+
+    def clear(self) -> None:
+        """
+        Drops all decoded values (files stay open)
+        """
+        self.decoded_values.clear()
+        self.buffer_refs = dict()
+        self.memory_usage = 0
+
+    def file(self, path: str) -> h5py.File:
+        """
+        Returns the opened (read only) hdf5 file of "path"
+        """
+        path = str(path)
+        if path not in self.files:
+            self.files[path] = h5py.File(path, "r")
+        return self.files[path]
+
+    def close(self) -> None:
+        """
+        Drops all decoded values and closes all files
+        """
+        self.clear()
+        for hdf5_file in self.files.values():
+            hdf5_file.close()
+        self.files = dict()
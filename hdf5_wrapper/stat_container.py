@@ -9,8 +9,10 @@ from enum import Enum
 from pathlib import Path
 from typing import Self, Type
 import h5py
-from .experiment_hdf5 import ExperimentContainer, Experiment
+from .bram_stat_pool import BramStatPool, active_bram_stat_pool
+from .experiment_hdf5 import BramBlock, ExperimentContainer, Experiment
 from .interfaces import HDF5Convertible, Plottable
+from .intermediate_cache import shared_intermediates
 from .stats_base import (
     MetaStatistic,
     Statistic,
@@ -20,6 +22,7 @@ from .stats_base import (
 from .stats import (
     InterdistanceStatistic,
     IntradistanceStatistic,
+    ExactIntradistanceStatistic,
     EntropyStatistic,
     BitStabilizationStatistic,
     BitAliasingStatistic,
@@ -265,6 +268,36 @@ class MultiReadSessionStatistic(HDF5Convertible, Plottable):
             plot_settings, statistics, statistic_type, read_session_names
         )
 
+    @classmethod
+    def from_hdf5_group(
+        cls,
+        multi_group: h5py.Group,
+        statistic_type: Type[Statistic],
+        read_session_names: list[str],
+        plot_settings: PlotSettings,
+    ) -> Self:
+        """
+        Restores the object from the group written by "add_to_hdf5_group"
+
+        Arguments:
+            multi_group: Group created by "add_to_hdf5_group"
+            statistic_type: Statistic type of the stored statistics
+            read_session_names: Names/Keys of existing read sessions
+            plot_settings: PlotSettings of the restored object
+        """
+        statistics = {
+            read_session_name: statistic_type.from_hdf5_group(
+                multi_group[read_session_name][
+                    statistic_type._hdf5_group_name
+                ],
+                plot_settings.with_expanded_path(read_session_name),
+            )
+            for read_session_name in read_session_names
+        }
+        return cls(
+            plot_settings, statistics, statistic_type, read_session_names
+        )
+
     def add_to_hdf5_group(self, parent: h5py.Group) -> None:
         multi_group = parent.create_group(self._hdf5_group_name)
         for read_session_name in self._read_session_names:
@@ -272,7 +305,11 @@ class MultiReadSessionStatistic(HDF5Convertible, Plottable):
             self.statistics[read_session_name].add_to_hdf5_group(
                 read_session_group
             )
-        self.meta_stats.add_to_hdf5_group(multi_group)
+        # e.g. SingleValueStatistic's of a single BRAM have no meta stats
+        if all(
+            [statistic.meta_statable for statistic in self.statistics.values()]
+        ):
+            self.meta_stats.add_to_hdf5_group(multi_group)
 
     def _plot(self) -> None:
         if self.statistic_type.meta_statable:
@@ -310,36 +347,111 @@ class MultiStatisticOwner(HDF5Convertible, Plottable, metaclass=ABCMeta):
         plot_settings: PlotSettings,
     ) -> None:
         super().__init__(plot_settings)
-        self._read_session_names = experiment_container.read_session_names
-        self.name = experiment_container.name
-        self.plot_settings.bram_count = experiment_container.bram_count
-        self.plot_settings.entity_name = experiment_container.name
-        self.statistics = dict()
+        self.set_identity(
+            experiment_container.name,
+            experiment_container.read_session_names,
+            experiment_container.bram_count,
+        )
         self.compute_stats(experiment_container)
 
+    def set_identity(
+        self, name: str, read_session_names: list[str], bram_count: int
+    ) -> None:
+        """
+        Sets the attributes that are taken over from the ExperimentContainer
+        (or from hdf5, if the object is restored)
+        """
+        self._read_session_names = read_session_names
+        self.name = name
+        self.plot_settings.bram_count = bram_count
+        self.plot_settings.entity_name = name
+        self.statistics = dict()
+
+    @classmethod
+    def from_hdf5_group(
+        cls, multi_stat_group: h5py.Group, plot_settings: PlotSettings
+    ) -> Self:
+        """
+        Restores the object from the group written by "add_to_hdf5_group".
+        No reads are loaded, only "used_statistics" are restored
+        (if they are present in hdf5).
+
+        Arguments:
+            multi_stat_group: Group created by "add_to_hdf5_group"
+            plot_settings: PlotSettings of the restored object
+        """
+        owner = cls.__new__(cls)
+        Plottable.__init__(owner, plot_settings)
+        owner.set_identity(
+            str(multi_stat_group.attrs["name"]),
+            [
+                str(read_session_name)
+                for read_session_name
+                in multi_stat_group.attrs["read session names"]
+            ],
+            int(multi_stat_group.attrs["bram count"]),
+        )
+        owner.load_stats(multi_stat_group)
+        return owner
+
+    def load_stats(self, multi_stat_group: h5py.Group) -> None:
+        """
+        Counterpart of "compute_stats" for objects restored from hdf5
+        """
+        # Same order as computed by StatAggregator's
+        # (merged Statistic's before compared Statistic's)
+        for statistic_type in sorted(
+            self.used_statistics,
+            key=lambda statistic_type: not statistic_type.mergable,
+        ):
+            if statistic_type._hdf5_group_name in multi_stat_group:
+                self.statistics[statistic_type] = (
+                    MultiReadSessionStatistic.from_hdf5_group(
+                        multi_stat_group[statistic_type._hdf5_group_name],
+                        statistic_type,
+                        self._read_session_names,
+                        self.plot_settings.with_expanded_path(
+                            statistic_type._hdf5_group_name
+                        ),
+                    )
+                )
+
     def compute_stats(self, experiment_container: ExperimentContainer) -> None:
-        for statistic_type in self.used_statistics:
-            if issubclass(statistic_type, SimpleStatistic):
-                statistics_per_read_session = dict()
-                for read_session_name in self._read_session_names:
-                    statistics_per_read_session[read_session_name] = (
-                        statistic_type(
-                            self.plot_settings.with_expanded_path(
-                                statistic_type._hdf5_group_name
-                            ).with_expanded_path(read_session_name),
-                            experiment_container.read_sessions[
-                                read_session_name
-                            ],
+        # Intermediates (e.g. one counts per bit) are shared by all selected
+        # Statistic types and computed once per ReadSession
+        with shared_intermediates():
+            for statistic_type in self.used_statistics:
+                if issubclass(statistic_type, SimpleStatistic):
+                    self.statistics[statistic_type] = (
+                        self.compute_simple_statistic(
+                            statistic_type, experiment_container
                         )
                     )
-                self.statistics[statistic_type] = MultiReadSessionStatistic(
-                    plot_settings=self.plot_settings.with_expanded_path(
-                        statistic_type._hdf5_group_name
-                    ),
-                    statistics=statistics_per_read_session,
-                    statistic_type=statistic_type,
-                    _read_session_names=self._read_session_names,
-                )
+
+    def compute_simple_statistic(
+        self,
+        statistic_type: Type[SimpleStatistic],
+        experiment_container: ExperimentContainer,
+    ) -> "MultiReadSessionStatistic":
+        """
+        Computes a SimpleStatistic for each ReadSession of the container
+        """
+        statistics_per_read_session = dict()
+        for read_session_name in self._read_session_names:
+            statistics_per_read_session[read_session_name] = statistic_type(
+                self.plot_settings.with_expanded_path(
+                    statistic_type._hdf5_group_name
+                ).with_expanded_path(read_session_name),
+                experiment_container.read_sessions[read_session_name],
+            )
+        return MultiReadSessionStatistic(
+            plot_settings=self.plot_settings.with_expanded_path(
+                statistic_type._hdf5_group_name
+            ),
+            statistics=statistics_per_read_session,
+            statistic_type=statistic_type,
+            _read_session_names=self._read_session_names,
+        )
 
     @property
     def read_session_names(self) -> list[str]:
@@ -354,6 +466,11 @@ class MultiStatisticOwner(HDF5Convertible, Plottable, metaclass=ABCMeta):
 
     def add_to_hdf5_group(self, parent: h5py.Group) -> h5py.Group:
         multi_stat_group = parent.create_group(self.name)
+        multi_stat_group.attrs["name"] = self.name
+        multi_stat_group.attrs["read session names"] = (
+            self._read_session_names
+        )
+        multi_stat_group.attrs["bram count"] = self.plot_settings.bram_count
 
         for statistic_type in self.used_statistics:
             if (
@@ -396,18 +513,39 @@ class StatAggregator(MultiStatisticOwner, metaclass=ABCMeta):
     subowner_identifier: str
 
     def compute_stats(self, experiment_container: ExperimentContainer) -> None:
-        self.subowners = [
-            self.subowner_type(
-                plot_settings=self.plot_settings.with_expanded_path(
-                    subcontainer.name
-                ),
-                experiment_container=subcontainer,
+        bram_stat_pool = active_bram_stat_pool()
+        if bram_stat_pool is not None:
+            bram_stat_pool.submit(
+                experiment_container, type(self), self.plot_settings
             )
+        self.subowners = [
+            self.create_subowner(subcontainer, bram_stat_pool)
             for subcontainer in experiment_container.subcontainers.values()
         ]
         self.merge_substats()
         self.compare_substats(experiment_container)
 
+    def create_subowner(
+        self,
+        subcontainer: ExperimentContainer | BramBlock,
+        bram_stat_pool: BramStatPool | None,
+    ) -> MultiStatisticOwner:
+        """
+        Creates the subowner of a subcontainer.
+        BramBlock's that were submitted to a BramStatPool are taken from
+        the pool, everything else is computed by this process.
+        """
+        if bram_stat_pool is not None:
+            subowner = bram_stat_pool.bram_block_stat(subcontainer)
+            if subowner is not None:
+                return subowner
+        return self.subowner_type(
+            plot_settings=self.plot_settings.with_expanded_path(
+                subcontainer.name
+            ),
+            experiment_container=subcontainer,
+        )
+
     def merge_substats(self) -> None:
         """
         Uses "from_merge" interface from substats (if "mergable")
@@ -513,13 +651,28 @@ class StatAggregator(MultiStatisticOwner, metaclass=ABCMeta):
                             )
                         )
 
+    def load_stats(self, multi_stat_group: h5py.Group) -> None:
+        super().load_stats(multi_stat_group)
+        self.subowners = [
+            self.subowner_type.from_hdf5_group(
+                subowner_group,
+                self.plot_settings.with_expanded_path(
+                    str(subowner_group.attrs["name"])
+                ),
+            )
+            for subowner_group
+            in multi_stat_group[self.subowner_identifier].values()
+        ]
+
     def add_to_hdf5_group(self, parent: h5py.Group) -> h5py.Group:
         multi_stat_group = super().add_to_hdf5_group(parent)
+        # Keeps the order of subowners when restored
         subowner_group = multi_stat_group.create_group(
-            self.subowner_identifier
+            self.subowner_identifier, track_order=True
         )
         for subowner in self.subowners:
             subowner.add_to_hdf5_group(subowner_group)
+        return multi_stat_group
 
     def _plot(self) -> None:
         if len(self.subowners) > 1:
@@ -538,6 +691,7 @@ class BramBlockStat(MultiStatisticOwner):
     
     allowed_statistics = [
         IntradistanceStatistic,
+        ExactIntradistanceStatistic,
         EntropyStatistic,
         BitStabilizationStatistic,
         BitAliasingStatistic,
@@ -563,6 +717,7 @@ class PBlockStat(StatAggregator):
 
     allowed_statistics = [
         IntradistanceStatistic,
+        ExactIntradistanceStatistic,
         EntropyStatistic,
         BitAliasingStatistic,
         InterdistanceStatistic,
@@ -591,6 +746,7 @@ class BoardStat(StatAggregator):
 
     allowed_statistics = [
         IntradistanceStatistic,
+        ExactIntradistanceStatistic,
         EntropyStatistic,
         BitAliasingStatistic,
         InterdistanceStatistic,
@@ -618,6 +774,7 @@ class ExperimentStat(StatAggregator):
 
     allowed_statistics = [
         IntradistanceStatistic,
+        ExactIntradistanceStatistic,
         EntropyStatistic,
         BitAliasingStatistic,
         InterdistanceStatistic,
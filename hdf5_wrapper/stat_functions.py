@@ -1,69 +1,272 @@
-import random
+from collections.abc import Iterable, Sequence
 import numpy as np
 import numpy.typing as npt
-from scipy.spatial.distance import hamming
-from .experiment_hdf5 import Read
+from scipy.stats import entropy
+from .bit_matrix import (
+    BitCountAccumulator,
+    bit_one_counts,
+    last_change_idxs,
+    row_hamming_weights,
+)
+from .hamming_distance import (
+    all_pairs_distance_count_tiles,
+    hamming_distances,
+)
+from .experiment_hdf5 import LazyReadSession, PackedReads, Read, ReadSession
+from .intermediate_cache import session_intermediate
 from .utility import BitFlipType
 
 
-def entropy_list(reads: list[Read]) -> npt.NDArray[np.float64]:
+@session_intermediate("per_bit_one_counts")
+def per_bit_one_counts(reads: Sequence[Read]) -> npt.NDArray[np.uint64]:
+    """
+    Number of 1's per bit index over all Read's
+    (shared by bitwise and stable bit statistics)
+    """
+    return sum(
+        bit_one_counts(matrix)
+        for matrix in PackedReads.matrices_from_reads(reads)
+    )
+
+
+@session_intermediate("per_read_hamming_weights")
+def per_read_hamming_weights(
+    reads: Sequence[Read],
+) -> npt.NDArray[np.uint64]:
+    """
+    Number of 1's per Read (shared by entropy and uniformity)
+    """
+    return np.concatenate(
+        [
+            row_hamming_weights(matrix)
+            for matrix in PackedReads.matrices_from_reads(reads)
+        ]
+    )
+
+
+def read_bit_count(reads: Sequence[Read]) -> int:
+    """
+    Number of bits per Read (merged reads are not copied)
+    """
+    return PackedReads.matrices_from_reads(reads)[0].shape[1] * 8
+
+
+def entropy_list(reads: Sequence[Read]) -> npt.NDArray[np.float64]:
     """
     Produces list of entropy values (one for each Read object)
     """
-    return np.fromiter((read.entropy for read in reads), np.float64)
+    one_counts = per_read_hamming_weights(reads)
+    zero_counts = read_bit_count(reads) - one_counts
+    return entropy(np.stack([zero_counts, one_counts]), base=2, axis=0)
 
 
-def intradistance(reads: list[Read]) -> npt.NDArray[np.float64]:
+def intradistance(
+    reads: Sequence[Read], tile_size: int = 256, threads: int = 1
+) -> npt.NDArray[np.float64]:
     """
-    Produces ((k+1)*k)/2 intradistance values
+    Produces ((k-1)*k)/2 intradistance values
     (Each Read is compared with each other Read of the list)
+    Values are ordered by pairs (i, j), i < j, in row major order.
+
+    Distances are computed exactly via tiled matrix products
+    (see all_pairs_distance_count_tiles). "tile_size" bounds the memory,
+    tiles are computed by "threads" threads.
     """
-    reads_length = len(reads)
-    return np.fromiter(
-        (
-            hamming(reads[i].bits_flattened, reads[j].bits_flattened)
-            for i in range(len(reads_length))
-            for j in range(i, len(reads_length))
-        ),
-        np.float64,
+    matrix = PackedReads.from_reads(reads).matrix
+    read_count, bit_count = len(reads), matrix.shape[1] * 8
+    distances = np.empty((read_count * (read_count - 1)) // 2, np.float64)
+
+    for rows, columns, distance_counts in all_pairs_distance_count_tiles(
+        matrix, tile_size, threads
+    ):
+        row_idxs, column_idxs = np.meshgrid(
+            np.arange(rows.start, rows.stop),
+            np.arange(columns.start, columns.stop),
+            indexing="ij",
+        )
+        upper_triangle = column_idxs > row_idxs
+        row_idxs = row_idxs[upper_triangle]
+        column_idxs = column_idxs[upper_triangle]
+        # Position of pair (i, j) in row major order of the upper triangle
+        positions = (
+            row_idxs * read_count
+            - (row_idxs * (row_idxs + 1)) // 2
+            + column_idxs - row_idxs - 1
+        )
+        distances[positions] = distance_counts[upper_triangle] / bit_count
+    return distances
+
+
+def intradistance_histogram(
+    reads: Sequence[Read], tile_size: int = 256, threads: int = 1
+) -> npt.NDArray[np.int64]:
+    """
+    Exact distribution of all ((k-1)*k)/2 intradistance values,
+    without keeping the values themselves in memory.
+
+    Returns:
+        Number of pairs per absolute Hamming distance.
+        Index i holds the count of pairs that differ in i bits
+        (length: bits per Read + 1)
+    """
+    matrix = PackedReads.from_reads(reads).matrix
+    histogram = np.zeros(matrix.shape[1] * 8 + 1, dtype=np.int64)
+
+    for rows, columns, distance_counts in all_pairs_distance_count_tiles(
+        matrix, tile_size, threads
+    ):
+        if rows == columns:
+            distance_counts = distance_counts[
+                np.triu_indices(len(distance_counts), k=1)
+            ]
+        histogram += np.bincount(
+            distance_counts.ravel(), minlength=len(histogram)
+        )
+    return histogram
+
+
+def histogram_moments(
+    histogram: npt.NDArray[np.int64],
+) -> dict[str, np.float64]:
+    """
+    Summary of relative Hamming distances that are given as histogram
+    (see intradistance_histogram), without expanding the values
+
+    Returns:
+        Count, Mean, Median, Variance, StdDeviation, Minimum and Maximum
+        of values
+    """
+    count = np.sum(histogram)
+    if not count:
+        raise ValueError("Histogram doesn't contain any values")
+    relative_distances = np.arange(len(histogram)) / (len(histogram) - 1)
+    occurring_distances = relative_distances[histogram > 0]
+    # Same as np.median: Mean of the two middle values
+    # (the same value for odd counts). Value k (1-based) of the sorted values
+    # is the first distance whose cumulative count reaches k
+    middle_idxs = np.searchsorted(
+        np.cumsum(histogram), [(count + 1) // 2, count // 2 + 1]
     )
+    median = np.mean(relative_distances[middle_idxs])
+    mean = np.sum(histogram * relative_distances) / count
+    variance = np.sum(histogram * (relative_distances - mean) ** 2) / count
+    return {
+        "Count": count,
+        "Mean": mean,
+        "Median": median,
+        "Variance": variance,
+        "StdDeviation": np.sqrt(variance),
+        "Minimum": occurring_distances[0],
+        "Maximum": occurring_distances[-1],
+    }
+
+
+def intradistance_moments(
+    reads: Sequence[Read], tile_size: int = 256, threads: int = 1
+) -> dict[str, np.float64]:
+    """
+    Summary of all ((k-1)*k)/2 intradistance values
+    (relative Hamming distances), derived from "intradistance_histogram".
+
+    Returns:
+        See histogram_moments
+    """
+    if len(reads) < 2:
+        raise ValueError(
+            f"At least two reads are needed ({len(reads)} were given)"
+        )
+    return histogram_moments(
+        intradistance_histogram(reads, tile_size, threads)
+    )
+
+
+def random_pair_idxs(
+    rng: np.random.Generator,
+    read_count: int,
+    k: int,
+    unique_pairs: bool = False,
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """
+    Draws k pairs (i, j), i != j, of read indices at once
+
+    Arguments:
+        rng: Generator that the pairs are drawn from
+        read_count: Number of reads (indices are in range(read_count))
+        k: Number of pairs
+        unique_pairs: If True, no pair is drawn twice (unordered pairs,
+                        i < j). k must not exceed ((n-1)*n)/2 in this case
+
+    Returns:
+        Index arrays of the first and second elements of the pairs
+    """
+    if k == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    if not unique_pairs:
+        idxs = rng.integers(read_count, size=k)
+        # Second index skips the first one (drawn from n - 1 indices)
+        other_idxs = rng.integers(read_count - 1, size=k)
+        other_idxs += other_idxs >= idxs
+        return idxs.astype(np.intp), other_idxs.astype(np.intp)
+
+    pair_count = (read_count * (read_count - 1)) // 2
+    positions = rng.choice(pair_count, size=k, replace=False)
+    # Inverse of the position of pair (i, j) in row major order of the
+    # upper triangle (see intradistance)
+    idxs = (
+        read_count - 2 - np.floor(
+            np.sqrt(-8 * positions + 4 * read_count * (read_count - 1) - 7)
+            / 2 - 0.5
+        )
+    ).astype(np.intp)
+    other_idxs = (
+        positions + idxs + 1 - pair_count
+        + ((read_count - idxs) * (read_count - idxs - 1)) // 2
+    ).astype(np.intp)
+    return idxs, other_idxs
 
 
 def intradistance_bootstrap(
-    reads: list[Read], k: int = 10000
+    reads: Sequence[Read],
+    k: int = 10000,
+    unique_pairs: bool = False,
+    rng: np.random.Generator = None,
+    threads: int = 1,
 ) -> npt.NDArray[np.float64]:
     """
     Produces k intradistance values or the maximum, if the maximum of
     possible values (without pair duplicates) is smaller than k
 
-    Pairs of values are chosen pseudo randomly.
-    Duplicates can occur
+    Pairs of values are chosen pseudo randomly (all at once, see
+    random_pair_idxs). Duplicates can occur, unless "unique_pairs" is set.
 
     Less compute time expensive alternative to "intradistance"
+
+    Arguments:
+        reads: list of Read's of SUV's from bram
+        k: Number of values
+        unique_pairs: If True, each pair of Read's is compared at most once
+        rng: Generator that pairs are drawn from
+                (freshly seeded Generator if None)
+        threads: Number of threads that pairs are compared by
     """
+    if rng is None:
+        rng = np.random.default_rng()
+    matrix = PackedReads.from_reads(reads).matrix
     k = int(min(k, ((len(reads) ** 2 - len(reads)) / 2)))
-    return np.fromiter(
-        (
-            hamming(
-                *(
-                    read.bits_flattened
-                    for read in tuple(random.sample(reads, k=2))
-                )
-            )
-            for _ in range(k)
-        ),
-        np.float64,
-    )
+    idxs, other_idxs = random_pair_idxs(rng, len(reads), k, unique_pairs)
+    return hamming_distances(matrix, matrix, idxs, other_idxs, threads)
 
 
 def interdistance(
-    reads: list[Read],
-    other_reads: list[Read],
+    reads: Sequence[Read],
+    other_reads: Sequence[Read],
     only_use_first_element: bool = False,
+    threads: int = 1,
 ) -> npt.NDArray[np.float64]:
     """
     Produces l*m interdistance values,
     where l, m are the lengths of "reads" and "other_reads"
+    (pairs are compared by "threads" threads)
 
     Can be used for Uniquess
     """
@@ -71,41 +274,82 @@ def interdistance(
         reads = reads[:1]
         other_reads = other_reads[:1]
 
-    return np.fromiter(
-        (
-            hamming(read_x.bits_flattened, read_y.bits_flattened)
-            for read_x in reads
-            for read_y in other_reads
+    return hamming_distances(
+        PackedReads.from_reads(reads).matrix,
+        PackedReads.from_reads(other_reads).matrix,
+        np.repeat(np.arange(len(reads)), len(other_reads)),
+        np.tile(np.arange(len(other_reads)), len(reads)),
+        threads,
+    )
+
+
+def first_read_interdistances(
+    reads_per_session: Sequence[Sequence[Read]],
+    tile_size: int = 256,
+    threads: int = 1,
+) -> npt.NDArray[np.float64]:
+    """
+    Produces ((k-1)*k)/2 interdistance values between the first Read's
+    of k lists of Read's (e.g. of all BRAM's of a container).
+    Values are ordered like the pairs of ComparisonStatistic.compare.
+
+    First Read's are stacked into a single bit matrix, whose pairwise
+    distances are computed tile by tile (see "intradistance").
+    Same values as "interdistance" with "only_use_first_element"
+    over each pair.
+
+    Can be used for Uniquess
+    """
+    return intradistance(
+        PackedReads(
+            np.concatenate(
+                [
+                    PackedReads.from_reads(reads[:1]).matrix
+                    for reads in reads_per_session
+                ]
+            )
         ),
-        np.float64,
+        tile_size,
+        threads,
     )
 
 
 def interdistance_bootstrap(
-    reads: list[Read], other_reads: list[Read], k: int = 1000
+    reads: Sequence[Read],
+    other_reads: Sequence[Read],
+    k: int = 1000,
+    rng: np.random.Generator = None,
+    threads: int = 1,
 ) -> npt.NDArray[np.float64]:
     """
     Produces k interdistance values
-    Choses pairs of values from "reads" and "other_reads" pseudo randomly.
+    Choses pairs of values from "reads" and "other_reads" pseudo randomly
+    (all at once).
 
     Duplicates can occur
 
     Less computing tome expensive alternative to "interdistance"
-    """
-    self_choices = [
-        choice.bits_flattened for choice in random.choices(reads, k=k)
-    ]
-    other_choices = [
-        choice.bits_flattened for choice in random.choices(other_reads, k=k)
-    ]
 
-    return np.fromiter(
-        map(hamming, self_choices, other_choices), dtype=np.float64
+    Arguments:
+        reads, other_reads: Compared lists of Read's
+        k: Number of values
+        rng: Generator that pairs are drawn from
+                (freshly seeded Generator if None)
+        threads: Number of threads that pairs are compared by
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    return hamming_distances(
+        PackedReads.from_reads(reads).matrix,
+        PackedReads.from_reads(other_reads).matrix,
+        rng.integers(len(reads), size=k).astype(np.intp),
+        rng.integers(len(other_reads), size=k).astype(np.intp),
+        threads,
     )
 
 
 def bit_stabilization_count_over_time(
-    reads: list[Read], stable_after_n_reads: int = 1000
+    reads: Sequence[Read], stable_after_n_reads: int = 1000
 ) -> npt.NDArray[np.float64]:
     """
     Goes backwards through Read's.
@@ -114,39 +358,23 @@ def bit_stabilization_count_over_time(
     Bits that have been unchanged til the last read
     and for atleast "stable_after_n_reads" Read's are seen as stable
     """
-
-    length_of_read = len(reads[0].bits_flattened)
     reads_count = len(reads)
-    did_not_change_since_read = np.full((length_of_read,), 0)
-    # Could also theoretically be called "next_bram_value",
-    # because we go through the list backwards
-    previous_bram_value = reads[-1].bits_flattened
-
-    for inversed_idx, read in enumerate(reversed(reads)):
-        bit_changed_list = np.bitwise_xor(
-            previous_bram_value, read.bits_flattened
-        )
-        for bit_idx, bit_changed in enumerate(bit_changed_list):
-            if bit_changed == 1 and did_not_change_since_read[bit_idx] == 0:
-                did_not_change_since_read[bit_idx] = reads_count - inversed_idx
-        previous_bram_value = read.bits_flattened
-
-    stable_bits_per_time_step = np.zeros(reads_count)
-    bit_indices, counts = np.unique(
-        did_not_change_since_read, return_counts=True
+    did_not_change_since_read = last_change_idxs(
+        PackedReads.from_reads(reads).matrix
     )
 
+    stable_bits_per_time_step = np.bincount(
+        did_not_change_since_read, minlength=reads_count
+    ).astype(np.float64)
+
     last_relevant_idx = reads_count - stable_after_n_reads
-    for bit_idx, count in zip(bit_indices, counts):
-        if bit_idx > last_relevant_idx:
-            break
-        stable_bits_per_time_step[bit_idx] = count
+    stable_bits_per_time_step[max(last_relevant_idx + 1, 0):] = 0
 
     return stable_bits_per_time_step
 
 
 def bit_flip_chance(
-    reads: list[Read], only_use_first_element: bool = False
+    reads: Sequence[Read], only_use_first_element: bool = False
 ) -> npt.NDArray[np.float64]:
     """
     Determinates over a given list of Reads the probability to flip to 1 for
@@ -160,67 +388,136 @@ def bit_flip_chance(
         List of floats. Percentage for each bit to flip to 1.
         Values are indexed the same way as the input read values.
     """
+    return bit_counts(reads, only_use_first_element).probabilities
+
+
+def bit_counts(
+    reads: Sequence[Read], only_use_first_element: bool = False
+) -> BitCountAccumulator:
+    """
+    Number of 1's per bit index and number of Read's they were counted over.
+    Counts of different Read's can be merged exactly (see
+    BitCountAccumulator), unlike the probabilities of "bit_flip_chance".
+
+    Arguments:
+        reads: list of Read's of SUV's from bram
+        only_use_first_element: Only count the first Read (bit aliasing)
+    """
     if only_use_first_element:
         reads = reads[:1]
-    flip_total_vector = np.zeros(len(reads[0].bits_flattened), dtype=np.uint64)
-    for read in reads:
-        flip_total_vector = np.add(flip_total_vector, read.bits_flattened)
+    return BitCountAccumulator(per_bit_one_counts(reads), len(reads))
+
+
+@session_intermediate("read_session_bit_counts")
+def read_session_bit_counts(
+    read_session: ReadSession | LazyReadSession,
+    reads_name: str,
+    only_use_first_element: bool = False,
+) -> BitCountAccumulator:
+    """
+    "bit_counts" of the data or parity reads of a read session.
+    Read sessions that were loaded from a group with bit-transposed reads
+    are counted from hdf5 without decoding their reads
+    (see ReadSession.stored_bit_counts). Otherwise streamed reads
+    (see LazyReadSession.streamed_reads) are counted chunk by chunk.
+
+    Arguments:
+        read_session: ReadSession or LazyReadSession
+        reads_name: "data_reads" or "parity_reads"
+        only_use_first_element: Only count the first Read (bit aliasing)
+    """
+    counts = read_session.stored_bit_counts(
+        reads_name, only_use_first_element
+    )
+    if counts is None and not only_use_first_element:
+        chunks = read_session.streamed_reads(reads_name)
+        if chunks is not None:
+            counts = bit_counts_streaming(chunks)
+    if counts is None:
+        counts = bit_counts(
+            getattr(read_session, reads_name), only_use_first_element
+        )
+    return counts
 
-    return flip_total_vector / len(reads)
+
+@session_intermediate("stable_bit_classes")
+def stable_bit_classes(
+    reads: Sequence[Read],
+) -> dict[BitFlipType, npt.NDArray[np.bool_]]:
+    """
+    Classifies all bits of a set of Read samples for every BitFlipType
+    in one pass. Flip chances are only computed once.
+
+    Arguments:
+        reads: Read samples
+
+    Returns:
+        Boolean mask per BitFlipType. Each mask has the length of a single
+        sample of read and is True at indices of bits of said type
+    """
+    return classify_bits(bit_flip_chance(reads))
+
+
+@session_intermediate("read_session_bit_classes")
+def read_session_bit_classes(
+    read_session: ReadSession | LazyReadSession, reads_name: str
+) -> dict[BitFlipType, npt.NDArray[np.bool_]]:
+    """
+    "stable_bit_classes" of the data or parity reads of a read session
+    (counted like "read_session_bit_counts")
+    """
+    return classify_bits(
+        read_session_bit_counts(read_session, reads_name).probabilities
+    )
+
+
+def classify_bits(
+    flip_prob: npt.NDArray[np.float64],
+) -> dict[BitFlipType, npt.NDArray[np.bool_]]:
+    """
+    Boolean mask per BitFlipType of bits with the given flip chances
+    (see stable_bit_classes)
+    """
+    zero_stable = flip_prob == 0.0
+    one_stable = flip_prob == 1.0
+    return {
+        BitFlipType.BOTH: zero_stable | one_stable,
+        BitFlipType.ONE: one_stable,
+        BitFlipType.ZERO: zero_stable,
+        BitFlipType.UNSTABLE: ~(zero_stable | one_stable),
+        BitFlipType.VERY_UNSTABLE: (0.25 <= flip_prob) & (flip_prob < 0.75),
+        BitFlipType.RANDOM: (0.4 <= flip_prob) & (flip_prob < 0.6),
+        BitFlipType.BOTH_NEARLY_STABLE: (
+            (0.99 < flip_prob) | (0.01 > flip_prob)
+        ),
+    }
 
 
 def stable_bits_per_idxs(
-    reads: list[Read], bit_flip_type: BitFlipType
-) -> npt.NDArray[np.float64]:
+    reads: Sequence[Read] | None,
+    bit_flip_type: BitFlipType,
+    bit_classes: dict[BitFlipType, npt.NDArray[np.bool_]] = None,
+) -> npt.NDArray[np.int64]:
     """
     Function that gives overview of stable bits of a set of Read samples.
 
     Arguments:
-        reads: Read samples
+        reads: Read samples (not needed if "bit_classes" is given)
         bit_flip_type: Sets what kind of stable bits are analyzed
                         (See BitFlipType Enum)
+        bit_classes: Result of stable_bit_classes for "reads", if it is
+                        already known
 
     Returns:
         Numpy of length of single sample of read. Each index is 1 if the bit at
         said index was stable (and 0 otherwise)
     """
-    prob_per_bit = bit_flip_chance(reads)
-    return np.fromiter(
-        (
-            1
-            if (
-                (
-                    bit_flip_type == BitFlipType.BOTH
-                    and (flip_prob == 0.0 or flip_prob == 1.0)
-                )
-                or (bit_flip_type == BitFlipType.ONE and flip_prob == 1.0)
-                or (bit_flip_type == BitFlipType.ZERO and flip_prob == 0.0)
-                or (
-                    bit_flip_type == BitFlipType.UNSTABLE
-                    and flip_prob != 1.0
-                    and flip_prob != 0.0
-                )
-                or (
-                    bit_flip_type == BitFlipType.VERY_UNSTABLE
-                    and 0.25 <= flip_prob < 0.75
-                )
-                or (
-                    bit_flip_type == BitFlipType.RANDOM
-                    and 0.4 <= flip_prob < 0.6
-                )
-                or (
-                    bit_flip_type == BitFlipType.BOTH_NEARLY_STABLE
-                    and (0.99 < flip_prob or 0.01 > flip_prob)
-                )
-            )
-            else 0
-            for flip_prob in prob_per_bit
-        ),
-        np.int64,
-    )
+    if bit_classes is None:
+        bit_classes = stable_bit_classes(reads)
+    return bit_classes[bit_flip_type].astype(np.int64)
 
 
-def reliability(reads: list[Read]) -> np.float64:
+def reliability(reads: Sequence[Read]) -> np.float64:
     """
     Calculates reliability according to:
         "A Systematic Method to Evaluate and Compare
@@ -236,16 +533,26 @@ def reliability(reads: list[Read]) -> np.float64:
     Returns: Reliability score v: 0 <= v <= 1.0, with 1.0 being the best
                 possible reliability
     """
-    r_i = reads[0].bits_flattened
-    intradistance_sum = sum(
-        [hamming(r_i, other_read.bits_flattened) for other_read in reads[1:]]
+    matrices = PackedReads.matrices_from_reads(reads)
+    reference = matrices[0][:1]
+    distances = np.concatenate(
+        [
+            hamming_distances(
+                reference,
+                matrix,
+                np.zeros(len(matrix), dtype=np.intp),
+                np.arange(len(matrix)),
+            )
+            for matrix in matrices
+        ]
     )
+    intradistance_sum = np.sum(distances[1:])
     normalized_avg_intradistance = intradistance_sum / (len(reads) - 1)
     return 1 - normalized_avg_intradistance
 
 
 def hamming_weight(
-    reads: list[Read], only_use_first_element: bool = False
+    reads: Sequence[Read], only_use_first_element: bool = False
 ) -> np.float64:
     """
     Computes hamming weight over bits of each read.
@@ -258,14 +565,105 @@ def hamming_weight(
         One hamming weight value per Read
     """
     if only_use_first_element:
-        reads = reads[:1]
-        return np.sum(reads[0].bits_flattened) / len(reads[0].bits_flattened)
-    else:
-        hamming_weights = np.fromiter(
-            (
-                np.sum(read.bits_flattened) / len(read.bits_flattened)
-                for read in reads
-            ),
-            np.float64,
+        # Only the first Read is packed and counted
+        matrix = PackedReads.from_reads(reads[:1]).matrix
+        return row_hamming_weights(matrix)[0] / (matrix.shape[1] * 8)
+    return np.average(per_read_hamming_weights(reads) / read_bit_count(reads))
+
+
+# Streaming variants of stat functions.
+# They consume an iterable of chunks of consecutive Read's (e.g. from
+# ReadSession.iter_chunks or PackedReads.iter_hdf5_dataset_chunks) and
+# only keep running accumulators, so memory is bounded by the chunk size.
+
+
+def bit_flip_chance_streaming(
+    chunks: Iterable[Sequence[Read]],
+) -> npt.NDArray[np.float64]:
+    """
+    Streaming variant of "bit_flip_chance"
+    """
+    return bit_counts_streaming(chunks).probabilities
+
+
+def bit_counts_streaming(
+    chunks: Iterable[Sequence[Read]],
+) -> BitCountAccumulator:
+    """
+    Streaming variant of "bit_counts"
+    """
+    accumulator = None
+    for chunk in chunks:
+        matrix = PackedReads.from_reads(chunk).matrix
+        if accumulator is None:
+            accumulator = BitCountAccumulator.empty(matrix.shape[1] * 8)
+        accumulator.update(matrix)
+    if accumulator is None:
+        raise ValueError("No reads were given")
+    return accumulator
+
+
+def hamming_weight_streaming(
+    chunks: Iterable[Sequence[Read]], only_use_first_element: bool = False
+) -> np.float64:
+    """
+    Streaming variant of "hamming_weight" (average over all reads).
+    Only the first chunk is consumed if "only_use_first_element" is set.
+    """
+    hamming_weight_sum = 0
+    read_count = 0
+    bit_count = None
+    for chunk in chunks:
+        if only_use_first_element:
+            chunk = chunk[:1]
+        matrix = PackedReads.from_reads(chunk).matrix
+        hamming_weight_sum += int(row_hamming_weights(matrix).sum())
+        read_count += len(matrix)
+        bit_count = matrix.shape[1] * 8
+        if only_use_first_element and read_count:
+            break
+    if not read_count:
+        raise ValueError("No reads were given")
+    return np.float64(hamming_weight_sum / (read_count * bit_count))
+
+
+def entropy_list_streaming(
+    chunks: Iterable[Sequence[Read]],
+) -> npt.NDArray[np.float64]:
+    """
+    Streaming variant of "entropy_list".
+    Only the result (one value per Read) grows with the number of reads.
+    """
+    return np.concatenate(
+        [entropy_list(chunk) for chunk in chunks if len(chunk)]
+    )
+
+
+def reliability_streaming(chunks: Iterable[Sequence[Read]]) -> np.float64:
+    """
+    Streaming variant of "reliability".
+    The first Read of the first chunk is used as r_i.
+    """
+    reference = None
+    intradistance_sum = 0.0
+    read_count = 0
+    for chunk in chunks:
+        matrix = PackedReads.from_reads(chunk).matrix
+        if not len(matrix):
+            continue
+        if reference is None:
+            # Reference row is copied, so chunks can be dropped
+            reference = matrix[:1].copy()
+            matrix = matrix[1:]
+        intradistance_sum += np.sum(
+            hamming_distances(
+                matrix,
+                reference,
+                np.arange(len(matrix)),
+                np.zeros(len(matrix), dtype=np.intp),
+            )
         )
-        return np.average(hamming_weights)
+        read_count += len(matrix)
+    if not read_count:
+        raise ValueError("At least two reads are needed")
+    return 1 - intradistance_sum / read_count
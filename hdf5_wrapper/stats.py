@@ -9,6 +9,7 @@ from pathlib import Path
 from enum import Enum
 from typing import Self, Type
 import functools
+import h5py
 import numpy as np
 import numpy.typing as npt
 import json
@@ -26,18 +27,26 @@ from .stats_base import (
     SimpleStatistic,
     ComparisonStatistic,
     BitwiseStatistic,
+    BitCountStatistic,
+    HistogramStatistic,
     SingleValueStatistic,
 )
 from .stat_functions import (
     interdistance_bootstrap,
     intradistance_bootstrap,
     entropy_list,
+    entropy_list_streaming,
     bit_stabilization_count_over_time,
     bit_flip_chance,
     hamming_weight,
+    hamming_weight_streaming,
+    read_session_bit_classes,
+    read_session_bit_counts,
     reliability,
+    reliability_streaming,
     stable_bits_per_idxs,
-    interdistance,
+    first_read_interdistances,
+    intradistance_histogram,
 )
 from .utility import BitFlipType, ColorPresets, PlotSettings
 
@@ -52,7 +61,27 @@ class IntradistanceStatistic(SimpleStatistic):
     description = "Intradistance of Bootstrap of set of SUV's"
     "via relative Hamming Distance"
     stat_func = staticmethod(intradistance_bootstrap)
-    stat_func_kwargs = {"k": 10000}
+    stat_func_kwargs = {"k": 10000, "unique_pairs": False, "threads": 1}
+    uses_rng = True
+
+
+class ExactIntradistanceStatistic(HistogramStatistic):
+    """
+    Exact alternative to IntradistanceStatistic.
+    Compares all pairs of Reads instead of a Bootstrap.
+    Keeps the histogram of distances (not one value per pair).
+
+    Attributes:
+        See parent classes
+    """
+
+    _hdf5_group_name = "Exact Intradistance"
+    description = (
+        "Histogram of intradistances of all pairs of SUV's "
+        "via Hamming Distance"
+    )
+    stat_func = staticmethod(intradistance_histogram)
+    stat_func_kwargs = {"tile_size": 256, "threads": 1}
 
 
 class EntropyStatistic(SimpleStatistic):
@@ -64,6 +93,7 @@ class EntropyStatistic(SimpleStatistic):
     _hdf5_group_name = "Entropy"
     description = "Entropy on single reads via counts of 1's and 0's in SUV"
     stat_func = staticmethod(entropy_list)
+    streaming_stat_func = staticmethod(entropy_list_streaming)
 
 
 class InterdistanceStatistic(ComparisonStatistic):
@@ -75,7 +105,8 @@ class InterdistanceStatistic(ComparisonStatistic):
     _hdf5_group_name = "Interdistance"
     description = "Interdistance values between Bootstrap of two sets of SUV's"
     stat_func = staticmethod(interdistance_bootstrap)
-    stat_func_kwargs = {"k": 100000}
+    stat_func_kwargs = {"k": 100000, "threads": 1}
+    uses_rng = True
 
 
 class BitStabilizationStatistic(SimpleStatistic):
@@ -101,11 +132,12 @@ class BitStabilizationStatistic(SimpleStatistic):
         )
 
 
-class BitFlipChanceStatistic(BitwiseStatistic):
+class BitFlipChanceStatistic(BitCountStatistic):
     _hdf5_group_name = "Bitflip Percentage"
     description = "Percentage of times that SUV 1 occured per bit index. Also "
     "describes the number of Stable bits."
     stat_func = staticmethod(bit_flip_chance)
+    count_func = staticmethod(read_session_bit_counts)
     stat_func_kwargs = {}
 
     # This list is used if multiple BitFlipChancesStatistic's are merged
@@ -113,6 +145,7 @@ class BitFlipChanceStatistic(BitwiseStatistic):
     # (with no relation to index)
     # It only accounts for data_stats (NOT parity)
     total_list_of_flip_chances: npt.NDArray[np.float32] = None
+    hdf5_attributes = ["total_list_of_flip_chances"]
 
     # Alot of these count values will be used multiple times
     # Which is why we cache each of them as a class attribute
@@ -340,6 +373,7 @@ class StableBitStatistic(BitwiseStatistic):
     # Data sample from all brams are later concatenated and used for NIST tests
     # To answer questions like: How is the quality of random bits?
     data_sample = None
+    hdf5_attributes = ["bram_count", "data_sample"]
 
     def __init__(
         self,
@@ -348,16 +382,50 @@ class StableBitStatistic(BitwiseStatistic):
         data_read_stat=None,
         parity_read_stat=None,
         bram_count: int = 1,
-        data_sample: npt.NDArray[np.int8] = None
+        data_sample: npt.NDArray[np.int8] = None,
+        bit_classes: tuple[
+            dict[BitFlipType, npt.NDArray[np.bool_]],
+            dict[BitFlipType, npt.NDArray[np.bool_]],
+        ] = None,
     ):
-        super().__init__(
-            plot_settings, read_session, data_read_stat, parity_read_stat
-        )
+        """
+        Additionally to the cases of SimpleStatistic, this class can be
+        created from a ReadSession and the results of stable_bit_classes
+        for its data and parity reads ("bit_classes").
+        This allows multiple StableBitStatistic's to share one
+        classification.
+        Bits of ReadSession's are classified by their counts
+        (see read_session_bit_classes), so reads are only decoded if they
+        can't be counted from hdf5.
+        """
+        if read_session is not None and bit_classes is None:
+            bit_classes = (
+                read_session_bit_classes(read_session, "data_reads"),
+                read_session_bit_classes(read_session, "parity_reads"),
+            )
+        if read_session is not None:
+            data_bit_classes, parity_bit_classes = bit_classes
+            # Reads are not needed if their bit classes are known
+            super().__init__(
+                plot_settings,
+                None,
+                self.stat_func(
+                    None, bit_classes=data_bit_classes, **self.stat_func_kwargs
+                ),
+                self.stat_func(
+                    None,
+                    bit_classes=parity_bit_classes,
+                    **self.stat_func_kwargs,
+                ),
+            )
+        else:
+            super().__init__(
+                plot_settings, read_session, data_read_stat, parity_read_stat
+            )
         self.bram_count = bram_count
-        self.data_bit_indices = [
-            idx for idx, value in enumerate(self.data_stats)
-            if value == self.bram_count
-        ]
+        self.data_bit_indices = np.flatnonzero(
+            self.data_stats == self.bram_count
+        ).tolist()
         if data_sample is None:
             if self.bram_count != 1:
                 raise Exception(
@@ -366,10 +434,13 @@ class StableBitStatistic(BitwiseStatistic):
                     "A mixture of both cases implies an error."
                 )
             else:
-                self.data_sample = np.array([
-                    read_session.data_reads[0].bits_flattened[idx]
-                    for idx in self.data_bit_indices
-                ])
+                # One counts of the first read are its bits
+                first_read_bits = read_session_bit_counts(
+                    read_session, "data_reads", only_use_first_element=True
+                ).one_counts.astype(np.uint8)
+                self.data_sample = first_read_bits[
+                    np.array(self.data_bit_indices, dtype=np.intp)
+                ]
         else:
             self.data_sample = data_sample
 
@@ -410,6 +481,17 @@ class StableBitStatistic(BitwiseStatistic):
 
         
 
+    @classmethod
+    def from_hdf5_group(
+        cls, statistic_group: h5py.Group, plot_settings: PlotSettings
+    ) -> Self:
+        statistic = super().from_hdf5_group(statistic_group, plot_settings)
+        statistic.bram_count = int(statistic.bram_count)
+        statistic.data_bit_indices = np.flatnonzero(
+            statistic.data_stats == statistic.bram_count
+        ).tolist()
+        return statistic
+
     @classmethod
     def from_merge(
         cls, stats: list[Self], plot_settings: PlotSettings
@@ -420,19 +502,12 @@ class StableBitStatistic(BitwiseStatistic):
         number of samples.
         -> Because we want to get a distribution from total counts
         """
-        data_read_stats_list = [
-            bitwise_statistic.data_stats for bitwise_statistic in stats
-        ]
-        parity_read_stats_list = [
-            bitwise_statistic.parity_stats for bitwise_statistic in stats
-        ]
-
-        data_read_stats_sum = np.array(
-            list(map(sum, zip(*data_read_stats_list)))
-        )
-        parity_read_stats_sum = np.array(
-            list(map(sum, zip(*parity_read_stats_list)))
-        )
+        data_read_stats_sum = np.stack(
+            [bitwise_statistic.data_stats for bitwise_statistic in stats]
+        ).sum(axis=0)
+        parity_read_stats_sum = np.stack(
+            [bitwise_statistic.parity_stats for bitwise_statistic in stats]
+        ).sum(axis=0)
         bram_count = sum([stat.bram_count for stat in stats])
         data_samples = [stat.data_sample for stat in stats]
 
@@ -561,13 +636,27 @@ class CombinedStableBitStatistic(BitwiseStatistic):
         data_read_stat=None,
         parity_read_stat=None,
     ):
-        super().__init__(
-            plot_settings, read_session, data_read_stat, parity_read_stat
-        )
         if read_session is not None:
+            # Bits of the first reads are their one counts, so reads are
+            # only decoded if they can't be counted from hdf5
+            data_read_stat, parity_read_stat = [
+                read_session_bit_counts(
+                    read_session, reads_name, only_use_first_element=True
+                ).one_counts.astype(np.uint8)
+                for reads_name in ["data_reads", "parity_reads"]
+            ]
+        super().__init__(plot_settings, None, data_read_stat, parity_read_stat)
+        if read_session is not None:
+            # All stable bit types are derived from a single classification
+            bit_classes = (
+                read_session_bit_classes(read_session, "data_reads"),
+                read_session_bit_classes(read_session, "parity_reads"),
+            )
             self.stable_bit_stats = {
                 stable_bit_stat_type: stable_bit_stat_type(
-                    plot_settings=plot_settings, read_session=read_session
+                    plot_settings=plot_settings,
+                    read_session=read_session,
+                    bit_classes=bit_classes,
                 )
                 for stable_bit_stat_type in self.stable_bit_stat_types
             }
@@ -595,6 +684,26 @@ class CombinedStableBitStatistic(BitwiseStatistic):
         new_stat_obj.stable_bit_stats = new_stable_bit_stats
         return new_stat_obj
 
+    def add_to_hdf5_group(self, parent: h5py.Group) -> h5py.Group:
+        statistic_group = super().add_to_hdf5_group(parent)
+        for stable_bit_stat in self.stable_bit_stats.values():
+            stable_bit_stat.add_to_hdf5_group(statistic_group)
+        return statistic_group
+
+    @classmethod
+    def from_hdf5_group(
+        cls, statistic_group: h5py.Group, plot_settings: PlotSettings
+    ) -> Self:
+        statistic = super().from_hdf5_group(statistic_group, plot_settings)
+        statistic.stable_bit_stats = {
+            stable_bit_stat_type: stable_bit_stat_type.from_hdf5_group(
+                statistic_group[stable_bit_stat_type._hdf5_group_name],
+                plot_settings.with_expanded_path(""),
+            )
+            for stable_bit_stat_type in cls.stable_bit_stat_types
+        }
+        return statistic
+
     def _plot(self):
         multi_bit_heatmap(
             self.stable_bit_stats,
@@ -613,10 +722,11 @@ class UniformityStatistic(SingleValueStatistic):
     _hdf5_group_name = "Uniformity"
     description = "TODO"
     stat_func = staticmethod(hamming_weight)
+    streaming_stat_func = staticmethod(hamming_weight_streaming)
     stat_func_kwargs = {"only_use_first_element": True}
 
 
-class BitAliasingStatistic(BitwiseStatistic):
+class BitAliasingStatistic(BitCountStatistic):
     """
     Attributes:
         See parent classes
@@ -625,6 +735,7 @@ class BitAliasingStatistic(BitwiseStatistic):
     _hdf5_group_name = "Bit-aliasing"
     description = "TODO"
     stat_func = staticmethod(bit_flip_chance)
+    count_func = staticmethod(read_session_bit_counts)
     stat_func_kwargs = {"only_use_first_element": False}
 
     def plot(self) -> None:
@@ -650,6 +761,7 @@ class ReliabilityStatistic(SingleValueStatistic):
     _hdf5_group_name = "Reliability"
     description = "TODO"
     stat_func = staticmethod(reliability)
+    streaming_stat_func = staticmethod(reliability_streaming)
     stat_func_kwargs = {}
 
 
@@ -661,8 +773,10 @@ class UniquenessStatistic(ComparisonStatistic):
 
     _hdf5_group_name = "Uniqueness"
     description = "TODO"
-    stat_func = staticmethod(interdistance)
-    stat_func_kwargs = {"only_use_first_element": True}
+    stat_func = staticmethod(first_read_interdistances)
+    stat_func_kwargs = {"tile_size": 256, "threads": 1}
+    compares_all_sessions = True
+    compares_first_reads = True
 
 
 class StatisticTypes(Enum):
@@ -671,6 +785,7 @@ class StatisticTypes(Enum):
     """
 
     IntradistanceStatistic = IntradistanceStatistic
+    ExactIntradistanceStatistic = ExactIntradistanceStatistic
     EntropyStatistic = EntropyStatistic
     InterdistanceStatistic = InterdistanceStatistic
     BitAliasingStatistic = BitAliasingStatistic
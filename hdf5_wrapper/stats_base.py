@@ -4,14 +4,17 @@ visualize statistics over Read's or ReadSession's
 """
 
 from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 from typing import Any, Callable, Self
 import h5py
 import numpy as np
 import numpy.typing as npt
+from .bit_matrix import BitCountAccumulator
 from .experiment_hdf5 import Read, ReadSession
 from .interfaces import HDF5Convertible, Plottable
 from .plotting import box_plot, single_value_to_file, object_to_json_file
+from .stat_functions import histogram_moments
 from .utility import PlotSettings
 
 
@@ -121,6 +124,32 @@ class MetaStatistic(HDF5Convertible, Plottable):
         )
 
 
+class HistogramMetaStatistic(MetaStatistic):
+    """
+    MetaStatistic of relative distances that are given as a histogram
+    (see histogram_moments). Values are never expanded.
+
+    Attributes:
+        values: Histogram (number of values per absolute distance)
+        See parent class
+    """
+
+    def __init__(
+        self,
+        histogram: npt.NDArray[np.int64],
+        plot_settings: PlotSettings,
+        bit_type: str,
+    ) -> None:
+        Plottable.__init__(self, plot_settings)
+        self.values = histogram
+        moments = histogram_moments(histogram)
+        self.stats = {
+            stat_name: moments[stat_name]
+            for stat_name in self.statistic_method_names
+        }
+        self.bit_type = bit_type
+
+
 class Statistic(HDF5Convertible, Plottable, metaclass=ABCMeta):
     """
     Statistic over ReadSession.
@@ -137,6 +166,13 @@ class Statistic(HDF5Convertible, Plottable, metaclass=ABCMeta):
         plot_setting_additions: Some classes may want to overwrite
                                 plot settings statically. This dict + init of
                                 this base class allow the latter.
+        hdf5_attributes: Names of additional attributes that are needed for
+                            plotting. They are written to hdf5 next to the
+                            values and restored by "from_hdf5_group".
+        uses_rng: True if "stat_func" draws random samples. It then gets
+                    a Generator of this Statistic as "rng" argument
+                    (see PlotSettings.rng), so results are reproducible
+                    and independent of the order of computation.
     """
 
     description: str
@@ -152,12 +188,24 @@ class Statistic(HDF5Convertible, Plottable, metaclass=ABCMeta):
     mergable = False  # Declares if subclass is allowed to call "from_merge"
     plot_setting_additions: dict[str, Any] = None
     meta_statable: bool = True
+    hdf5_attributes: list[str] = []
+    uses_rng: bool = False
 
     def __init__(self) -> None:
         if self.plot_setting_additions is not None:
             for key, value in self.plot_setting_additions.items():
                 setattr(self.plot_settings, key, value)
 
+    def rng_kwargs(self, *key: str) -> dict[str, np.random.Generator]:
+        """
+        Additional "stat_func" arguments of a call (empty if "uses_rng"
+        isn't set). "key" identifies the call (e.g. "data" or "parity")
+        """
+        if self.uses_rng:
+            return {"rng": self.plot_settings.rng(*key)}
+        else:
+            return dict()
+
     @property
     def meta_stats(self) -> dict[str, MetaStatistic]:
         # We use just in time calculation for this attribute,
@@ -175,7 +223,7 @@ class Statistic(HDF5Convertible, Plottable, metaclass=ABCMeta):
             ),
         }
 
-    def add_to_hdf5_group(self, parent: h5py.Group) -> None:
+    def add_to_hdf5_group(self, parent: h5py.Group) -> h5py.Group:
         statistic_group = parent.create_group(self._hdf5_group_name)
 
         parity_group = statistic_group.create_group("Parity")
@@ -185,6 +233,8 @@ class Statistic(HDF5Convertible, Plottable, metaclass=ABCMeta):
         meta_stats["Parity"].add_to_hdf5_group(parity_group)
         meta_stats["Data"].add_to_hdf5_group(data_group)
 
+        # Values keep their dtype, so restored objects plot the same values
+        # (e.g. stable bit counts are integers)
         parity_group.create_dataset(
             "Values",
             (
@@ -192,12 +242,66 @@ class Statistic(HDF5Convertible, Plottable, metaclass=ABCMeta):
                     self.parity_stats,
                 )
             ),
-            dtype="f8",
+            dtype=np.asarray(self.parity_stats).dtype,
             data=self.parity_stats,
         )
         data_group.create_dataset(
-            "Values", (len(self.data_stats),), dtype="f8", data=self.data_stats
+            "Values",
+            (len(self.data_stats),),
+            dtype=np.asarray(self.data_stats).dtype,
+            data=self.data_stats,
         )
+        self.add_hdf5_attributes(statistic_group)
+        return statistic_group
+
+    def add_hdf5_attributes(self, statistic_group: h5py.Group) -> None:
+        """
+        Writes "hdf5_attributes" to the group of this Statistic.
+        Single values are written as hdf5 attributes, arrays as datasets.
+        Attributes that are None are skipped.
+        """
+        for attribute_name in self.hdf5_attributes:
+            value = getattr(self, attribute_name)
+            if value is None:
+                continue
+            elif np.ndim(value) == 0:
+                statistic_group.attrs[attribute_name] = value
+            else:
+                statistic_group.create_dataset(attribute_name, data=value)
+
+    @classmethod
+    def from_hdf5_group(
+        cls, statistic_group: h5py.Group, plot_settings: PlotSettings
+    ) -> Self:
+        """
+        Restores a Statistic from the group written by "add_to_hdf5_group"
+        without recomputing it (no ReadSession is needed)
+
+        Arguments:
+            statistic_group: Group created by "add_to_hdf5_group"
+            plot_settings: PlotSettings of the restored object
+        """
+        statistic = cls.__new__(cls)
+        statistic.plot_settings = plot_settings
+        statistic.data_stats = statistic_group["Data"]["Values"][()]
+        statistic.parity_stats = statistic_group["Parity"]["Values"][()]
+        statistic.load_hdf5_attributes(statistic_group)
+        Statistic.__init__(statistic)
+        return statistic
+
+    def load_hdf5_attributes(self, statistic_group: h5py.Group) -> None:
+        """
+        Restores "hdf5_attributes" that were written by "add_hdf5_attributes"
+        Attributes that are missing in hdf5 keep their class default.
+        """
+        for attribute_name in self.hdf5_attributes:
+            if attribute_name in statistic_group.attrs:
+                value = statistic_group.attrs[attribute_name]
+            elif attribute_name in statistic_group:
+                value = statistic_group[attribute_name][()]
+            else:
+                continue
+            setattr(self, attribute_name, value)
 
     @classmethod
     @abstractmethod
@@ -223,9 +327,17 @@ class SimpleStatistic(Statistic, metaclass=ABCMeta):
 
     Attributes:
         mergable: See Statistic. Instances of this class are mergable.
+        streaming_stat_func: Streaming variant of "stat_func" (optional).
+                             Gets the chunks of reads that a read session
+                             streams instead of decoding them
+                             (see LazyReadSession.streamed_reads) and
+                             "stat_func_kwargs"
     """
 
     mergable = True
+    streaming_stat_func: (
+        Callable[[Iterable[Sequence[Read]]], npt.NDArray[np.float64]] | None
+    ) = None
 
     def __init__(
         self,
@@ -241,11 +353,11 @@ class SimpleStatistic(Statistic, metaclass=ABCMeta):
         """
         self.plot_settings = plot_settings
         if read_session is not None:
-            self.data_stats = self.stat_func(
-                read_session.data_reads, **self.stat_func_kwargs
+            self.data_stats = self.read_session_stat(
+                read_session, "data_reads", "data"
             )
-            self.parity_stats = self.stat_func(
-                read_session.parity_reads, **self.stat_func_kwargs
+            self.parity_stats = self.read_session_stat(
+                read_session, "parity_reads", "parity"
             )
         elif data_stats is None or parity_stats is None:
             raise Exception(
@@ -257,6 +369,31 @@ class SimpleStatistic(Statistic, metaclass=ABCMeta):
             self.parity_stats = parity_stats
         super().__init__()
 
+    def read_session_stat(
+        self, read_session: ReadSession, reads_name: str, bit_type: str
+    ) -> Any:
+        """
+        "stat_func" of the data or parity reads of a ReadSession.
+        Streamed reads are passed to "streaming_stat_func" instead
+        (if the class has one), so they are never decoded as a whole.
+
+        Arguments:
+            read_session: ReadSession or LazyReadSession
+            reads_name: "data_reads" or "parity_reads"
+            bit_type: "data" or "parity" (see rng_kwargs)
+        """
+        if self.streaming_stat_func is not None:
+            chunks = read_session.streamed_reads(reads_name)
+            if chunks is not None:
+                return self.streaming_stat_func(
+                    chunks, **self.stat_func_kwargs
+                )
+        return self.stat_func(
+            getattr(read_session, reads_name),
+            **self.stat_func_kwargs,
+            **self.rng_kwargs(bit_type),
+        )
+
     @classmethod
     def from_merge(
         cls, stats: list[Self], plot_settings: PlotSettings
@@ -289,6 +426,48 @@ class SimpleStatistic(Statistic, metaclass=ABCMeta):
             )
 
 
+class HistogramStatistic(SimpleStatistic, metaclass=ABCMeta):
+    """
+    Statistic whose "stat_func" returns a histogram of distances
+    (number of values per absolute distance) instead of the values.
+    Keeps memory and results independent of the number of values.
+    - e.g. exact intradistance over all pairs of Read's
+
+    Attributes:
+        data_stats: Histogram of data bits
+        parity_stats: Histogram of parity bits
+    """
+
+    @property
+    def meta_stats(self) -> dict[str, MetaStatistic]:
+        return {
+            "Data": HistogramMetaStatistic(
+                self.data_stats,
+                self.plot_settings.with_expanded_path(""),
+                bit_type="data",
+            ),
+            "Parity": HistogramMetaStatistic(
+                self.parity_stats,
+                self.plot_settings.with_expanded_path(""),
+                bit_type="parity",
+            ),
+        }
+
+    @classmethod
+    def from_merge(
+        cls, stats: list[Self], plot_settings: PlotSettings
+    ) -> Self:
+        """
+        Combines stats by adding their histograms
+        """
+        return cls(
+            plot_settings,
+            None,
+            np.stack([stat.data_stats for stat in stats]).sum(axis=0),
+            np.stack([stat.parity_stats for stat in stats]).sum(axis=0),
+        )
+
+
 class SingleValueStatistic(SimpleStatistic, metaclass=ABCMeta):
     """
     Statistics whose result is a single value.
@@ -305,6 +484,11 @@ class SingleValueStatistic(SimpleStatistic, metaclass=ABCMeta):
     meta_statable: bool = False
     subcontainer_data_stats: npt.NDArray[np.float64] = None
     subcontainer_parity_stats: npt.NDArray[np.float64] = None
+    hdf5_attributes = [
+        "meta_statable",
+        "subcontainer_data_stats",
+        "subcontainer_parity_stats",
+    ]
 
     @property
     def meta_stats(self) -> dict[str, MetaStatistic]:
@@ -328,10 +512,25 @@ class SingleValueStatistic(SimpleStatistic, metaclass=ABCMeta):
         else:
             raise NotImplementedError
 
-    def add_to_hdf5_group(self, parent: h5py.Group) -> None:
+    def add_to_hdf5_group(self, parent: h5py.Group) -> h5py.Group:
         statistic_group = parent.create_group(self._hdf5_group_name)
         statistic_group.attrs["parity_stats"] = self.parity_stats
         statistic_group.attrs["data_stats"] = self.data_stats
+        self.add_hdf5_attributes(statistic_group)
+        return statistic_group
+
+    @classmethod
+    def from_hdf5_group(
+        cls, statistic_group: h5py.Group, plot_settings: PlotSettings
+    ) -> Self:
+        statistic = cls.__new__(cls)
+        statistic.plot_settings = plot_settings
+        statistic.data_stats = statistic_group.attrs["data_stats"]
+        statistic.parity_stats = statistic_group.attrs["parity_stats"]
+        statistic.load_hdf5_attributes(statistic_group)
+        statistic.meta_statable = bool(statistic.meta_statable)
+        Statistic.__init__(statistic)
+        return statistic
 
     @classmethod
     def from_merge(
@@ -404,29 +603,132 @@ class BitwiseStatistic(SimpleStatistic, metaclass=ABCMeta):
         Combines stats by adding each value in their lists
         (like adding two vectors)
         """
-        data_read_stats_list = [
-            bitwise_statistic.data_stats for bitwise_statistic in stats
-        ]
-        parity_read_stats_list = [
-            bitwise_statistic.parity_stats for bitwise_statistic in stats
-        ]
+        # Rows of stacked arrays are added one after another,
+        # which gives the same values as adding them in python
+        data_read_stats_sum = np.stack(
+            [bitwise_statistic.data_stats for bitwise_statistic in stats]
+        ).sum(axis=0)
+        parity_read_stats_sum = np.stack(
+            [bitwise_statistic.parity_stats for bitwise_statistic in stats]
+        ).sum(axis=0)
 
-        data_read_stats_sum = list(map(sum, zip(*data_read_stats_list)))
+        return cls(
+            plot_settings,
+            None,
+            data_read_stats_sum / len(stats),
+            parity_read_stats_sum / len(stats),
+        )
 
-        def div_and_float_cast(x: float) -> float:
-            return float(x / len(stats))
 
-        divide_function = div_and_float_cast
-        new_data_read_stats = np.array(
-            list(map(divide_function, data_read_stats_sum))
-        )
-        parity_read_stats_sum = list(map(sum, zip(*parity_read_stats_list)))
-        new_parity_read_stats = np.array(
-            list(map(divide_function, parity_read_stats_sum))
-        )
+class BitCountStatistic(BitwiseStatistic, metaclass=ABCMeta):
+    """
+    BitwiseStatistic of per bit probabilities (relative frequency of 1's),
+    that keeps the counts they are derived from (see BitCountAccumulator).
+    Merges add these counts, so merged probabilities are weighted by the
+    number of Read's of each statistic (exact and order independent).
+
+    Attributes:
+        count_func: Function that counts 1's per bit index over the data or
+                    parity Read's of a ReadSession (see
+                    read_session_bit_counts). Gets "stat_func_kwargs" as
+                    additional parameters.
+        data_counts: Counts of data bits
+                        (None if only probabilities were given)
+        parity_counts: Counts of parity bits
+                        (None if only probabilities were given)
+    """
+
+    count_func: Callable[..., BitCountAccumulator]
+    data_counts: BitCountAccumulator = None
+    parity_counts: BitCountAccumulator = None
+
+    def __init__(
+        self,
+        plot_settings: PlotSettings,
+        read_session: ReadSession = None,
+        data_read_stat: Any = None,
+        parity_read_stat: Any = None,
+        data_counts: BitCountAccumulator = None,
+        parity_counts: BitCountAccumulator = None,
+    ) -> None:
+        """
+        Class can be created from either:
+        - ReadSession
+        - already calculated data and parity counts
+        - already calculated data and parity stats (probabilities)
+        """
+        if read_session is not None:
+            data_counts = self.count_func(
+                read_session, "data_reads", **self.stat_func_kwargs
+            )
+            parity_counts = self.count_func(
+                read_session, "parity_reads", **self.stat_func_kwargs
+            )
+        if data_counts is not None and parity_counts is not None:
+            data_read_stat = data_counts.probabilities
+            parity_read_stat = parity_counts.probabilities
+        self.data_counts = data_counts
+        self.parity_counts = parity_counts
+        super().__init__(plot_settings, None, data_read_stat, parity_read_stat)
+
+    def add_hdf5_attributes(self, statistic_group: h5py.Group) -> None:
+        """
+        Additionally writes the counts, so restored objects can be merged
+        """
+        super().add_hdf5_attributes(statistic_group)
+        for bit_type, counts in [
+            ("data", self.data_counts),
+            ("parity", self.parity_counts),
+        ]:
+            if counts is None:
+                continue
+            statistic_group.create_dataset(
+                f"{bit_type}_one_counts", data=counts.one_counts
+            )
+            statistic_group.attrs[f"{bit_type}_read_count"] = (
+                counts.read_count
+            )
+
+    def load_hdf5_attributes(self, statistic_group: h5py.Group) -> None:
+        super().load_hdf5_attributes(statistic_group)
+        for bit_type in ["data", "parity"]:
+            if f"{bit_type}_one_counts" not in statistic_group:
+                continue
+            setattr(
+                self,
+                f"{bit_type}_counts",
+                BitCountAccumulator(
+                    statistic_group[f"{bit_type}_one_counts"][()],
+                    statistic_group.attrs[f"{bit_type}_read_count"],
+                ),
+            )
+
+    @classmethod
+    def from_merge(
+        cls, stats: list[Self], plot_settings: PlotSettings
+    ) -> Self:
+        """
+        Combines stats by adding their counts.
+        Falls back to the mean of probabilities (see BitwiseStatistic),
+        if any stat has no counts (e.g. restored from older results).
+        """
+        if any(
+            stat.data_counts is None or stat.parity_counts is None
+            for stat in stats
+        ):
+            return super().from_merge(stats, plot_settings)
 
         return cls(
-            plot_settings, None, new_data_read_stats, new_parity_read_stats
+            plot_settings,
+            None,
+            data_counts=sum(
+                (stat.data_counts for stat in stats[1:]),
+                stats[0].data_counts,
+            ),
+            parity_counts=sum(
+                (stat.parity_counts for stat in stats[1:]),
+                stats[0].parity_counts,
+            ),
         )
 
 
@@ -444,14 +746,24 @@ class ComparisonStatistic(Statistic, metaclass=ABCMeta):
         stat_func: See Statistic. Method signature differs slightly from
                     parent class
         mergable: See Statistic. Instances of this class are not mergable
+        compares_all_sessions: If True, "stat_func" gets the Read's of all
+                                ReadSession's at once (instead of one pair)
+                                and returns the values of all pairs
+        compares_first_reads: If True, "stat_func" only gets the first Read
+                              of each ReadSession (see
+                              ReadSession.first_reads), so lazily loaded
+                              read sessions aren't decoded
     """
 
     stat_func: Callable[[list[Read], list[Read]], npt.NDArray[np.float64]] = (
         None
     )
     mergable = False
+    compares_all_sessions: bool = False
+    compares_first_reads: bool = False
     data_single_value: np.float64 = None
     parity_single_value: np.float64 = None
+    hdf5_attributes = ["data_single_value", "parity_single_value"]
 
     def __init__(
         self, read_sessions: list[ReadSession], plot_settings: PlotSettings
@@ -465,7 +777,26 @@ class ComparisonStatistic(Statistic, metaclass=ABCMeta):
         """
         Produces ((k-1)*k)/2 pairs of ReadSession's
         Calls stat_func over each pair and gathers the produced values
+        (or over all ReadSession's at once, see "compares_all_sessions")
         """
+        if self.compares_all_sessions:
+            self.data_stats = self.stat_func(
+                [
+                    self.compared_reads(read_session, "data_reads")
+                    for read_session in read_sessions
+                ],
+                **self.stat_func_kwargs,
+            )
+            self.parity_stats = self.stat_func(
+                [
+                    self.compared_reads(read_session, "parity_reads")
+                    for read_session in read_sessions
+                ],
+                **self.stat_func_kwargs,
+            )
+            self.set_single_values(len(read_sessions))
+            return
+
         data_compared_values = list()
         parity_compared_values = list()
 
@@ -479,16 +810,30 @@ class ComparisonStatistic(Statistic, metaclass=ABCMeta):
                 else:
                     data_compared_values.append(
                         self.stat_func(
-                            read_sessions[idx_i].data_reads,
-                            read_sessions[idx_j].data_reads,
+                            self.compared_reads(
+                                read_sessions[idx_i], "data_reads"
+                            ),
+                            self.compared_reads(
+                                read_sessions[idx_j], "data_reads"
+                            ),
                             **self.stat_func_kwargs,
+                            **self.rng_kwargs(
+                                "data", str(idx_i), str(idx_j)
+                            ),
                         )
                     )
                     parity_compared_values.append(
                         self.stat_func(
-                            read_sessions[idx_i].parity_reads,
-                            read_sessions[idx_j].parity_reads,
+                            self.compared_reads(
+                                read_sessions[idx_i], "parity_reads"
+                            ),
+                            self.compared_reads(
+                                read_sessions[idx_j], "parity_reads"
+                            ),
                             **self.stat_func_kwargs,
+                            **self.rng_kwargs(
+                                "parity", str(idx_i), str(idx_j)
+                            ),
                         )
                     )
 
@@ -502,11 +847,28 @@ class ComparisonStatistic(Statistic, metaclass=ABCMeta):
         self.data_stats = np.array(data_compared_values).flatten()
 
         self.parity_stats = np.array(parity_compared_values).flatten()
+        self.set_single_values(len(read_sessions))
+
+    def compared_reads(
+        self, read_session: ReadSession, reads_name: str
+    ) -> Sequence[Read]:
+        """
+        Data or parity Read's of a ReadSession that "stat_func" gets
+        (only the first Read if "compares_first_reads" is set)
+        """
+        if self.compares_first_reads:
+            return read_session.first_reads(reads_name)
+        return getattr(read_session, reads_name)
+
+    def set_single_values(self, read_session_count: int) -> None:
+        """
+        Sets the average value per pair of ReadSession's
+        """
         self.data_single_value = (2 * np.sum(self.data_stats)) / (
-            (len(read_sessions) - 1) * len(read_sessions)
+            (read_session_count - 1) * read_session_count
         )
         self.parity_single_value = (2 * np.sum(self.parity_stats)) / (
-            (len(read_sessions) - 1) * len(read_sessions)
+            (read_session_count - 1) * read_session_count
         )
 
     @classmethod
@@ -2,6 +2,7 @@
 This module contains smaller functions/structures that didn't fit in otherwhere
 """
 
+import hashlib
 import subprocess
 import numpy as np
 import numpy.typing as npt
@@ -113,6 +114,10 @@ class PlotSettings:
         active: True if plots shall be generated, else False
         heat_map_bit_display_setting: See HeatMapBitDisplaySetting Enum class
         heatmap_cmap: name of color map that will be used for heatmaps
+        rng_seed: Seed of random number generators of statistics
+                    (see "rng"). Freshly seeded if None
+        rng_key: Path expansions since the root PlotSettings object.
+                    Identifies the entity that these settings belong to
     """
 
     path: Path
@@ -122,6 +127,25 @@ class PlotSettings:
     bram_count: int = None
     title: str = None
     entity_name: str = None
+    rng_seed: int = None
+    rng_key: tuple[str, ...] = ()
+
+    def rng(self, *key: str) -> np.random.Generator:
+        """
+        Random number generator of the entity that these settings belong to.
+        Its stream is spawned from a SeedSequence of "rng_seed", keyed by
+        "rng_key" and "key" (e.g. "data" or "parity"). It doesn't depend on
+        the order in which entities are computed (e.g. by parallel workers).
+        """
+        spawn_key = tuple(
+            int.from_bytes(
+                hashlib.sha256(part.encode()).digest()[:4], "little"
+            )
+            for part in self.rng_key + key
+        )
+        return np.random.default_rng(
+            np.random.SeedSequence(self.rng_seed, spawn_key=spawn_key)
+        )
 
     def with_expanded_path(self, path_expansion: str) -> Self:
         """
@@ -140,5 +164,7 @@ class PlotSettings:
             heatmap_cmap=self.heatmap_cmap,
             bram_count=self.bram_count,
             entity_name=self.entity_name,
-            title=self.title
+            title=self.title,
+            rng_seed=self.rng_seed,
+            rng_key=self.rng_key + (str(path_expansion),),
         )
@@ -18,6 +18,10 @@ from pathlib import Path
 
 from typing import Tuple, List, Any
 
+# Files of the packed output format (see append_packed_read)
+PACKED_DATA_FILE = "data_reads.bin"
+PACKED_PARITY_FILE = "parity_reads.bin"
+PACKED_INDEX_FILE = "reads.idx"
 
 def create_parser() -> argparse.ArgumentParser:
 
@@ -60,6 +64,14 @@ def create_parser() -> argparse.ArgumentParser:
         required=False,
         type=int
     )
+    parser.add_argument(
+        "-p", "--packed",
+        help="Append reads to one data and one parity file per read session "
+        "(plus an index), instead of writing two files per read. "
+        "See append_packed_read",
+        required=False,
+        action="store_true",
+    )
     return parser
 # Start byte/ byte swap?
 #
@@ -175,6 +187,36 @@ def prepare_paths(input_path: str) -> Tuple[Path, Path]:
 
     return (Path(path, file_name) for path in new_paths)
 
+def append_packed_read(input_path: str, data: bytes, parity: bytes) -> None:
+    """
+    Expects path of form: .../1
+    Appends data and parity of read 1 as fixed size records to
+    .../data_reads.bin and .../parity_reads.bin
+    Then appends a line "1 <data bytes> <parity bytes>" to .../reads.idx
+    Records after the last indexed read (left by an interrupted readout)
+    are overwritten
+    """
+    given_path = Path(input_path)
+    base_path = Path(*given_path.parts[:-1])
+    base_path.mkdir(parents=True, exist_ok=True)
+
+    index_path = Path(base_path, PACKED_INDEX_FILE)
+    read_count = 0
+    if index_path.exists():
+        with open(index_path, mode="r") as f:
+            read_count = len([line for line in f if line.strip()])
+
+    for file_name, record in [
+        (PACKED_DATA_FILE, data), (PACKED_PARITY_FILE, parity)
+    ]:
+        with open(Path(base_path, file_name), mode="ab") as f:
+            f.truncate(read_count * len(record))
+            f.write(record)
+
+    with open(index_path, mode="a") as f:
+        f.write(f"{given_path.parts[-1]} {len(data)} {len(parity)}\n")
+
+
 def read_content(args: Any) -> None:
     with ExitStack() as stack:
         # port = pyftdi.serialext.serial_for_url('ftdi://ftdi:2232:210183A89AC3/2 ', baudrate=9600, parity=serial.PARITY_EVEN)
@@ -213,7 +255,12 @@ def read_content(args: Any) -> None:
             data += temp_data
             parity += temp_parity.hex()[1]
 
-        if args["output_path"] is not None:
+        if args["output_path"] is not None and args["packed"]:
+            print(args["output_path"])
+            append_packed_read(
+                args["output_path"], data, bytes.fromhex(parity)
+            )
+        elif args["output_path"] is not None:
             data_path, parity_path = prepare_paths(args["output_path"])
             print(data_path)
             with open(data_path, mode="wb") as f:
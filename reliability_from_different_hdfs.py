@@ -6,6 +6,7 @@ import h5py
 import numpy as np
 
 from hdf5_wrapper.experiment_hdf5 import Experiment
+from hdf5_wrapper.read_cache import ReadCache
 from hdf5_wrapper.stat_functions import reliability
 
 
@@ -47,6 +48,13 @@ def create_argparser() -> argparse.ArgumentParser:
         type=Path,
         required=True
     )
+    parser.add_argument(
+        "--read_cache_dir",
+        help="Directory of an on-disk cache of decoded reads " \
+        "(see hdf5_wrapper/read_cache.py). No cache is used if not given",
+        type=Path,
+        default=None
+    )
 
     return parser
 
@@ -55,6 +63,7 @@ def unpack_from_hdf5(
     path: Path,
     filter_even_stripes: bool = False,
     filter_uneven_stripes: bool = False,
+    read_cache: ReadCache = None,
 ) -> Experiment:
     """
     Opens hdf5 and converts it to Experiment hdf5 wrapper class
@@ -65,6 +74,7 @@ def unpack_from_hdf5(
             f.attrs["commit"],
             filter_even_stripes=filter_even_stripes,
             filter_uneven_stripes=filter_uneven_stripes,
+            read_cache=read_cache,
         )
 
     return experiment
@@ -98,7 +108,7 @@ def iter_and_calc_reliabilities(
                 )
 
                 target_reads = target_bram.read_sessions[read_session_name].data_reads
-                reads = [reference_read] + target_reads[:-1]
+                reads = [reference_read] + list(target_reads[:-1])
                 if reads[0] is not reference_read:
                     raise Exception("Not good")
                 if len(reads) != 100:
@@ -112,8 +122,16 @@ def iter_and_calc_reliabilities(
 
 def main(arg_dict: dict) -> None:
 
-    reference_exp = unpack_from_hdf5(arg_dict["reference_file"])
-    target_exp = unpack_from_hdf5(arg_dict["target_file"])
+    if arg_dict["read_cache_dir"] is None:
+        read_cache = None
+    else:
+        read_cache = ReadCache(arg_dict["read_cache_dir"])
+    reference_exp = unpack_from_hdf5(
+        arg_dict["reference_file"], read_cache=read_cache
+    )
+    target_exp = unpack_from_hdf5(
+        arg_dict["target_file"], read_cache=read_cache
+    )
 
     result_dict =iter_and_calc_reliabilities(
         reference_experiment=reference_exp,
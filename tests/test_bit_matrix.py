@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+import numpy.testing as nptest
+from hdf5_wrapper import bit_matrix
+from hdf5_wrapper.bit_matrix import (
+    BitCountAccumulator,
+    bit_one_counts,
+    last_change_idxs,
+    row_hamming_weights,
+    transpose_bits,
+)
+
+
+class TestBitMatrix(unittest.TestCase):
+    rng = np.random.default_rng(1337)
+    matrix = rng.integers(0, 256, (300, 16), dtype=np.uint8)
+
+    def test_bit_one_counts(self) -> None:
+        expected = np.unpackbits(self.matrix, axis=1).sum(axis=0)
+        nptest.assert_array_equal(bit_one_counts(self.matrix), expected)
+
+        # Result has to be independent of the chunking
+        default_chunk_rows = bit_matrix.UNPACK_CHUNK_ROWS
+        try:
+            bit_matrix.UNPACK_CHUNK_ROWS = 7
+            nptest.assert_array_equal(bit_one_counts(self.matrix), expected)
+        finally:
+            bit_matrix.UNPACK_CHUNK_ROWS = default_chunk_rows
+
+    def test_row_hamming_weights(self) -> None:
+        expected = np.unpackbits(self.matrix, axis=1).sum(axis=1)
+        nptest.assert_array_equal(
+            row_hamming_weights(self.matrix), expected
+        )
+
+    def test_last_change_idxs(self) -> None:
+        matrix = np.array(
+            [[0b1010_0000], [0b1000_0000], [0b1100_0000], [0b1100_0000]],
+            dtype=np.uint8,
+        )
+        nptest.assert_array_equal(
+            last_change_idxs(matrix), np.array([0, 2, 1, 0, 0, 0, 0, 0])
+        )
+        nptest.assert_array_equal(
+            last_change_idxs(matrix[:1]), np.zeros(8, dtype=np.int64)
+        )
+
+        # Compare with a straightforward loop over chronological rows
+        expected = np.zeros(16 * 8, dtype=np.int64)
+        bits = np.unpackbits(self.matrix, axis=1)
+        for row_idx in range(1, len(bits)):
+            expected[bits[row_idx] != bits[row_idx - 1]] = row_idx
+        nptest.assert_array_equal(last_change_idxs(self.matrix), expected)
+
+    def test_transpose_bits(self) -> None:
+        for row_count in [300, 13, 0]:
+            bits = np.unpackbits(self.matrix[:row_count], axis=1)
+            transposed = transpose_bits(self.matrix[:row_count])
+            self.assertEqual(
+                transposed.shape, (16 * 8, (row_count + 7) // 8)
+            )
+            nptest.assert_array_equal(
+                np.unpackbits(transposed, axis=1, count=row_count), bits.T
+            )
+        nptest.assert_array_equal(
+            BitCountAccumulator.from_bit_transposed(
+                transpose_bits(self.matrix[:13]), 13
+            ).one_counts,
+            bit_one_counts(self.matrix[:13]),
+        )
+
+    def test_bit_count_accumulator(self) -> None:
+        accumulator = BitCountAccumulator.empty(16 * 8)
+        for chunk_start in range(0, len(self.matrix), 70):
+            accumulator.update(self.matrix[chunk_start:chunk_start + 70])
+        self.assertEqual(accumulator.read_count, 300)
+        self.assertEqual(accumulator.one_counts.dtype, np.uint32)
+        nptest.assert_array_equal(
+            accumulator.one_counts, bit_one_counts(self.matrix)
+        )
+
+        # Merges are weighted by the number of rows
+        merged = BitCountAccumulator.from_matrix(
+            self.matrix[:10]
+        ) + BitCountAccumulator.from_matrix(self.matrix[10:])
+        nptest.assert_array_equal(
+            merged.probabilities,
+            np.unpackbits(self.matrix, axis=1).mean(axis=0),
+        )
+
+        with self.assertRaises(ValueError):
+            accumulator.update(self.matrix[:, :8])
+        with self.assertRaises(ValueError):
+            _ = BitCountAccumulator.empty(8).probabilities
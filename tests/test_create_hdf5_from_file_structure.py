@@ -0,0 +1,359 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import h5py
+import numpy as np
+import numpy.testing as nptest
+
+import create_hdf5_from_file_structure
+from reading.read_bram_ftdi import append_packed_read
+from create_hdf5_from_file_structure import ReadIngest
+from hdf5_wrapper.experiment_hdf5 import (
+    BITSTREAM_STORE,
+    BramBlock,
+    ReadSession,
+    bit_transposed_name,
+)
+
+
+class TestCreateHdf5FromFileStructure(unittest.TestCase):
+    session_name = "previous_value_00_t=0"
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = Path(self.temp_dir.name, "experiment")
+        self.rng = np.random.default_rng(1337)
+        self.matrices = dict()
+        for board in ["board0", "board1"]:
+            for bram in ["RAMB36_X0Y0", "RAMB36_X0Y1"]:
+                self.add_session(board, "pblock_1", bram, 23)
+        with open(Path(self.root_path, "meta_data.json"), "w") as f:
+            json.dump({"experiment": "test"}, f)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def add_session(
+        self, board: str, pblock: str, bram: str, read_count: int
+    ) -> None:
+        """
+        Writes reads (one file per read) and temperatures of a session
+        """
+        session_path = Path(
+            self.root_path, "boards", board, pblock, bram, self.session_name
+        )
+        for dataset_name, read_nbytes in [
+            ("data_reads", 64), ("parity_reads", 8)
+        ]:
+            matrix = self.rng.integers(
+                0, 256, (read_count, read_nbytes), dtype=np.uint8
+            )
+            self.matrices[(board, bram, dataset_name)] = matrix
+            Path(session_path, dataset_name).mkdir(parents=True)
+            for idx, read in enumerate(matrix):
+                Path(session_path, dataset_name, str(idx)).write_bytes(
+                    read.tobytes()
+                )
+        Path(session_path, "temperature.txt").write_text(
+            "# PL PS\n" + "40.0 41.0\n" * read_count
+        )
+
+    def create_hdf5(
+        self, ingest: ReadIngest, mode: str = "w", include_bs: bool = False
+    ) -> Path:
+        path = Path(self.temp_dir.name, "experiment.hdf5")
+        with h5py.File(path, mode) as f:
+            create_hdf5_from_file_structure.add_boards_group(
+                Path(self.root_path, "boards"), f, include_bs, ingest
+            )
+            ingest.write()
+            create_hdf5_from_file_structure.derive_read_session_names(f)
+        return path
+
+    def test_ingest(self) -> None:
+        path = self.create_hdf5(ReadIngest(threads=3, chunk_reads=5))
+        with h5py.File(path, "r") as f:
+            self.assertEqual(
+                [name.decode() for name in f["read_session_names"]],
+                [self.session_name],
+            )
+            for (board, bram, dataset_name), matrix in self.matrices.items():
+                dataset = f[
+                    f"boards/{board}/pblock_1/{bram}/{self.session_name}/"
+                    f"{dataset_name}"
+                ]
+                self.assertEqual(dataset.dtype, np.uint8)
+                self.assertEqual(dataset.chunks, (5, matrix.shape[1]))
+                nptest.assert_array_equal(dataset[()], matrix)
+
+            read_session = ReadSession.from_hdf5(
+                f[f"boards/board1/pblock_1/RAMB36_X0Y1/{self.session_name}"]
+            )
+        nptest.assert_array_equal(
+            read_session.data_reads.matrix,
+            self.matrices[("board1", "RAMB36_X0Y1", "data_reads")],
+        )
+        self.assertEqual(len(read_session.temperatures), 23)
+
+    def test_bit_transposed(self) -> None:
+        path = self.create_hdf5(
+            ReadIngest(
+                threads=2,
+                chunk_reads=4,
+                compression="gzip",
+                bit_transposed=True,
+            )
+        )
+        session_path = (
+            f"boards/board0/pblock_1/RAMB36_X0Y0/{self.session_name}"
+        )
+        with h5py.File(path, "r") as f:
+            for dataset_name in ["data_reads", "parity_reads"]:
+                matrix = self.matrices[
+                    ("board0", "RAMB36_X0Y0", dataset_name)
+                ]
+                self.assertEqual(
+                    f[f"{session_path}/{dataset_name}"].compression, "gzip"
+                )
+                transposed = f[
+                    f"{session_path}/{bit_transposed_name(dataset_name)}"
+                ]
+                self.assertEqual(transposed.compression, "gzip")
+                self.assertEqual(transposed.attrs["read_count"], 23)
+                nptest.assert_array_equal(
+                    np.unpackbits(transposed[()], axis=1, count=23),
+                    np.unpackbits(matrix, axis=1).T,
+                )
+
+        # Companions are rewritten if reads are appended
+        new_read = self.rng.integers(0, 256, 64, dtype=np.uint8)
+        Path(self.root_path, session_path, "data_reads/23").write_bytes(
+            new_read.tobytes()
+        )
+        self.create_hdf5(ReadIngest(threads=2, chunk_reads=4), mode="a")
+        with h5py.File(path, "r") as f:
+            group = f[session_path]
+            self.assertEqual(
+                group[bit_transposed_name("data_reads")].attrs["read_count"],
+                24,
+            )
+            counts = ReadSession.bit_counts_from_hdf5(group)
+        expected_bits = np.unpackbits(
+            np.concatenate(
+                [
+                    self.matrices[("board0", "RAMB36_X0Y0", "data_reads")],
+                    new_read[np.newaxis],
+                ]
+            ),
+            axis=1,
+        )
+        self.assertEqual(counts.read_count, 24)
+        nptest.assert_array_equal(
+            counts.one_counts, expected_bits.sum(axis=0)
+        )
+
+    def test_bitstreams(self) -> None:
+        bitstreams = dict()
+        for bram in ["RAMB36_X0Y0", "RAMB36_X0Y1"]:
+            bs_path = Path(
+                self.root_path, "boards/board0/pblock_1", bram, "bs"
+            )
+            bs_path.mkdir()
+            bitstreams[bram] = {
+                # Full bitstreams are shared by the BRAMs of a pblock
+                "ff": b"\xff" * 100,
+                "00": b"\x00" * 100,
+                "partial_bram_bs": bram.encode(),
+            }
+            Path(bs_path, "read_pblock_1_ff.bit").write_bytes(b"\xff" * 100)
+            Path(bs_path, "read_pblock_1_00.bit").write_bytes(b"\x00" * 100)
+            Path(bs_path, f"{bram}_partial_bram_bs.bit").write_bytes(
+                bram.encode()
+            )
+
+        path = self.create_hdf5(
+            ReadIngest(threads=2, chunk_reads=4), include_bs=True
+        )
+        with h5py.File(path, "r") as f:
+            self.assertEqual(len(f[BITSTREAM_STORE]), 4)
+            self.assertEqual(
+                [name.decode() for name in f["read_session_names"]],
+                [self.session_name],
+            )
+            for bram, expected in bitstreams.items():
+                bram_group = f[f"boards/board0/pblock_1/{bram}"]
+                self.assertEqual(
+                    BramBlock.bitstreams_from_hdf5(bram_group), expected
+                )
+                self.assertEqual(
+                    BramBlock.bitstreams_from_hdf5(bram_group, ["ff"]),
+                    {"ff": expected["ff"]},
+                )
+            self.assertEqual(
+                BramBlock.bitstreams_from_hdf5(
+                    f["boards/board1/pblock_1/RAMB36_X0Y0"]
+                ),
+                dict(),
+            )
+
+        # Bitstreams stored as attributes (older files) are read as well
+        with h5py.File(path, "a") as f:
+            bram_group = f["boards/board1/pblock_1/RAMB36_X0Y0"]
+            bram_group.create_group("bitstreams").attrs["ff"] = np.void(
+                b"\xff" * 100
+            )
+            self.assertEqual(
+                BramBlock.bitstreams_from_hdf5(bram_group),
+                {"ff": b"\xff" * 100},
+            )
+
+    def test_packed(self) -> None:
+        # Reads of a session written with read_bram_ftdi.py --packed
+        session_path = Path(
+            self.root_path,
+            "boards/board1/pblock_1/RAMB36_X0Y2",
+            self.session_name,
+        )
+
+        def add_packed_reads(first_read: int, read_count: int) -> None:
+            for dataset_name, read_nbytes in [
+                ("data_reads", 64), ("parity_reads", 8)
+            ]:
+                key = ("board1", "RAMB36_X0Y2", dataset_name)
+                self.matrices[key] = np.concatenate(
+                    [
+                        self.matrices.get(
+                            key, np.empty((0, read_nbytes), dtype=np.uint8)
+                        ),
+                        self.rng.integers(
+                            0, 256, (read_count, read_nbytes), dtype=np.uint8
+                        ),
+                    ]
+                )
+            for idx in range(first_read, first_read + read_count):
+                append_packed_read(
+                    str(Path(session_path, str(idx))),
+                    self.matrices[
+                        ("board1", "RAMB36_X0Y2", "data_reads")
+                    ][idx].tobytes(),
+                    self.matrices[
+                        ("board1", "RAMB36_X0Y2", "parity_reads")
+                    ][idx].tobytes(),
+                )
+            Path(session_path, "temperature.txt").write_text(
+                "40.0\n" * (first_read + read_count)
+            )
+
+        add_packed_reads(0, 10)
+        path = self.create_hdf5(ReadIngest(threads=2, chunk_reads=4))
+        add_packed_reads(10, 3)
+        self.create_hdf5(ReadIngest(threads=2, chunk_reads=4), mode="a")
+
+        with h5py.File(path, "r") as f:
+            for (board, bram, dataset_name), matrix in self.matrices.items():
+                dataset = f[
+                    f"boards/{board}/pblock_1/{bram}/{self.session_name}/"
+                    f"{dataset_name}"
+                ]
+                nptest.assert_array_equal(dataset[()], matrix)
+        self.assertEqual(
+            len(self.matrices[("board1", "RAMB36_X0Y2", "data_reads")]), 13
+        )
+
+    def test_reads_of_different_size(self) -> None:
+        Path(
+            self.root_path,
+            "boards/board0/pblock_1/RAMB36_X0Y0",
+            self.session_name,
+            "data_reads/7",
+        ).write_bytes(b"\x00" * 63)
+        with self.assertRaises(ValueError):
+            self.create_hdf5(ReadIngest(threads=2, chunk_reads=4))
+
+    def test_no_reads_after_error(self) -> None:
+        corrupt_path = Path(
+            self.root_path,
+            "boards/board0/pblock_1/RAMB36_X0Y0",
+            self.session_name,
+            "data_reads/7",
+        )
+        corrupt_path.write_bytes(b"\x00" * 63)
+        opened_paths = list()
+
+        def recording_open(file, *args, **kwargs):
+            opened_paths.append(Path(file))
+            return open(file, *args, **kwargs)
+
+        ingest = ReadIngest(threads=1, chunk_reads=4)
+        path = Path(self.temp_dir.name, "experiment.hdf5")
+        with h5py.File(path, "w") as f:
+            create_hdf5_from_file_structure.add_boards_group(
+                Path(self.root_path, "boards"), f, False, ingest
+            )
+            # The corrupt directory is read first, all others are queued
+            ingest.jobs.sort(key=lambda job: job[0] != corrupt_path.parent)
+            with mock.patch.object(
+                create_hdf5_from_file_structure,
+                "open",
+                side_effect=recording_open,
+                create=True,
+            ):
+                with self.assertRaises(ValueError):
+                    ingest.write()
+        self.assertIn(corrupt_path, opened_paths)
+        self.assertEqual(opened_paths[-1], corrupt_path)
+
+    def test_append(self) -> None:
+        path = self.create_hdf5(ReadIngest(threads=2, chunk_reads=4))
+
+        # New reads of an existing BRAM, a new BRAM and a new board
+        session_path = Path(
+            self.root_path,
+            "boards/board0/pblock_1/RAMB36_X0Y0",
+            self.session_name,
+        )
+        for dataset_name in ["data_reads", "parity_reads"]:
+            matrix = self.matrices[("board0", "RAMB36_X0Y0", dataset_name)]
+            new_reads = self.rng.integers(
+                0, 256, (6, matrix.shape[1]), dtype=np.uint8
+            )
+            for idx, read in enumerate(new_reads, start=len(matrix)):
+                Path(session_path, dataset_name, str(idx)).write_bytes(
+                    read.tobytes()
+                )
+            self.matrices[("board0", "RAMB36_X0Y0", dataset_name)] = (
+                np.concatenate([matrix, new_reads])
+            )
+        Path(session_path, "temperature.txt").write_text(
+            "# PL PS\n" + "40.0 41.0\n" * 29
+        )
+        self.add_session("board0", "pblock_1", "RAMB36_X0Y2", 5)
+        self.add_session("board2", "pblock_1", "RAMB36_X0Y0", 7)
+
+        # Reads that were already ingested aren't read again
+        Path(session_path, "data_reads/0").write_bytes(
+            np.invert(
+                self.matrices[("board0", "RAMB36_X0Y0", "data_reads")][0]
+            ).tobytes()
+        )
+
+        self.create_hdf5(ReadIngest(threads=2, chunk_reads=4), mode="a")
+        with h5py.File(path, "r") as f:
+            for (board, bram, dataset_name), matrix in self.matrices.items():
+                dataset = f[
+                    f"boards/{board}/pblock_1/{bram}/{self.session_name}/"
+                    f"{dataset_name}"
+                ]
+                nptest.assert_array_equal(dataset[()], matrix)
+            self.assertEqual(
+                len(
+                    f[
+                        "boards/board0/pblock_1/RAMB36_X0Y0/"
+                        f"{self.session_name}/temperature"
+                    ]
+                ),
+                29,
+            )
+            self.assertEqual(len(f["read_session_names"]), 1)
@@ -1,10 +1,35 @@
+import tempfile
 import unittest
 import numpy as np
 import numpy.testing as nptest
 import h5py
 from pathlib import Path
 from hdf5_wrapper import Experiment
-from hdf5_wrapper.experiment_hdf5 import Read
+from hdf5_wrapper.bit_matrix import transpose_bits
+from hdf5_wrapper.experiment_hdf5 import (
+    BramBlock,
+    ConcatenatedReads,
+    HDF5Source,
+    LazyReadSession,
+    Read,
+    ReadSession,
+    PackedReads,
+    Selection,
+    bit_columns_from_hdf5,
+    bit_transposed_name,
+)
+from hdf5_wrapper.intermediate_cache import shared_intermediates
+from hdf5_wrapper.session_cache import SessionCache
+from hdf5_wrapper.stats import (
+    BitAliasingStatistic,
+    BitFlipChanceStatistic,
+    CombinedStableBitStatistic,
+    EntropyStatistic,
+    ReliabilityStatistic,
+    UniformityStatistic,
+    UniquenessStatistic,
+)
+from hdf5_wrapper.utility import PlotSettings
 
 
 @unittest.skip("Test is currently outdated")
@@ -142,3 +167,671 @@ class TestRead(unittest.TestCase):
             [read.entropy for read in self.reads_heterogene],
             [0.9182958340544894, 0.9182958340544894],
         )
+
+
+class TestPackedReads(unittest.TestCase):
+    reads = [
+        Read.from_raw(b"\xff\x00\xff"),
+        Read.from_raw(b"\x00\xff\x00"),
+        Read.from_raw(b"\xf0\x0f\xf0"),
+    ]
+
+    def test_from_reads(self) -> None:
+        packed_reads = PackedReads.from_reads(self.reads)
+        self.assertEqual(packed_reads.matrix.shape, (3, 3))
+        self.assertEqual(len(packed_reads), 3)
+        self.assertEqual(packed_reads.bit_count, 24)
+        self.assertIs(PackedReads.from_reads(packed_reads), packed_reads)
+
+    def test_read_views(self) -> None:
+        packed_reads = PackedReads.from_reads(self.reads)
+        for read, packed_read in zip(self.reads, packed_reads):
+            self.assertEqual(read.raw_read, packed_read.raw_read)
+            nptest.assert_array_equal(
+                read.bits_flattened, packed_read.bits_flattened
+            )
+        self.assertEqual(packed_reads[-1].raw_read, b"\xf0\x0f\xf0")
+        self.assertEqual(len(packed_reads[1:]), 2)
+        nptest.assert_array_equal(
+            packed_reads.bits,
+            np.array([read.bits_flattened for read in self.reads]),
+        )
+
+    def test_merge(self) -> None:
+        packed_reads = PackedReads.from_reads(self.reads)
+        merged = packed_reads + packed_reads[:1]
+        self.assertEqual(len(merged), 4)
+        self.assertEqual(merged[3].raw_read, b"\xff\x00\xff")
+
+    def test_filter_stripe(self) -> None:
+        raw_read = bytes(range(4)) + bytes(range(16)) * 2 + bytes(range(4))
+        read = Read.from_raw(raw_read)
+        even_stripes = read.filter_stripe(filter_even_stripes=True)
+        uneven_stripes = read.filter_stripe(filter_even_stripes=False)
+        self.assertEqual(
+            even_stripes.raw_read,
+            bytes(range(4)) + bytes(range(8, 16)) * 2 + bytes(range(4)),
+        )
+        self.assertEqual(uneven_stripes.raw_read, bytes(range(8)) * 2)
+
+    def test_filter_stripes(self) -> None:
+        matrix = np.random.default_rng(0).integers(
+            0, 256, (3, 4096), dtype=np.uint8
+        )
+        packed_reads = PackedReads(matrix)
+        self.assertIs(packed_reads.filter_stripes(), packed_reads)
+        for filter_even_stripes in [True, False]:
+            filtered = packed_reads.filter_stripes(
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=not filter_even_stripes,
+            )
+            expected = [
+                Read.from_raw(row.tobytes(), remove_signature_bits=True)
+                .filter_stripe(filter_even_stripes)
+                .packed
+                for row in matrix
+            ]
+            nptest.assert_array_equal(filtered.matrix, expected)
+
+    def test_from_hdf5_dataset(self) -> None:
+        matrix = np.random.default_rng(0).integers(
+            0, 256, (6, 8), dtype=np.uint8
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with h5py.File(Path(temp_dir, "reads.hdf5"), "w") as f:
+                # Reads are stored as opaque (np.void) rows
+                dataset = f.create_dataset(
+                    "reads",
+                    data=np.array([np.void(row.tobytes()) for row in matrix]),
+                )
+                packed_reads = PackedReads.from_hdf5_dataset(dataset)
+                packed_reads_range = PackedReads.from_hdf5_dataset(
+                    dataset, slice(1, None, 2)
+                )
+                empty_packed_reads = PackedReads.from_hdf5_dataset(
+                    dataset, slice(0, 0)
+                )
+        nptest.assert_array_equal(packed_reads.matrix, matrix)
+        self.assertEqual(packed_reads.matrix.dtype, np.uint8)
+        nptest.assert_array_equal(packed_reads_range.matrix, matrix[1::2])
+        self.assertEqual(empty_packed_reads.matrix.shape, (0, 8))
+
+
+class TestConcatenatedReads(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.parts = [
+            PackedReads(rng.integers(0, 256, (rows, 4), dtype=np.uint8))
+            for rows in [3, 1, 4]
+        ]
+        self.matrix = np.concatenate([part.matrix for part in self.parts])
+        self.reads = ConcatenatedReads(self.parts)
+
+    def test_indexing(self) -> None:
+        self.assertEqual(len(self.reads), 8)
+        self.assertEqual(self.reads.bit_count, 32)
+        for idx in range(-8, 8):
+            nptest.assert_array_equal(self.reads[idx].packed, self.matrix[idx])
+        self.assertTrue(
+            np.shares_memory(self.reads[5].packed, self.parts[2].matrix)
+        )
+        with self.assertRaises(IndexError):
+            self.reads[8]
+        nptest.assert_array_equal(
+            [read.packed for read in self.reads], self.matrix
+        )
+
+    def test_slicing(self) -> None:
+        # Slices inside of one part are views
+        view = self.reads[4:7]
+        self.assertTrue(np.shares_memory(view.matrix, self.parts[2].matrix))
+        nptest.assert_array_equal(view.matrix, self.matrix[4:7])
+        for idx in [
+            slice(1, 6),
+            slice(None, None, 3),
+            slice(None, None, -2),
+            slice(5, 5),
+        ]:
+            nptest.assert_array_equal(
+                self.reads[idx].matrix, self.matrix[idx]
+            )
+
+    def test_iter_chunks(self) -> None:
+        chunks = list(self.reads.iter_chunks(2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1, 1, 2, 2])
+        nptest.assert_array_equal(
+            np.concatenate([chunk.matrix for chunk in chunks]), self.matrix
+        )
+        for chunk in chunks:
+            self.assertTrue(
+                any(
+                    np.shares_memory(chunk.matrix, part.matrix)
+                    for part in self.parts
+                )
+            )
+
+    def test_merge(self) -> None:
+        merged = ConcatenatedReads.merge_from_list(
+            [self.reads, self.parts[0], self.reads]
+        )
+        self.assertEqual(len(merged.parts), 7)
+        nptest.assert_array_equal(
+            merged.matrix,
+            np.concatenate([self.matrix, self.parts[0].matrix, self.matrix]),
+        )
+        nptest.assert_array_equal(
+            PackedReads.from_reads(merged).matrix, merged.matrix
+        )
+
+        read_session = ReadSession.merge_from_list(
+            [ReadSession(part, part, [0.0] * len(part)) for part in self.parts]
+        )
+        self.assertIsInstance(read_session.data_reads, ConcatenatedReads)
+        self.assertTrue(
+            all(
+                merged_part is part
+                for merged_part, part in zip(
+                    read_session.data_reads.parts, self.parts
+                )
+            )
+        )
+        self.assertEqual(read_session.data_reads.nbytes, self.matrix.nbytes)
+
+
+class TestLazyReadSession(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name, "experiment.hdf5")
+        rng = np.random.default_rng(0)
+        # Stripe filters keep 16 of the 64 bytes
+        self.data_matrix = rng.integers(0, 256, (5, 64), dtype=np.uint8)
+        self.parity_matrix = rng.integers(0, 256, (5, 2), dtype=np.uint8)
+        with h5py.File(self.path, "w") as f:
+            for name in ["session_a", "session_b"]:
+                group = f.create_group(f"RAMB36_X0Y0/{name}")
+                # Reads are stored as opaque (np.void) rows
+                group["data_reads"] = np.array(
+                    [np.void(row.tobytes()) for row in self.data_matrix]
+                )
+                group["parity_reads"] = np.array(
+                    [np.void(row.tobytes()) for row in self.parity_matrix]
+                )
+                group["temperature"] = np.arange(5, dtype=np.float64)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def lazy_read_session(
+        self, session_cache: SessionCache, name: str
+    ) -> LazyReadSession:
+        return LazyReadSession.from_hdf5_source(
+            HDF5Source(str(self.path), f"/RAMB36_X0Y0/{name}"), session_cache
+        )
+
+    def test_decode_on_access(self) -> None:
+        with SessionCache() as session_cache:
+            read_session = self.lazy_read_session(session_cache, "session_a")
+            self.assertEqual(len(session_cache.decoded_values), 0)
+
+            nptest.assert_array_equal(
+                read_session.data_reads.matrix, self.data_matrix
+            )
+            # Only data reads were decoded
+            self.assertEqual(len(session_cache.decoded_values), 1)
+            self.assertIs(read_session.data_reads, read_session.data_reads)
+
+            nptest.assert_array_equal(
+                read_session.parity_reads.matrix, self.parity_matrix
+            )
+            self.assertEqual(read_session.temperatures, list(range(5)))
+
+            with h5py.File(self.path, "r") as f:
+                eager_read_session = ReadSession.from_hdf5(
+                    f["RAMB36_X0Y0/session_a"]
+                )
+            nptest.assert_array_equal(
+                read_session.data_reads.matrix,
+                eager_read_session.data_reads.matrix,
+            )
+
+    def test_merge(self) -> None:
+        with SessionCache() as session_cache:
+            read_sessions = [
+                self.lazy_read_session(session_cache, name)
+                for name in ["session_a", "session_b"]
+            ]
+            merged = ReadSession.merge_from_list(read_sessions)
+            self.assertIsInstance(merged, LazyReadSession)
+            self.assertEqual(len(session_cache.decoded_values), 0)
+            nptest.assert_array_equal(
+                merged.data_reads.matrix,
+                np.concatenate([self.data_matrix, self.data_matrix]),
+            )
+            self.assertEqual(len(merged.temperatures), 10)
+
+    def test_filter_stripes(self) -> None:
+        with SessionCache() as session_cache:
+            read_session = self.lazy_read_session(session_cache, "session_a")
+            filtered = read_session.filter_stripes()
+            # Parity reads and temperatures are only cached once
+            self.assertIs(filtered.parity_reads, read_session.parity_reads)
+            self.assertIs(filtered.temperatures, read_session.temperatures)
+            self.assertEqual(
+                [key[0] for key in session_cache.decoded_values],
+                [read_session, read_session],
+            )
+            nptest.assert_array_equal(
+                filtered.data_reads.matrix, self.data_matrix
+            )
+
+    def test_merged_memory_usage(self) -> None:
+        nbytes = self.data_matrix.nbytes
+        with SessionCache() as session_cache:
+            merged = ReadSession.merge_from_list(
+                [
+                    self.lazy_read_session(session_cache, name)
+                    for name in ["session_a", "session_b"]
+                ]
+            )
+            merged.data_reads
+            # Merged reads reference the cached matrices of their parts
+            self.assertEqual(len(session_cache.decoded_values), 3)
+            self.assertEqual(session_cache.memory_usage, 2 * nbytes)
+
+        # Evicted parts still count while merged reads reference them
+        with SessionCache(nbytes) as session_cache:
+            merged = ReadSession.merge_from_list(
+                [
+                    self.lazy_read_session(session_cache, name)
+                    for name in ["session_a", "session_b"]
+                ]
+            )
+            merged.data_reads
+            self.assertEqual(len(session_cache.decoded_values), 1)
+            self.assertEqual(session_cache.memory_usage, 2 * nbytes)
+
+    def test_eviction(self) -> None:
+        # Budget fits the data reads of a single read session
+        with SessionCache(self.data_matrix.nbytes) as session_cache:
+            read_session_a = self.lazy_read_session(session_cache, "session_a")
+            read_session_b = self.lazy_read_session(session_cache, "session_b")
+            data_reads_a = read_session_a.data_reads
+            read_session_b.data_reads
+            self.assertEqual(len(session_cache.decoded_values), 1)
+            self.assertEqual(
+                session_cache.memory_usage, self.data_matrix.nbytes
+            )
+            # Evicted values are decoded again
+            self.assertIsNot(read_session_a.data_reads, data_reads_a)
+            nptest.assert_array_equal(
+                read_session_a.data_reads.matrix, self.data_matrix
+            )
+
+    def test_stored_bit_counts(self) -> None:
+        # Both read sessions have the same reads, only "session_a" has
+        # bit-transposed reads
+        with h5py.File(self.path, "a") as f:
+            group = f["RAMB36_X0Y0/session_a"]
+            for dataset_name, matrix in [
+                ("data_reads", self.data_matrix),
+                ("parity_reads", self.parity_matrix),
+            ]:
+                transposed_name = bit_transposed_name(dataset_name)
+                group[transposed_name] = transpose_bits(matrix)
+                group[transposed_name].attrs["read_count"] = 5
+            self.assertIsNotNone(ReadSession.from_hdf5(group).hdf5_source)
+            self.assertIsNone(
+                ReadSession.from_hdf5(
+                    f["RAMB36_X0Y0/session_b"]
+                ).hdf5_source
+            )
+
+        statistic_types = [
+            BitFlipChanceStatistic,
+            BitAliasingStatistic,
+            CombinedStableBitStatistic,
+        ]
+        with tempfile.TemporaryDirectory() as plot_dir:
+            plot_settings = PlotSettings(Path(plot_dir), False, None)
+            with SessionCache() as session_cache, shared_intermediates():
+                read_session = self.lazy_read_session(
+                    session_cache, "session_a"
+                ).filter_stripes(filter_uneven_stripes=True)
+                stats = [
+                    statistic_type(plot_settings, read_session)
+                    for statistic_type in statistic_types
+                ]
+                # Counted from hdf5, so no reads were decoded
+                self.assertEqual(len(session_cache.decoded_values), 0)
+
+                expected_read_session = self.lazy_read_session(
+                    session_cache, "session_b"
+                ).filter_stripes(filter_uneven_stripes=True)
+                for stat, statistic_type in zip(stats, statistic_types):
+                    expected = statistic_type(
+                        plot_settings, expected_read_session
+                    )
+                    nptest.assert_array_equal(
+                        stat.data_stats, expected.data_stats
+                    )
+                    nptest.assert_array_equal(
+                        stat.parity_stats, expected.parity_stats
+                    )
+                # Unfiltered and filtered data reads and parity reads
+                self.assertEqual(len(session_cache.decoded_values), 3)
+
+    def test_streamed_reads(self) -> None:
+        class AllReadsUniformityStatistic(UniformityStatistic):
+            stat_func_kwargs = {"only_use_first_element": False}
+
+        statistic_types = [
+            BitFlipChanceStatistic,
+            EntropyStatistic,
+            ReliabilityStatistic,
+            UniformityStatistic,
+            AllReadsUniformityStatistic,
+        ]
+        with tempfile.TemporaryDirectory() as plot_dir:
+            plot_settings = PlotSettings(Path(plot_dir), False, None)
+            # Reads of both read sessions are larger than the threshold
+            with SessionCache(stream_threshold=0) as session_cache:
+                read_session = self.lazy_read_session(
+                    session_cache, "session_a"
+                ).filter_stripes(filter_even_stripes=True)
+                chunks = list(read_session.streamed_reads("data_reads"))
+                nptest.assert_array_equal(
+                    ConcatenatedReads.merge_from_list(chunks).matrix,
+                    read_session.data_reads.matrix,
+                )
+                # Decoded reads aren't streamed
+                self.assertIsNone(read_session.streamed_reads("data_reads"))
+                session_cache.clear()
+
+                stats = [
+                    statistic_type(plot_settings, read_session)
+                    for statistic_type in statistic_types
+                ]
+                self.assertEqual(len(session_cache.decoded_values), 0)
+
+            with h5py.File(self.path, "r") as f:
+                eager_read_session = ReadSession.from_hdf5(
+                    f["RAMB36_X0Y0/session_a"], filter_even_stripes=True
+                )
+            for stat, statistic_type in zip(stats, statistic_types):
+                expected = statistic_type(plot_settings, eager_read_session)
+                nptest.assert_allclose(stat.data_stats, expected.data_stats)
+                nptest.assert_allclose(
+                    stat.parity_stats, expected.parity_stats
+                )
+
+    def test_first_reads(self) -> None:
+        with tempfile.TemporaryDirectory() as plot_dir:
+            plot_settings = PlotSettings(Path(plot_dir), False, None)
+            with SessionCache() as session_cache:
+                read_sessions = [
+                    LazyReadSession.from_hdf5_source(
+                        HDF5Source(
+                            str(self.path),
+                            f"/RAMB36_X0Y0/{name}",
+                            read_range=(2, None, None),
+                        ),
+                        session_cache,
+                    )
+                    for name in ["session_a", "session_b"]
+                ]
+                nptest.assert_array_equal(
+                    read_sessions[0].first_reads("data_reads").matrix,
+                    self.data_matrix[2:3],
+                )
+                stat = UniquenessStatistic(read_sessions, plot_settings)
+                # Only first reads were decoded
+                self.assertEqual(len(session_cache.decoded_values), 0)
+
+                expected = UniquenessStatistic(
+                    [
+                        ReadSession(
+                            read_session.data_reads,
+                            read_session.parity_reads,
+                            read_session.temperatures,
+                        )
+                        for read_session in read_sessions
+                    ],
+                    plot_settings,
+                )
+        nptest.assert_array_equal(stat.data_stats, expected.data_stats)
+        nptest.assert_array_equal(stat.parity_stats, expected.parity_stats)
+
+
+class TestSelection(unittest.TestCase):
+    read_session_names = ["session_a", "session_b"]
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name, "experiment.hdf5")
+        rng = np.random.default_rng(0)
+        with h5py.File(self.path, "w") as f:
+            f["read_session_names"] = [
+                name.encode() for name in self.read_session_names
+            ]
+            for board_name in ["board0", "board1"]:
+                board_group = f.create_group(f"boards/{board_name}")
+                for attr_name in [
+                    "fpga", "uart_sn", "programming_interface", "date"
+                ]:
+                    board_group.attrs[attr_name] = ""
+                board_group.attrs["board_name"] = board_name
+                for bram_path in [
+                    "pblock_1/RAMB36_X0Y0",
+                    "pblock_1/RAMB36_X0Y1",
+                    "pblock_2/RAMB36_X1Y0",
+                ]:
+                    for name in self.read_session_names:
+                        group = board_group.create_group(
+                            f"{bram_path}/{name}"
+                        )
+                        group["data_reads"] = rng.integers(
+                            0, 256, (10, 4096), dtype=np.uint8
+                        )
+                        group["parity_reads"] = rng.integers(
+                            0, 256, (10, 2), dtype=np.uint8
+                        )
+                        group["temperature"] = np.arange(10.0)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_default_selects_all(self) -> None:
+        with h5py.File(self.path, "r") as f:
+            experiment = Experiment.from_hdf5(f, "")
+        self.assertEqual(experiment.bram_count, 6)
+        self.assertEqual(
+            experiment.read_session_names, self.read_session_names
+        )
+        self.assertEqual(
+            len(experiment.read_sessions["session_a"].data_reads), 60
+        )
+
+    def test_containers(self) -> None:
+        selection = Selection(
+            boards=("board1",),
+            brams=("RAMB36_X0Y1",),
+            read_sessions=("session_b",),
+        )
+        with h5py.File(self.path, "r") as f:
+            experiment = Experiment.from_hdf5(f, "", selection=selection)
+        self.assertEqual(list(experiment.subcontainers), ["board1"])
+        board = experiment.subcontainers["board1"]
+        # pblock_2 has no selected bram blocks
+        self.assertEqual(list(board.subcontainers), ["pblock_1"])
+        self.assertEqual(
+            list(board.subcontainers["pblock_1"].subcontainers),
+            ["RAMB36_X0Y1"],
+        )
+        self.assertEqual(experiment.read_session_names, ["session_b"])
+        self.assertEqual(list(experiment.read_sessions), ["session_b"])
+
+    def test_read_range(self) -> None:
+        selection = Selection(
+            pblocks=("pblock_2",), read_range=slice(1, 8, 3)
+        )
+        with h5py.File(self.path, "r") as f:
+            experiment = Experiment.from_hdf5(f, "", selection=selection)
+            read_session_group = f[
+                "boards/board0/pblock_2/RAMB36_X1Y0/session_a"
+            ]
+            expected_data = read_session_group["data_reads"][1:8:3]
+            expected_parity = read_session_group["parity_reads"][1:8:3]
+        bram_block = (
+            experiment.subcontainers["board0"]
+            .subcontainers["pblock_2"]
+            .subcontainers["RAMB36_X1Y0"]
+        )
+        read_session = bram_block.read_sessions["session_a"]
+        nptest.assert_array_equal(
+            read_session.data_reads.matrix, expected_data
+        )
+        nptest.assert_array_equal(
+            read_session.parity_reads.matrix, expected_parity
+        )
+        self.assertEqual(read_session.temperatures, [1.0, 4.0, 7.0])
+        self.assertEqual(bram_block.hdf5_source.read_range, (1, 8, 3))
+
+        # Lazily loaded and reloaded read sessions have the same reads
+        with SessionCache() as session_cache:
+            lazy_experiment = Experiment.from_hdf5(
+                session_cache.file(self.path),
+                "",
+                session_cache=session_cache,
+                selection=selection,
+            )
+            nptest.assert_array_equal(
+                lazy_experiment.read_sessions["session_a"].data_reads.matrix,
+                experiment.read_sessions["session_a"].data_reads.matrix,
+            )
+        reloaded_bram_block = BramBlock.from_hdf5_source(
+            bram_block.hdf5_source,
+            bram_block.name,
+            bram_block.read_session_names,
+        )
+        nptest.assert_array_equal(
+            reloaded_bram_block.read_sessions["session_a"].data_reads.matrix,
+            expected_data,
+        )
+
+    def test_filter_stripes(self) -> None:
+        with h5py.File(self.path, "r") as f:
+            experiment = Experiment.from_hdf5(f, "")
+            filtered_experiments = [
+                Experiment.from_hdf5(f, "", filter_even_stripes=True),
+                Experiment.from_hdf5(f, "", filter_uneven_stripes=True),
+            ]
+        for filter_even_stripes, filtered_experiment in zip(
+            [True, False], filtered_experiments
+        ):
+            derived_experiment = experiment.filter_stripes(
+                filter_even_stripes=filter_even_stripes,
+                filter_uneven_stripes=not filter_even_stripes,
+            )
+            self.assertEqual(derived_experiment.bram_count, 6)
+            for name in self.read_session_names:
+                nptest.assert_array_equal(
+                    derived_experiment.read_sessions[name].data_reads.matrix,
+                    filtered_experiment.read_sessions[name].data_reads.matrix,
+                )
+            bram_block = (
+                derived_experiment.subcontainers["board0"]
+                .subcontainers["pblock_1"]
+                .subcontainers["RAMB36_X0Y0"]
+            )
+            self.assertEqual(
+                bram_block.hdf5_source,
+                filtered_experiment.subcontainers["board0"]
+                .subcontainers["pblock_1"]
+                .subcontainers["RAMB36_X0Y0"]
+                .hdf5_source,
+            )
+
+    def test_iter_chunks(self) -> None:
+        options = {"filter_even_stripes": True, "read_range": slice(1, 9)}
+        with h5py.File(self.path, "r") as f:
+            group = f["boards/board1/pblock_2/RAMB36_X1Y0/session_b"]
+            read_session = ReadSession.from_hdf5(group, **options)
+            streamed_chunks = list(
+                ReadSession.iter_hdf5_chunks(group, 3, **options)
+            )
+        chunks = list(read_session.iter_chunks(3))
+        self.assertEqual(
+            [len(chunk.data_reads) for chunk in chunks], [3, 3, 2]
+        )
+        for chunk, streamed_chunk in zip(chunks, streamed_chunks, strict=True):
+            nptest.assert_array_equal(
+                chunk.data_reads.matrix, streamed_chunk.data_reads.matrix
+            )
+            nptest.assert_array_equal(
+                chunk.parity_reads.matrix, streamed_chunk.parity_reads.matrix
+            )
+            self.assertEqual(chunk.temperatures, streamed_chunk.temperatures)
+        self.assertTrue(
+            np.shares_memory(
+                chunks[0].data_reads.matrix, read_session.data_reads.matrix
+            )
+        )
+
+    def test_bit_counts(self) -> None:
+        bit_idxs = np.array([5, 3, 3, 1000, 77, 15000])
+        with h5py.File(self.path, "a") as f:
+            group = f["boards/board1/pblock_2/RAMB36_X1Y0/session_b"]
+            expected = dict()
+            for options in [
+                {},
+                {"filter_even_stripes": True, "read_range": slice(1, 9, 2)},
+            ]:
+                reads = ReadSession.from_hdf5(group, **options).data_reads
+                expected[str(options)] = (options, reads.bits)
+            row_wise_columns = bit_columns_from_hdf5(
+                group, "data_reads", bit_idxs, slice(2, 7)
+            )
+
+            transposed_name = bit_transposed_name("data_reads")
+            group[transposed_name] = transpose_bits(group["data_reads"][()])
+            group[transposed_name].attrs["read_count"] = 10
+            self.assertEqual(group[transposed_name].shape, (4096 * 8, 2))
+            nptest.assert_array_equal(
+                bit_columns_from_hdf5(
+                    group, "data_reads", bit_idxs, slice(2, 7)
+                ),
+                row_wise_columns,
+            )
+
+            # Both layouts give the same counts
+            for has_transposed in [True, False]:
+                if not has_transposed:
+                    del group[transposed_name]
+                for options, bits in expected.values():
+                    for idxs in [bit_idxs, None]:
+                        counts = ReadSession.bit_counts_from_hdf5(
+                            group, idxs, **options
+                        )
+                        expected_bits = bits if idxs is None else bits[
+                            :, idxs
+                        ]
+                        self.assertEqual(counts.read_count, len(bits))
+                        nptest.assert_array_equal(
+                            counts.one_counts, expected_bits.sum(axis=0)
+                        )
+        nptest.assert_array_equal(
+            row_wise_columns, expected["{}"][1][2:7, bit_idxs]
+        )
+
+    def test_invalid_selection(self) -> None:
+        with h5py.File(self.path, "r") as f:
+            with self.assertRaises(ValueError):
+                Experiment.from_hdf5(
+                    f, "", selection=Selection(boards=("board2",))
+                )
+            with self.assertRaises(ValueError):
+                Experiment.from_hdf5(
+                    f, "", selection=Selection(read_sessions=("session_c",))
+                )
+        with self.assertRaises(ValueError):
+            Selection(read_range=slice(None, None, 0))
@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+import numpy.testing as nptest
+from scipy.spatial.distance import hamming
+from hdf5_wrapper.hamming_distance import (
+    all_pairs_distance_count_tiles,
+    ordered_map,
+    packed_words,
+    hamming_distance_counts,
+    hamming_distances,
+)
+
+
+class TestHammingDistance(unittest.TestCase):
+    rng = np.random.default_rng(1337)
+    matrix = rng.integers(0, 256, (20, 13), dtype=np.uint8)
+    other_matrix = rng.integers(0, 256, (30, 13), dtype=np.uint8)
+
+    def test_packed_words(self) -> None:
+        words = packed_words(self.matrix)
+        self.assertEqual(words.shape, (20, 2))
+        self.assertEqual(words.dtype, np.uint64)
+        nptest.assert_array_equal(
+            np.bitwise_count(words).sum(axis=1),
+            np.bitwise_count(self.matrix).sum(axis=1),
+        )
+
+    def test_hamming_distances(self) -> None:
+        idxs = self.rng.integers(0, 20, 5000)
+        other_idxs = self.rng.integers(0, 30, 5000)
+        bits = np.unpackbits(self.matrix, axis=1)
+        other_bits = np.unpackbits(self.other_matrix, axis=1)
+        expected = np.array(
+            [
+                hamming(bits[idx], other_bits[other_idx])
+                for idx, other_idx in zip(idxs, other_idxs)
+            ]
+        )
+        nptest.assert_array_equal(
+            hamming_distances(
+                self.matrix, self.other_matrix, idxs, other_idxs
+            ),
+            expected,
+        )
+
+    def test_hamming_distance_counts(self) -> None:
+        words = packed_words(np.array([[0x00, 0xFF], [0x0F, 0xFF]], np.uint8))
+        nptest.assert_array_equal(
+            hamming_distance_counts(words, words, [0, 0, 1], [0, 1, 0]),
+            np.array([0, 4, 4]),
+        )
+        with self.assertRaises(ValueError):
+            hamming_distance_counts(words, words, [0, 1], [0])
+
+    def test_ordered_map(self) -> None:
+        self.assertEqual(
+            list(ordered_map(lambda value: value**2, range(50), threads=4)),
+            [value**2 for value in range(50)],
+        )
+        with self.assertRaises(ValueError):
+            list(ordered_map(abs, [1], threads=0))
+
+    def test_threads(self) -> None:
+        # Results and their order don't depend on the number of threads
+        idxs = self.rng.integers(0, 20, 5000)
+        other_idxs = self.rng.integers(0, 30, 5000)
+        nptest.assert_array_equal(
+            hamming_distances(
+                self.matrix, self.other_matrix, idxs, other_idxs, threads=3
+            ),
+            hamming_distances(
+                self.matrix, self.other_matrix, idxs, other_idxs
+            ),
+        )
+
+        tiles = list(all_pairs_distance_count_tiles(self.matrix, 3))
+        threaded_tiles = list(
+            all_pairs_distance_count_tiles(self.matrix, 3, threads=4)
+        )
+        self.assertEqual(len(tiles), len(threaded_tiles))
+        for (rows, columns, counts), threaded_tile in zip(
+            tiles, threaded_tiles
+        ):
+            self.assertEqual((rows, columns), threaded_tile[:2])
+            nptest.assert_array_equal(counts, threaded_tile[2])
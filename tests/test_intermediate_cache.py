@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from hdf5_wrapper.experiment_hdf5 import PackedReads
+from hdf5_wrapper.intermediate_cache import (
+    session_intermediate,
+    shared_intermediates,
+)
+
+
+class TestIntermediateCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.call_count = 0
+
+        @session_intermediate("test_intermediate")
+        def count_calls(reads: PackedReads) -> int:
+            self.call_count += 1
+            return len(reads)
+
+        self.intermediate = count_calls
+        self.reads = PackedReads(np.zeros((3, 2), dtype=np.uint8))
+        self.other_reads = PackedReads(np.zeros((4, 2), dtype=np.uint8))
+
+    def test_no_memoization_outside_of_context(self) -> None:
+        self.intermediate(self.reads)
+        self.intermediate(self.reads)
+        self.assertEqual(self.call_count, 2)
+
+    def test_memoization_per_reads_object(self) -> None:
+        with shared_intermediates():
+            self.assertEqual(self.intermediate(self.reads), 3)
+            self.assertEqual(self.intermediate(self.reads), 3)
+            self.assertEqual(self.intermediate(self.other_reads), 4)
+            with shared_intermediates():
+                self.intermediate(self.reads)
+            self.assertEqual(self.call_count, 2)
+
+            # Lists can't be weakly referenced and are not memoized
+            reads_list = list(self.reads)
+            self.intermediate(reads_list)
+            self.intermediate(reads_list)
+            self.assertEqual(self.call_count, 4)
+
+        # Cache is dropped after leaving the context
+        with shared_intermediates():
+            self.intermediate(self.reads)
+        self.assertEqual(self.call_count, 5)
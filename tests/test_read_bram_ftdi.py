@@ -66,7 +66,8 @@ class TestReadBramFTDI(unittest.TestCase):
             "device": self.uart_adapter_sn,
             "ftdi_interface": 1,
             "baudrate": 2e6,
-            "output_path": temporary_file.name
+            "output_path": temporary_file.name,
+            "packed": False,
         }
 
         for _ in range(10):
@@ -83,4 +84,36 @@ class TestReadBramFTDI(unittest.TestCase):
                 read_bram_ftdi.main(args)
         except Exception:
             self.assertIn("UART failed too many times. Aborting readout", captured_output.getvalue())
-            sys.stdout = sys.__stdout__ # Reset redirect
\ No newline at end of file
+            sys.stdout = sys.__stdout__ # Reset redirect
+
+
+class TestAppendPackedRead(unittest.TestCase):
+
+    def test_append_packed_read(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            session_path = Path(temp_dir, "previous_value_00_t=0")
+            for read in range(3):
+                read_bram_ftdi.append_packed_read(
+                    str(Path(session_path, str(read))),
+                    bytes([read]) * 8,
+                    bytes([read]),
+                )
+            # Record of an interrupted readout is overwritten
+            with open(Path(session_path, "data_reads.bin"), mode="ab") as f:
+                f.write(b"\xff" * 5)
+            read_bram_ftdi.append_packed_read(
+                str(Path(session_path, "3")), b"\x03" * 8, b"\x03"
+            )
+
+            self.assertEqual(
+                Path(session_path, "data_reads.bin").read_bytes(),
+                b"".join(bytes([read]) * 8 for read in range(4)),
+            )
+            self.assertEqual(
+                Path(session_path, "parity_reads.bin").read_bytes(),
+                bytes(range(4)),
+            )
+            self.assertEqual(
+                Path(session_path, "reads.idx").read_text(),
+                "".join(f"{read} 8 1\n" for read in range(4)),
+            )
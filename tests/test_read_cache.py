@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+import h5py
+import numpy as np
+import numpy.testing as nptest
+from hdf5_wrapper.experiment_hdf5 import HDF5Source, ReadSession
+from hdf5_wrapper.read_cache import ReadCache
+
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name, "experiment.hdf5")
+        self.cache_dir = Path(self.temp_dir.name, "cache")
+        rng = np.random.default_rng(0)
+        self.data_matrix = rng.integers(0, 256, (5, 4096), dtype=np.uint8)
+        self.parity_matrix = rng.integers(0, 256, (5, 512), dtype=np.uint8)
+        with h5py.File(self.path, "w") as f:
+            group = f.create_group("RAMB36_X0Y0/session")
+            group["data_reads"] = self.data_matrix
+            group["parity_reads"] = self.parity_matrix
+            group["temperature"] = np.arange(5.0)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_matrix(self) -> None:
+        read_cache = ReadCache(self.cache_dir)
+        hdf5_source = HDF5Source(str(self.path), "/RAMB36_X0Y0/session")
+        decode_calls = list()
+
+        def decode() -> np.ndarray:
+            decode_calls.append(None)
+            return self.data_matrix
+
+        self.assertIs(
+            read_cache.matrix(hdf5_source, "data_reads", decode),
+            self.data_matrix,
+        )
+        # Second access (also by another ReadCache) uses the saved matrix
+        for cache in [read_cache, ReadCache(self.cache_dir)]:
+            matrix = cache.matrix(hdf5_source, "data_reads", decode)
+            self.assertIsInstance(matrix, np.memmap)
+            nptest.assert_array_equal(matrix, self.data_matrix)
+        self.assertEqual(len(decode_calls), 1)
+
+        # Other load options are cached separately
+        self.assertNotEqual(
+            read_cache.matrix_path(hdf5_source, "data_reads"),
+            read_cache.matrix_path(
+                HDF5Source(
+                    str(self.path),
+                    "/RAMB36_X0Y0/session",
+                    filter_even_stripes=True,
+                ),
+                "data_reads",
+            ),
+        )
+
+    def test_content_hash(self) -> None:
+        file_hash = ReadCache(self.cache_dir).file_hash(str(self.path))
+        self.assertEqual(
+            ReadCache(self.cache_dir).file_hash(str(self.path)), file_hash
+        )
+        with h5py.File(self.path, "a") as f:
+            f["RAMB36_X0Y0/session/temperature"][0] = 42.0
+        self.assertNotEqual(
+            ReadCache(self.cache_dir).file_hash(str(self.path)), file_hash
+        )
+
+    def test_read_session(self) -> None:
+        for _ in range(2):
+            with h5py.File(self.path, "r") as f:
+                read_session = ReadSession.from_hdf5(
+                    f["RAMB36_X0Y0/session"],
+                    read_range=slice(1, 4),
+                    read_cache=ReadCache(self.cache_dir),
+                )
+            nptest.assert_array_equal(
+                read_session.data_reads.matrix, self.data_matrix[1:4]
+            )
+            nptest.assert_array_equal(
+                read_session.parity_reads.matrix, self.parity_matrix[1:4]
+            )
+        self.assertIsInstance(read_session.data_reads.matrix, np.memmap)
+        self.assertEqual(len(list(self.cache_dir.glob("*/*.npy"))), 2)
@@ -1,6 +1,254 @@
+import tempfile
 import unittest
+from pathlib import Path
+import h5py
+import numpy as np
+import numpy.testing as nptest
+from hdf5_wrapper.bram_stat_pool import BramStatPool
+from hdf5_wrapper.experiment_hdf5 import (
+    Board,
+    BramBlock,
+    Experiment,
+    PackedReads,
+    PBlock,
+    ReadSession,
+)
+from hdf5_wrapper.stat_container import StatContainers, ExperimentStat
+from hdf5_wrapper.stats import (
+    BitFlipChanceStatistic,
+    CombinedStableBitStatistic,
+    EntropyStatistic,
+    IntradistanceStatistic,
+    ReliabilityStatistic,
+    UniquenessStatistic,
+)
+from hdf5_wrapper.utility import PlotSettings
 
 
 class TestMultReadSessionOwner(unittest.TestCase):
     def test__init__(self) -> None:
         pass
+
+
+class TestStatPersistence(unittest.TestCase):
+    used_statistics = [
+        EntropyStatistic,
+        BitFlipChanceStatistic,
+        CombinedStableBitStatistic,
+        ReliabilityStatistic,
+        UniquenessStatistic,
+    ]
+    read_session_names = ["previous_value_00_t=0"]
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.plot_settings = PlotSettings(
+            Path(self.temp_dir.name), False, None, rng_seed=1337
+        )
+        self.previous_used_statistics = {
+            stat_container: stat_container.value.__dict__.get(
+                "used_statistics"
+            )
+            for stat_container in StatContainers
+        }
+        for stat_container in StatContainers:
+            stat_container.value.used_statistics = [
+                statistic_type
+                for statistic_type in self.used_statistics
+                if statistic_type in stat_container.value.allowed_statistics
+            ]
+
+        rng = np.random.default_rng(0)
+
+        def read_session() -> ReadSession:
+            return ReadSession(
+                PackedReads(rng.integers(0, 256, (6, 4096), dtype=np.uint8)),
+                PackedReads(rng.integers(0, 256, (6, 512), dtype=np.uint8)),
+                [40.0] * 6,
+            )
+
+        bram_blocks = {
+            name: BramBlock(
+                name=name,
+                read_sessions={
+                    read_session_name: read_session()
+                    for read_session_name in self.read_session_names
+                },
+                read_session_names=self.read_session_names,
+            )
+            for name in ["RAMB36_X0Y0", "RAMB36_X0Y1"]
+        }
+        pblock = PBlock(
+            name="pblock_1",
+            bram_count=2,
+            subcontainers=bram_blocks,
+            read_session_names=self.read_session_names,
+        )
+        board = Board(
+            name="te0802",
+            bram_count=2,
+            subcontainers={"pblock_1": pblock},
+            read_session_names=self.read_session_names,
+            fpga="zu1eg",
+            uart_sn="",
+            programming_interface="",
+            date="",
+        )
+        self.experiment = Experiment(
+            name="experiment",
+            bram_count=2,
+            subcontainers={"te0802": board},
+            read_session_names=self.read_session_names,
+            commit="",
+        )
+
+    def tearDown(self) -> None:
+        for stat_container, used_statistics in (
+            self.previous_used_statistics.items()
+        ):
+            if used_statistics is None:
+                del stat_container.value.used_statistics
+            else:
+                stat_container.value.used_statistics = used_statistics
+        self.temp_dir.cleanup()
+
+    def assert_owners_equal(self, owner, restored_owner) -> None:
+        self.assertEqual(owner.name, restored_owner.name)
+        self.assertEqual(
+            owner.plot_settings.path, restored_owner.plot_settings.path
+        )
+        self.assertEqual(
+            owner.plot_settings.bram_count,
+            restored_owner.plot_settings.bram_count,
+        )
+        self.assertEqual(
+            set(owner.statistics), set(restored_owner.statistics)
+        )
+        for statistic_type, multi_statistic in owner.statistics.items():
+            for read_session_name in self.read_session_names:
+                statistic = multi_statistic.statistics[read_session_name]
+                restored_statistic = restored_owner.statistics[
+                    statistic_type
+                ].statistics[read_session_name]
+                nptest.assert_array_equal(
+                    statistic.data_stats, restored_statistic.data_stats
+                )
+                nptest.assert_array_equal(
+                    statistic.parity_stats, restored_statistic.parity_stats
+                )
+                for attribute_name in statistic.hdf5_attributes:
+                    nptest.assert_array_equal(
+                        getattr(statistic, attribute_name),
+                        getattr(restored_statistic, attribute_name),
+                    )
+                for stable_bit_type, stable_bit_stat in getattr(
+                    statistic, "stable_bit_stats", dict()
+                ).items():
+                    restored_stable_bit_stat = (
+                        restored_statistic.stable_bit_stats[stable_bit_type]
+                    )
+                    nptest.assert_array_equal(
+                        stable_bit_stat.data_sample,
+                        restored_stable_bit_stat.data_sample,
+                    )
+                    self.assertEqual(
+                        stable_bit_stat.data_bit_indices,
+                        restored_stable_bit_stat.data_bit_indices,
+                    )
+
+        subowners = getattr(owner, "subowners", None) or []
+        restored_subowners = getattr(restored_owner, "subowners", None) or []
+        self.assertEqual(len(subowners), len(restored_subowners))
+        for subowner, restored_subowner in zip(subowners, restored_subowners):
+            self.assert_owners_equal(subowner, restored_subowner)
+
+    def test_from_hdf5_group(self) -> None:
+        experiment_stats = ExperimentStat(
+            self.experiment, self.plot_settings.with_expanded_path("exp")
+        )
+        path = Path(self.temp_dir.name, "stats.hdf5")
+        with h5py.File(path, "w") as hdf5_file:
+            experiment_stats.add_to_hdf5_group(hdf5_file)
+
+        with h5py.File(path, "r") as hdf5_file:
+            restored_experiment_stats = ExperimentStat.from_hdf5_group(
+                hdf5_file["experiment"],
+                self.plot_settings.with_expanded_path("exp"),
+            )
+
+        self.assert_owners_equal(experiment_stats, restored_experiment_stats)
+
+
+class TestBramStatPool(TestStatPersistence):
+    used_statistics = TestStatPersistence.used_statistics + [
+        IntradistanceStatistic,
+    ]
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.previous_stat_func_kwargs = (
+            IntradistanceStatistic.stat_func_kwargs
+        )
+        IntradistanceStatistic.stat_func_kwargs = {"k": 50}
+
+        # Experiment hdf5 with the same reads as "self.experiment"
+        path = Path(self.temp_dir.name, "experiment.hdf5")
+        with h5py.File(path, "w") as hdf5_file:
+            hdf5_file["read_session_names"] = [
+                name.encode() for name in self.read_session_names
+            ]
+            for board in self.experiment.subcontainers.values():
+                board_group = hdf5_file.create_group(f"boards/{board.name}")
+                for attr_name in [
+                    "fpga", "uart_sn", "programming_interface", "date"
+                ]:
+                    board_group.attrs[attr_name] = getattr(board, attr_name)
+                board_group.attrs["board_name"] = board.name
+                for pblock in board.subcontainers.values():
+                    for bram_block in pblock.subcontainers.values():
+                        for name, read_session in (
+                            bram_block.read_sessions.items()
+                        ):
+                            group = board_group.create_group(
+                                f"{pblock.name}/{bram_block.name}/{name}"
+                            )
+                            group["data_reads"] = (
+                                read_session.data_reads.matrix
+                            )
+                            group["parity_reads"] = (
+                                read_session.parity_reads.matrix
+                            )
+                            group["temperature"] = read_session.temperatures
+
+        with h5py.File(path, "r") as hdf5_file:
+            self.experiment = Experiment.from_hdf5(hdf5_file, "")
+
+    def tearDown(self) -> None:
+        IntradistanceStatistic.stat_func_kwargs = (
+            self.previous_stat_func_kwargs
+        )
+        super().tearDown()
+
+    def test_bram_stat_pool(self) -> None:
+        experiment_stats = ExperimentStat(
+            self.experiment, self.plot_settings.with_expanded_path("exp")
+        )
+
+        with BramStatPool(2):
+            pool_experiment_stats = ExperimentStat(
+                self.experiment, self.plot_settings.with_expanded_path("exp")
+            )
+
+        self.assert_owners_equal(experiment_stats, pool_experiment_stats)
+        self.assertEqual(
+            [
+                list(bram_block_stat.statistics)
+                for bram_block_stat
+                in experiment_stats.subowners[0].subowners[0].subowners
+            ],
+            [
+                list(bram_block_stat.statistics)
+                for bram_block_stat
+                in pool_experiment_stats.subowners[0].subowners[0].subowners
+            ],
+        )
@@ -1,16 +1,33 @@
 import unittest
+from unittest import mock
 import numpy as np
 import numpy.testing as nptest
 from hdf5_wrapper.stat_functions import (
     bit_stabilization_count_over_time,
     bit_flip_chance,
+    bit_flip_chance_streaming,
+    entropy_list,
+    entropy_list_streaming,
+    first_read_interdistances,
     stable_bits_per_idxs,
     hamming_weight,
+    hamming_weight_streaming,
     reliability,
+    reliability_streaming,
+    interdistance,
     interdistance_bootstrap,
     intradistance_bootstrap,
+    intradistance,
+    intradistance_histogram,
+    intradistance_moments,
+    random_pair_idxs,
+    stable_bit_classes,
+)
+from hdf5_wrapper.experiment_hdf5 import (
+    ConcatenatedReads,
+    PackedReads,
+    Read,
 )
-from hdf5_wrapper.experiment_hdf5 import Read
 from hdf5_wrapper.utility import BitFlipType
 
 @unittest.skip("Test is currently outdated")
@@ -213,3 +230,255 @@ class TestStatFunctions(unittest.TestCase):
             ),
             [[2 / 3, 0.5], [0.5, 2 / 3], [0.5, 0.5], [2 / 3, 2 / 3]],
         )
+
+
+class TestExactIntradistance(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(1337)
+        self.reads = PackedReads(
+            rng.integers(0, 256, (23, 9), dtype=np.uint8)
+        )
+        bits = self.reads.bits
+        self.expected = np.array(
+            [
+                np.count_nonzero(bits[i] != bits[j]) / 72
+                for i in range(23)
+                for j in range(i + 1, 23)
+            ]
+        )
+
+    def test_intradistance(self) -> None:
+        for tile_size in [1, 5, 23, 256]:
+            nptest.assert_array_equal(
+                intradistance(self.reads, tile_size=tile_size),
+                self.expected,
+            )
+
+    def test_intradistance_histogram(self) -> None:
+        histogram = intradistance_histogram(self.reads, tile_size=4)
+        self.assertEqual(len(histogram), 73)
+        nptest.assert_array_equal(
+            histogram,
+            np.bincount(np.rint(self.expected * 72).astype(int), minlength=73),
+        )
+
+    def test_random_pair_idxs(self) -> None:
+        rng = np.random.default_rng(0)
+        idxs, other_idxs = random_pair_idxs(rng, 23, 1000)
+        self.assertEqual(len(idxs), 1000)
+        self.assertFalse(np.any(idxs == other_idxs))
+        self.assertTrue(np.all((other_idxs >= 0) & (other_idxs < 23)))
+
+        # All pairs (i < j) are drawn exactly once
+        idxs, other_idxs = random_pair_idxs(rng, 23, 253, unique_pairs=True)
+        self.assertEqual(
+            sorted(zip(idxs.tolist(), other_idxs.tolist())),
+            list(zip(*[idxs.tolist() for idxs in np.triu_indices(23, 1)])),
+        )
+
+    def test_intradistance_bootstrap(self) -> None:
+        values = intradistance_bootstrap(
+            self.reads, k=100, rng=np.random.default_rng(1)
+        )
+        self.assertEqual(len(values), 100)
+        self.assertTrue(np.isin(values, self.expected).all())
+        # Same seed, same values
+        nptest.assert_array_equal(
+            values,
+            intradistance_bootstrap(
+                self.reads, k=100, rng=np.random.default_rng(1)
+            ),
+        )
+        # Unique pairs: k is limited to the number of pairs
+        nptest.assert_array_equal(
+            np.sort(
+                intradistance_bootstrap(
+                    self.reads,
+                    k=1000,
+                    unique_pairs=True,
+                    rng=np.random.default_rng(1),
+                )
+            ),
+            np.sort(self.expected),
+        )
+
+    def test_intradistance_moments(self) -> None:
+        moments = intradistance_moments(self.reads, tile_size=4)
+        self.assertEqual(moments["Count"], len(self.expected))
+        self.assertAlmostEqual(moments["Mean"], np.mean(self.expected))
+        self.assertAlmostEqual(moments["Variance"], np.var(self.expected))
+        self.assertEqual(moments["Minimum"], np.min(self.expected))
+        self.assertEqual(moments["Maximum"], np.max(self.expected))
+        self.assertEqual(moments["Median"], np.median(self.expected))
+        self.assertEqual(
+            intradistance_moments(self.reads[:4])["Median"],
+            np.median(intradistance(self.reads[:4])),
+        )
+
+        # No pairs without at least two reads
+        for read_count in [0, 1]:
+            with self.assertRaises(ValueError):
+                intradistance_moments(self.reads[:read_count])
+
+
+class TestFirstReadInterdistances(unittest.TestCase):
+    def test_first_read_interdistances(self) -> None:
+        rng = np.random.default_rng(1337)
+        reads_per_session = [
+            PackedReads(rng.integers(0, 256, (3, 9), dtype=np.uint8))
+            for _ in range(11)
+        ]
+        # Pairwise reference (order of ComparisonStatistic.compare)
+        expected = np.concatenate(
+            [
+                interdistance(
+                    reads_per_session[i],
+                    reads_per_session[j],
+                    only_use_first_element=True,
+                )
+                for i in range(11)
+                for j in range(i + 1, 11)
+            ]
+        )
+        for tile_size in [1, 4, 256]:
+            nptest.assert_array_equal(
+                first_read_interdistances(reads_per_session, tile_size),
+                expected,
+            )
+
+
+class TestBitStabilization(unittest.TestCase):
+    reads = PackedReads.from_reads(
+        [
+            Read.from_raw(raw_read)
+            for raw_read in [
+                b"\xbe\xee", b"\xae\xef", b"\xbe\xfe", b"\xae\xef",
+                b"\xbe\xfe", b"\xbe\xef", b"\xbe\xee", b"\xbe\xee",
+                b"\xbe\xee", b"\xbe\xef",
+            ]
+        ]
+    )
+
+    def test_bit_stabilization_count_over_time(self) -> None:
+        # Index of read from which bit became stable:
+        #   0000|0000|0005|0009
+        for stable_after_n_reads, expected_result in [
+            (5, np.array([13, 0, 0, 0, 1, 1, 0, 0, 0, 0])),
+            (1, np.array([13, 0, 0, 0, 1, 1, 0, 0, 0, 1])),
+            (0, np.array([13, 0, 0, 0, 1, 1, 0, 0, 0, 1])),
+            (11, np.zeros(10)),
+        ]:
+            nptest.assert_array_equal(
+                bit_stabilization_count_over_time(
+                    self.reads, stable_after_n_reads=stable_after_n_reads
+                ),
+                expected_result,
+            )
+
+
+class TestStableBitClasses(unittest.TestCase):
+    reads = PackedReads.from_reads(
+        [Read.from_raw(b"\xaa")] * 6
+        + [Read.from_raw(b"\xab")] * 3
+        + [Read.from_raw(b"\xa8")]
+    )
+
+    def test_stable_bit_classes(self) -> None:
+        bit_classes = stable_bit_classes(self.reads)
+        self.assertEqual(set(bit_classes.keys()), set(BitFlipType))
+        for bit_flip_type, expected in [
+            (BitFlipType.BOTH, [1, 1, 1, 1, 1, 1, 0, 0]),
+            (BitFlipType.ZERO, [0, 1, 0, 1, 0, 1, 0, 0]),
+            (BitFlipType.ONE, [1, 0, 1, 0, 1, 0, 0, 0]),
+            (BitFlipType.UNSTABLE, [0, 0, 0, 0, 0, 0, 1, 1]),
+            (BitFlipType.VERY_UNSTABLE, [0, 0, 0, 0, 0, 0, 0, 1]),
+            (BitFlipType.RANDOM, [0, 0, 0, 0, 0, 0, 0, 0]),
+            (BitFlipType.BOTH_NEARLY_STABLE, [1, 1, 1, 1, 1, 1, 0, 0]),
+        ]:
+            nptest.assert_array_equal(
+                bit_classes[bit_flip_type], np.array(expected, dtype=bool)
+            )
+            nptest.assert_array_equal(
+                stable_bits_per_idxs(self.reads, bit_flip_type),
+                np.array(expected),
+            )
+
+
+class TestStreamingStatFunctions(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(1337)
+        self.reads = PackedReads(
+            rng.integers(0, 256, (23, 9), dtype=np.uint8)
+        )
+
+    def test_streaming_equals_in_memory(self) -> None:
+        for chunk_size in [1, 4, 23, 100]:
+            nptest.assert_array_equal(
+                bit_flip_chance_streaming(self.reads.iter_chunks(chunk_size)),
+                bit_flip_chance(self.reads),
+            )
+            nptest.assert_array_equal(
+                entropy_list_streaming(self.reads.iter_chunks(chunk_size)),
+                entropy_list(self.reads),
+            )
+            self.assertAlmostEqual(
+                hamming_weight_streaming(self.reads.iter_chunks(chunk_size)),
+                hamming_weight(self.reads),
+            )
+            self.assertEqual(
+                hamming_weight_streaming(
+                    self.reads.iter_chunks(chunk_size),
+                    only_use_first_element=True,
+                ),
+                hamming_weight(self.reads, only_use_first_element=True),
+            )
+            self.assertAlmostEqual(
+                reliability_streaming(self.reads.iter_chunks(chunk_size)),
+                reliability(self.reads),
+            )
+
+    def test_no_reads(self) -> None:
+        for streaming_function in [
+            bit_flip_chance_streaming,
+            hamming_weight_streaming,
+            reliability_streaming,
+        ]:
+            with self.assertRaises(ValueError):
+                streaming_function(iter([]))
+        with self.assertRaises(ValueError):
+            reliability_streaming(self.reads[:1].iter_chunks(1))
+
+
+class TestConcatenatedReadsStatFunctions(unittest.TestCase):
+    def test_parts_are_not_copied(self) -> None:
+        rng = np.random.default_rng(42)
+        matrices = [
+            rng.integers(0, 256, (rows, 9), dtype=np.uint8)
+            for rows in [3, 1, 5]
+        ]
+        reads = PackedReads(np.concatenate(matrices))
+        merged_reads = ConcatenatedReads(
+            [PackedReads(matrix) for matrix in matrices]
+        )
+        expected = (
+            bit_flip_chance(reads),
+            entropy_list(reads),
+            hamming_weight(reads),
+            reliability(reads),
+        )
+        with mock.patch.object(
+            ConcatenatedReads,
+            "matrix",
+            new_callable=mock.PropertyMock,
+            side_effect=AssertionError("merged reads were copied"),
+        ):
+            nptest.assert_array_equal(
+                bit_flip_chance(merged_reads), expected[0]
+            )
+            nptest.assert_array_equal(entropy_list(merged_reads), expected[1])
+            self.assertEqual(hamming_weight(merged_reads), expected[2])
+            self.assertEqual(reliability(merged_reads), expected[3])
+        # Pairwise statistics intentionally copy the parts into one matrix
+        nptest.assert_array_equal(
+            intradistance(merged_reads), intradistance(reads)
+        )
@@ -0,0 +1,164 @@
+import tempfile
+import unittest
+from pathlib import Path
+import h5py
+import numpy as np
+import numpy.testing as nptest
+from hdf5_wrapper.bit_matrix import BitCountAccumulator
+from hdf5_wrapper.stats import (
+    BitAliasingStatistic,
+    BitFlipChanceStatistic,
+    ExactIntradistanceStatistic,
+    StableBitStatistic,
+)
+from hdf5_wrapper.experiment_hdf5 import ReadSession, PackedReads
+from hdf5_wrapper.stat_functions import intradistance
+from hdf5_wrapper.utility import PlotSettings
+
+
+class TestBitwiseMerge(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.plot_settings = PlotSettings(
+            Path(self.temp_dir.name), False, None
+        )
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_bitwise_statistic_from_merge(self) -> None:
+        stats = [
+            BitAliasingStatistic(
+                self.plot_settings,
+                None,
+                self.rng.random(4096 * 8),
+                self.rng.random(4096),
+            )
+            for _ in range(7)
+        ]
+        merged = BitAliasingStatistic.from_merge(stats, self.plot_settings)
+
+        # Element wise python sums (reference implementation)
+        expected_data_stats = np.array(
+            [
+                float(value_sum / len(stats))
+                for value_sum in map(
+                    sum, zip(*[stat.data_stats for stat in stats])
+                )
+            ]
+        )
+        nptest.assert_array_equal(merged.data_stats, expected_data_stats)
+        self.assertEqual(merged.parity_stats.shape, (4096,))
+
+    def test_bit_count_statistic_from_merge(self) -> None:
+        matrices = [
+            self.rng.integers(0, 256, (read_count, 4096), dtype=np.uint8)
+            for read_count in [1, 5, 12]
+        ]
+        parity_matrices = [matrix[:, :512] for matrix in matrices]
+        stats = [
+            BitFlipChanceStatistic(
+                self.plot_settings,
+                None,
+                data_counts=BitCountAccumulator.from_matrix(matrix),
+                parity_counts=BitCountAccumulator.from_matrix(parity_matrix),
+            )
+            for matrix, parity_matrix in zip(matrices, parity_matrices)
+        ]
+        merged = BitFlipChanceStatistic.from_merge(
+            stats, self.plot_settings
+        )
+
+        # Merged probabilities are weighted by the number of reads
+        nptest.assert_array_equal(
+            merged.data_stats,
+            np.unpackbits(np.concatenate(matrices), axis=1).mean(axis=0),
+        )
+        self.assertEqual(merged.parity_counts.read_count, 18)
+
+        # Counts are restored from hdf5, so restored stats merge the same
+        with h5py.File(Path(self.temp_dir.name, "stats.hdf5"), "w") as f:
+            groups = [
+                stat.add_to_hdf5_group(f.create_group(str(idx)))
+                for idx, stat in enumerate(stats)
+            ]
+            restored = [
+                BitFlipChanceStatistic.from_hdf5_group(
+                    group, self.plot_settings
+                )
+                for group in groups
+            ]
+        nptest.assert_array_equal(
+            BitFlipChanceStatistic.from_merge(
+                restored, self.plot_settings
+            ).data_stats,
+            merged.data_stats,
+        )
+
+    def test_stable_bit_statistic_from_merge(self) -> None:
+        stats = [
+            StableBitStatistic(
+                self.plot_settings,
+                None,
+                self.rng.integers(0, 2, 4096 * 8),
+                self.rng.integers(0, 2, 4096),
+                bram_count=1,
+                data_sample=self.rng.integers(0, 2, 10, dtype=np.int8),
+            )
+            for _ in range(3)
+        ]
+        merged = StableBitStatistic.from_merge(stats, self.plot_settings)
+
+        expected_data_stats = np.sum([stat.data_stats for stat in stats], 0)
+        nptest.assert_array_equal(merged.data_stats, expected_data_stats)
+        self.assertEqual(merged.data_stats.dtype, np.int64)
+        self.assertEqual(merged.bram_count, 3)
+        self.assertEqual(
+            merged.data_bit_indices,
+            np.flatnonzero(expected_data_stats == 3).tolist(),
+        )
+        self.assertEqual(len(merged.data_sample), 30)
+
+    def test_exact_intradistance_statistic_from_merge(self) -> None:
+        read_sessions = [
+            ReadSession(
+                PackedReads(
+                    self.rng.integers(0, 256, (read_count, 9), dtype=np.uint8)
+                ),
+                PackedReads(
+                    self.rng.integers(0, 256, (read_count, 2), dtype=np.uint8)
+                ),
+                [40.0] * read_count,
+            )
+            for read_count in [4, 7]
+        ]
+        stats = [
+            ExactIntradistanceStatistic(self.plot_settings, read_session)
+            for read_session in read_sessions
+        ]
+        # Histogram over absolute distances, not one value per pair
+        self.assertEqual(stats[0].data_stats.shape, (73,))
+        merged = ExactIntradistanceStatistic.from_merge(
+            stats, self.plot_settings
+        )
+        nptest.assert_array_equal(
+            merged.data_stats, stats[0].data_stats + stats[1].data_stats
+        )
+
+        # Meta stats are the stats of the pair values
+        values = np.concatenate(
+            [
+                intradistance(read_session.data_reads)
+                for read_session in read_sessions
+            ]
+        )
+        meta_stats = merged.meta_stats["Data"].stats
+        for stat_name, method in [
+            ("Mean", np.mean),
+            ("Median", np.median),
+            ("Variance", np.var),
+            ("Minimum", np.min),
+            ("Maximum", np.max),
+        ]:
+            self.assertAlmostEqual(meta_stats[stat_name], method(values))